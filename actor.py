@@ -0,0 +1,89 @@
+import weakref
+from pygame.sprite import Sprite
+from components import default_store, Component
+
+
+class Actor(Sprite):
+    """
+    Base sprite for moving actors whose state lives in a ComponentStore.
+
+    The sprite is a thin view: position, velocity and collider state are
+    descriptors over the actor's slot in the store, so systems can process
+    every actor in bulk while per-sprite code keeps using plain attributes.
+    The slot is released when the sprite is garbage collected.
+    """
+
+    KIND = None
+
+    x = Component("x")
+    y = Component("y")
+    vel_x = Component("vel_x")
+    vel_y = Component("vel_y")
+    on_ground = Component("on_ground", bool)
+    sleeping = Component("sleeping", bool)
+
+    def __init__(self, store=None):
+        super().__init__()
+        if store is None:
+            store = default_store
+        self._store = store
+        self._eid = store.allocate(self.KIND)
+        weakref.finalize(self, store.release, self._eid)
+
+    @property
+    def eid(self):
+        """Entity id of this actor in its component store."""
+        return self._eid
+
+    @property
+    def store(self):
+        return self._store
+
+    def wake(self):
+        """Resume physics for a sleeping actor."""
+        self.sleeping = False
+
+    def _settle(self):
+        """Go to sleep if resting on the ground without moving horizontally."""
+        if self.on_ground and self.vel_x == 0:
+            self.sleeping = True
+
+    def _init_collider(self):
+        """Record the rect size as the actor's collider."""
+        columns = self._store.columns
+        columns["width"][self._eid] = self.rect.width
+        columns["height"][self._eid] = self.rect.height
+
+    def check_platform_collision(self, platforms, direction):
+        self._resolve_collisions(platforms, direction)
+
+    def check_obstacle_collision(self, obstacles, direction):
+        self._resolve_collisions(obstacles, direction)
+
+    def _resolve_collisions(self, solids, direction):
+        """Push the actor out of any solid it overlaps along one axis."""
+        for solid in solids:
+            if self.rect.colliderect(solid.rect):
+                if direction == "horizontal":
+                    if self.vel_x > 0:  # Moving right
+                        self.rect.right = solid.rect.left
+                        self.x = float(self.rect.x)
+                        self._hit_wall(-1)
+                    elif self.vel_x < 0:  # Moving left
+                        self.rect.left = solid.rect.right
+                        self.x = float(self.rect.x)
+                        self._hit_wall(1)
+                elif direction == "vertical":
+                    if self.vel_y > 0:  # Falling
+                        self.rect.bottom = solid.rect.top
+                        self.y = float(self.rect.y)
+                        self.vel_y = 0
+                        self.on_ground = True
+                    elif self.vel_y < 0:  # Jumping
+                        self.rect.top = solid.rect.bottom
+                        self.y = float(self.rect.y)
+                        self.vel_y = 0
+
+    def _hit_wall(self, bounce_direction):
+        """Called after being pushed out of a wall; bounce_direction is away from it."""
+        pass
@@ -0,0 +1,136 @@
+"""
+Computer-controlled players for headless runs.
+
+An agent is called once per tick with the game and returns one action per
+player in roster order. An action is a (keys, shoot) pair: keys is the
+KeyState the player holds this tick and shoot fires their gun. Agents keep
+their own random generator, so the global one stays with the game.
+"""
+import random
+from controls import KeyState, NO_KEYS
+
+IDLE_ACTION = (NO_KEYS, False)
+
+
+class IdleAgent:
+    """Presses nothing."""
+
+    def __init__(self, seed=0):
+        pass
+
+    def __call__(self, game):
+        return [IDLE_ACTION] * len(game.roster["players"])
+
+
+class RandomAgent:
+    """Holds a random mix of left, right and jump, changing it every few ticks."""
+
+    def __init__(self, seed=0, hold_ticks=10, shoot_chance=0.05):
+        self.random = random.Random(seed)
+        self.hold_ticks = hold_ticks
+        self.shoot_chance = shoot_chance
+        self._held = {}
+        self._ticks = 0
+
+    def __call__(self, game):
+        if self._ticks % self.hold_ticks == 0:
+            self._held = {}
+        self._ticks += 1
+
+        actions = []
+        for player in game.roster["players"]:
+            keys = self._held.get(player)
+            if keys is None:
+                controls = player.controls
+                keys = KeyState(
+                    controls[name]
+                    for name in ("left", "right", "jump")
+                    if self.random.random() < 0.5
+                )
+                self._held[player] = keys
+            actions.append((keys, self.random.random() < self.shoot_chance))
+        return actions
+
+
+class ClimberAgent:
+    """
+    Scripted climber: heads for the nearest ladder within reach and climbs
+    it, otherwise walks and hops, turning when blocked. Shoots at enemies
+    on its level that it is facing.
+    """
+
+    def __init__(self, seed=0, reach=150, shoot_every=10):
+        self.random = random.Random(seed)
+        self.reach = reach
+        self.shoot_every = shoot_every
+        self._direction = {}
+        self._last_x = {}
+        self._stuck = {}
+        self._ticks = 0
+
+    def __call__(self, game):
+        self._ticks += 1
+        return [self._act(game, player) for player in game.roster["players"]]
+
+    def _act(self, game, player):
+        if not player.alive:
+            return IDLE_ACTION
+        controls = player.controls
+        rect = player.rect
+        direction = self._direction.setdefault(player, self.random.choice((-1, 1)))
+
+        # Turn around after being blocked for a few ticks
+        if self._last_x.get(player) == rect.x:
+            self._stuck[player] = self._stuck.get(player, 0) + 1
+        else:
+            self._stuck[player] = 0
+        self._last_x[player] = rect.x
+        if self._stuck[player] > 5:
+            direction = -direction
+            self._stuck[player] = 0
+        self._direction[player] = direction
+
+        pressed = set()
+        ladder = self._ladder_in_reach(game, rect)
+        if player.climbing or (ladder is not None and ladder.rect.collidepoint(rect.center)):
+            pressed.add(controls["jump"])
+        elif ladder is not None:
+            direction = 1 if ladder.rect.centerx > rect.centerx else -1
+            self._direction[player] = direction
+        elif player.on_ground and self.random.random() < 0.05:
+            pressed.add(controls["jump"])
+
+        if not player.climbing:
+            pressed.add(controls["right"] if direction > 0 else controls["left"])
+
+        return KeyState(pressed), self._should_shoot(game, player)
+
+    def _ladder_in_reach(self, game, rect):
+        """Nearest ladder reaching above the player at about their height."""
+        best = None
+        best_distance = self.reach
+        for ladder in game.ladders:
+            if ladder.rect.top < rect.top and ladder.rect.bottom >= rect.bottom - 10:
+                distance = abs(ladder.rect.centerx - rect.centerx)
+                if distance < best_distance:
+                    best = ladder
+                    best_distance = distance
+        return best
+
+    def _should_shoot(self, game, player):
+        if self._ticks % self.shoot_every:
+            return False
+        facing = 1 if player.facing_right else -1
+        for group in (game.enemies, game.machinegunners):
+            for enemy in group:
+                dx = enemy.rect.centerx - player.rect.centerx
+                if abs(enemy.rect.centery - player.rect.centery) < 40 and dx * facing > 0:
+                    return True
+        return False
+
+
+AGENTS = {
+    "idle": IdleAgent,
+    "random": RandomAgent,
+    "climber": ClimberAgent,
+}
@@ -0,0 +1,121 @@
+import os
+import pygame
+import surfaces
+from spritesheet import SpriteSheet
+from config import PLAYER_SPRITE_SIZE
+
+PLAYER_ASSET_DIR = "./Assets/Player"
+
+# Surface cache key of the player atlas (see surfaces.cached)
+PLAYER_ATLAS_KEY = ("atlas", "player")
+
+# (animation, frame count) in atlas order. Each animation takes one row and
+# its mirrored twin ("<name>_flipped") the row below it
+PLAYER_ANIMATIONS = (("idle", 11), ("run", 12), ("jump", 1), ("fall", 1))
+
+
+def player_layout():
+    """Frame rects in the player atlas, as {animation: [Rect, ...]}."""
+    width, height = PLAYER_SPRITE_SIZE
+    rects = {}
+    row = 0
+    for name, count in PLAYER_ANIMATIONS:
+        for suffix in ("", "_flipped"):
+            rects[name + suffix] = [
+                pygame.Rect(i * width, row * height, width, height)
+                for i in range(count)
+            ]
+            row += 1
+    return rects
+
+
+def player_atlas_size():
+    width, height = PLAYER_SPRITE_SIZE
+    columns = max(count for _, count in PLAYER_ANIMATIONS)
+    return columns * width, 2 * len(PLAYER_ANIMATIONS) * height
+
+
+def _load_player_frames(name, count):
+    """Decode, slice and scale one animation from its source PNG."""
+    sheet = pygame.image.load(os.path.join(PLAYER_ASSET_DIR, f"player_{name}.png"))
+    if count == 1:
+        # Single-frame animations are used as a whole image
+        frames = [sheet]
+    else:
+        sheet = SpriteSheet(sheet)
+        frames = [sheet.getimage(32 * x, 0, 32, 32) for x in range(count)]
+    return [pygame.transform.scale(frame, PLAYER_SPRITE_SIZE) for frame in frames]
+
+
+def _with_alpha(frame):
+    """frame with per-pixel alpha; colour-keyed pixels become transparent."""
+    if frame.get_flags() & pygame.SRCALPHA:
+        return frame
+    converted = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+    converted.fill((0, 0, 0, 0))
+    converted.blit(frame, (0, 0))
+    return converted
+
+
+def build_player_atlas():
+    """
+    Render every scaled and flipped player frame into one surface.
+
+    Colour-keyed frames end up with a transparent background. Works without
+    a display, so headless games can build it too.
+    """
+    atlas = pygame.Surface(player_atlas_size(), pygame.SRCALPHA)
+    atlas.fill((0, 0, 0, 0))
+    layout = player_layout()
+    for name, count in PLAYER_ANIMATIONS:
+        for frame, rect, flipped_rect in zip(
+            _load_player_frames(name, count),
+            layout[name],
+            layout[name + "_flipped"],
+        ):
+            frame = _with_alpha(frame)
+            # Additive blit onto a cleared atlas copies pixels exactly,
+            # alpha included
+            atlas.blit(frame, rect, special_flags=pygame.BLEND_RGBA_ADD)
+            atlas.blit(
+                pygame.transform.flip(frame, True, False),
+                flipped_rect,
+                special_flags=pygame.BLEND_RGBA_ADD,
+            )
+    return atlas
+
+
+class Atlas:
+    """One surface holding many frames, with frames looked up by name."""
+
+    def __init__(self, surface, rects):
+        self.surface = surface
+        self.rects = rects
+        # Subsurfaces share the atlas pixels, so frames cost no extra memory
+        self._frames = {
+            name: [surface.subsurface(rect) for rect in frame_rects]
+            for name, frame_rects in rects.items()
+        }
+
+    def frames(self, name):
+        return self._frames[name]
+
+    def frame(self, name, index=0):
+        return self._frames[name][index]
+
+
+_atlas = None
+
+
+def load_player_atlas():
+    """
+    Player atlas shared by every player.
+
+    Uses the image installed by the baked asset bundle (see bake.py) when
+    there is one, otherwise builds it from the source PNGs.
+    """
+    global _atlas
+    surface = surfaces.cached(PLAYER_ATLAS_KEY, build_player_atlas, alpha=True)
+    if _atlas is None or _atlas.surface is not surface:
+        _atlas = Atlas(surface, player_layout())
+    return _atlas
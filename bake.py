@@ -0,0 +1,159 @@
+"""
+Offline asset baking.
+
+`python bake.py` pre-renders the player atlas and the ladder image for every
+ladder size in the built-in maps into a bundle under Assets/baked. The game
+installs the bundle into the surface cache at startup, so it only has to
+read finished images instead of decoding, slicing, scaling and drawing.
+
+The bundle is keyed by a hash of its source images, the code that renders
+them and the render parameters. A stale bundle is ignored and everything
+is rendered at runtime as before.
+"""
+import hashlib
+import json
+import os
+import sys
+import pygame
+import surfaces
+import atlas
+from ladder import Ladder
+from map_loader import MapLoader
+from maps import ALL_MAPS
+from config import PLAYER_SPRITE_SIZE, BROWN, ORANGE
+
+BUNDLE_VERSION = 1
+BUNDLE_DIR = "./Assets/baked"
+MANIFEST_NAME = "manifest.json"
+PLAYER_ATLAS_FILE = "player_atlas.png"
+
+# Tile size the game loads maps with; ladder sizes depend on it
+TILE_SIZE = 64
+
+_CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def source_files():
+    """Files whose contents decide what the baked images look like."""
+    files = [
+        os.path.join(atlas.PLAYER_ASSET_DIR, f"player_{name}.png")
+        for name, _ in atlas.PLAYER_ANIMATIONS
+    ]
+    files.extend(
+        os.path.join(_CODE_DIR, name)
+        for name in ("atlas.py", "spritesheet.py", "ladder.py")
+    )
+    return files
+
+
+def bundle_key():
+    """Hash of the bundle version, render parameters and source files."""
+    digest = hashlib.sha256()
+    params = {
+        "version": BUNDLE_VERSION,
+        "sprite_size": PLAYER_SPRITE_SIZE,
+        "animations": atlas.PLAYER_ANIMATIONS,
+        "ladder_colors": (BROWN, ORANGE),
+    }
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    for path in source_files():
+        with open(path, "rb") as source:
+            digest.update(source.read())
+    return digest.hexdigest()
+
+
+def ladder_sizes(tile_size=TILE_SIZE):
+    """Every (width, height) of merged ladder in the built-in maps."""
+    loader = MapLoader(tile_size=tile_size)
+    sizes = set()
+    for map_data in ALL_MAPS.values():
+        for _, _, width, height in loader.load_map(map_data)["ladders"]:
+            sizes.add((width, height))
+    return sorted(sizes)
+
+
+def _ladder_file(width, height):
+    return f"ladder_{width}x{height}.png"
+
+
+def read_manifest(directory=BUNDLE_DIR):
+    """Bundle manifest, or None if there isn't a readable one."""
+    try:
+        with open(os.path.join(directory, MANIFEST_NAME)) as manifest:
+            return json.load(manifest)
+    except (OSError, ValueError):
+        return None
+
+
+def _is_current(manifest, key):
+    return (
+        manifest is not None
+        and manifest.get("version") == BUNDLE_VERSION
+        and manifest.get("key") == key
+    )
+
+
+def bake(directory=BUNDLE_DIR, force=False):
+    """
+    Render the bundle into directory. Needs a display mode.
+
+    Returns True if anything was written, False if the bundle was already
+    up to date.
+    """
+    key = bundle_key()
+    sizes = ladder_sizes()
+    manifest = read_manifest(directory)
+    if (
+        not force
+        and _is_current(manifest, key)
+        and [tuple(size) for size in manifest.get("ladders", [])] == sizes
+    ):
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+    pygame.image.save(
+        atlas.build_player_atlas(), os.path.join(directory, PLAYER_ATLAS_FILE)
+    )
+    for width, height in sizes:
+        pygame.image.save(
+            Ladder.build_image(width, height),
+            os.path.join(directory, _ladder_file(width, height)),
+        )
+
+    # Manifest last, so an interrupted bake never looks current
+    manifest = {"version": BUNDLE_VERSION, "key": key, "ladders": sizes}
+    with open(os.path.join(directory, MANIFEST_NAME), "w") as out:
+        json.dump(manifest, out, indent=2)
+    return True
+
+
+def load_bundle(directory=BUNDLE_DIR):
+    """
+    Install the baked images into the surface cache.
+
+    Returns False, installing nothing, when there is no bundle or it was
+    baked from different sources. Images already in the cache aren't read
+    again, so calling this on every game start is cheap.
+    """
+    manifest = read_manifest(directory)
+    if not _is_current(manifest, bundle_key()):
+        return False
+
+    def loader(name):
+        return lambda: pygame.image.load(os.path.join(directory, name))
+
+    surfaces.cached(atlas.PLAYER_ATLAS_KEY, loader(PLAYER_ATLAS_FILE), alpha=True)
+    for width, height in manifest["ladders"]:
+        surfaces.cached(
+            Ladder.image_key(width, height), loader(_ladder_file(width, height))
+        )
+    return True
+
+
+if __name__ == "__main__":
+    pygame.init()
+    pygame.display.set_mode((1, 1), pygame.HIDDEN)
+    if bake(force="--force" in sys.argv):
+        print(f"Baked assets into {BUNDLE_DIR}")
+    else:
+        print(f"Assets in {BUNDLE_DIR} are up to date")
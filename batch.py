@@ -0,0 +1,197 @@
+"""
+Run many headless games in parallel, for balancing.
+
+Each episode is a fresh headless Game driven by an agent (see agents.py)
+with its own seed and map. Episodes are spread over a process pool and
+their results are yielded as they finish, so a batch of any size can be
+written out or summarised without holding it in memory.
+
+    python batch.py --runs 1000 --maps level_1 level_2 --agent climber --out results.jsonl
+"""
+import argparse
+import itertools
+import json
+import multiprocessing
+import random
+import sys
+import time
+from agents import AGENTS
+from config import FPS
+
+# Five simulated minutes at the game's frame rate
+DEFAULT_MAX_TICKS = 300 * FPS
+
+
+def run_episode(
+    map_name="test",
+    seed=0,
+    agent="random",
+    num_players=1,
+    max_ticks=DEFAULT_MAX_TICKS,
+    delta_time=1.0 / FPS,
+):
+    """Play one headless game to the end (or max_ticks) and describe how it went."""
+    # Imported here so pool workers only load the game when they first run
+    from game import Game
+
+    started = time.perf_counter()
+    random.seed(seed)
+    game = Game(num_players, map_name, headless=True)
+    policy = AGENTS[agent](seed)
+    players = game.roster["players"]
+    setup_time = time.perf_counter() - started
+
+    agent_time = 0.0
+    simulate_time = 0.0
+    height = max_height = 0
+    ticks = 0
+    while ticks < max_ticks and not (game.game_over or game.victory):
+        before_agent = time.perf_counter()
+        actions = policy(game)
+        before_update = time.perf_counter()
+        for player, (_, shoot) in zip(players, actions):
+            if shoot:
+                game.player_shoot(player)
+        game.update(delta_time, [keys for keys, _ in actions])
+        done = time.perf_counter()
+        agent_time += before_update - before_agent
+        simulate_time += done - before_update
+        ticks += 1
+
+        # Height of the last tick anyone was alive is the death height
+        if not game.game_over:
+            height = game.height_climbed()
+            max_height = max(max_height, height)
+
+    if game.victory:
+        outcome = "victory"
+    elif game.game_over:
+        outcome = "death"
+    else:
+        outcome = "timeout"
+
+    stats = game.stats
+    return {
+        "map": map_name,
+        "seed": seed,
+        "agent": agent,
+        "players": num_players,
+        "outcome": outcome,
+        "ticks": ticks,
+        "time": ticks * delta_time,
+        "max_height": max_height,
+        "death_height": height if outcome == "death" else None,
+        "kills": stats.kills,
+        "shots_fired": stats.shots_fired,
+        "player_deaths": stats.player_deaths,
+        "timings": {
+            "setup": setup_time,
+            "agent": agent_time,
+            "simulate": simulate_time,
+            "total": time.perf_counter() - started,
+        },
+    }
+
+
+def _run_task(task):
+    return run_episode(**task)
+
+
+def make_tasks(runs, maps=("test",), agent="random", seed=0, **options):
+    """Lazily generate episode settings, cycling through maps with one seed each."""
+    for index, map_name in zip(range(runs), itertools.cycle(maps)):
+        yield dict(options, map_name=map_name, seed=seed + index, agent=agent)
+
+
+def run_batch(tasks, workers=None, chunksize=4):
+    """
+    Run episodes from an iterable of run_episode() keyword dicts, yielding
+    each result as soon as it's ready (not in task order).
+
+    workers defaults to one per CPU; workers=1 runs in this process.
+    """
+    if workers == 1:
+        for task in tasks:
+            yield _run_task(task)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield from pool.imap_unordered(_run_task, tasks, chunksize)
+
+
+class BatchSummary:
+    """Running totals over a stream of episode results."""
+
+    def __init__(self):
+        self.episodes = 0
+        self.outcomes = {"victory": 0, "death": 0, "timeout": 0}
+        self.kills = 0
+        self.ticks = 0
+        self.max_height = 0
+        self.height_total = 0
+        self.timings = {}
+
+    def add(self, result):
+        self.episodes += 1
+        self.outcomes[result["outcome"]] += 1
+        self.kills += result["kills"]
+        self.ticks += result["ticks"]
+        self.height_total += result["max_height"]
+        self.max_height = max(self.max_height, result["max_height"])
+        for phase, seconds in result["timings"].items():
+            self.timings[phase] = self.timings.get(phase, 0.0) + seconds
+
+    def as_dict(self):
+        episodes = max(self.episodes, 1)
+        return {
+            "episodes": self.episodes,
+            "outcomes": dict(self.outcomes),
+            "win_rate": self.outcomes["victory"] / episodes,
+            "mean_height": self.height_total / episodes,
+            "max_height": self.max_height,
+            "mean_kills": self.kills / episodes,
+            "ticks": self.ticks,
+            "timings": dict(self.timings),
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--maps", nargs="+", default=["test"])
+    parser.add_argument("--agent", choices=sorted(AGENTS), default="random")
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--ticks", type=int, default=DEFAULT_MAX_TICKS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--out", default="-", help="JSON lines file for results ('-' for stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    tasks = make_tasks(
+        args.runs,
+        args.maps,
+        args.agent,
+        args.seed,
+        num_players=args.players,
+        max_ticks=args.ticks,
+    )
+    summary = BatchSummary()
+    started = time.perf_counter()
+    out = sys.stdout if args.out == "-" else open(args.out, "w")
+    try:
+        for result in run_batch(tasks, args.workers):
+            out.write(json.dumps(result) + "\n")
+            summary.add(result)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    report = summary.as_dict()
+    report["wall_time"] = time.perf_counter() - started
+    report["ticks_per_second"] = summary.ticks / report["wall_time"]
+    print(json.dumps(report, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+from itertools import islice
+import pygame
+
+
+class BlitBatch:
+    """
+    Reusable (image, destination) sequence for one render layer.
+
+    Each frame the layer is cleared and refilled with add(); destination
+    rects and the [image, rect] pairs are kept between frames and updated in
+    place, so building a layer doesn't allocate once it has warmed up. The
+    whole layer is then submitted with a single Surface.blits call.
+    """
+
+    def __init__(self):
+        self._pairs = []
+        self.count = 0
+
+    def clear(self):
+        self.count = 0
+
+    def add(self, image, x, y):
+        """Queue image to be drawn with its top-left corner at (x, y)."""
+        i = self.count
+        if i == len(self._pairs):
+            self._pairs.append([image, pygame.Rect(x, y, 0, 0)])
+        else:
+            pair = self._pairs[i]
+            pair[0] = image
+            dest = pair[1]
+            dest.x = x
+            dest.y = y
+        self.count = i + 1
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        """Iterate the queued (image, dest) pairs."""
+        return islice(self._pairs, self.count)
+
+    def dest_rects(self):
+        """Screen areas the queued images will cover."""
+        return [
+            pygame.Rect(dest.x, dest.y, image.get_width(), image.get_height())
+            for image, dest in self
+        ]
+
+    def draw(self, surface, doreturn=False):
+        """Blit every queued image onto surface in one call."""
+        if self.count == 0:
+            return [] if doreturn else None
+        return surface.blits(iter(self), doreturn)
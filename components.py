@@ -0,0 +1,149 @@
+from array import array
+import numpy as np
+
+# Entity kinds
+KIND_PLAYER = 0
+KIND_ENEMY = 1
+KIND_MACHINEGUNNER = 2
+
+# Component columns: name -> array typecode. Grouped by component:
+# position, velocity, collider, AI state and weapon.
+COLUMNS = {
+    # Position
+    "x": "d",
+    "y": "d",
+    # Velocity
+    "vel_x": "d",
+    "vel_y": "d",
+    # Collider
+    "width": "i",
+    "height": "i",
+    "on_ground": "b",
+    "sleeping": "b",
+    # AI state
+    "alert_state": "b",
+    "alert_timer": "d",
+    "alert_cooldown": "d",
+    "raycast_timer": "d",
+    "facing_direction": "b",
+    # Weapon
+    "shoot_timer": "d",
+    "burst_shot_count": "i",
+    "in_cooldown": "b",
+}
+
+
+class ComponentStore:
+    """
+    Structure-of-arrays storage for actor components.
+
+    Each actor owns one slot (its entity id) across a set of typed columns.
+    Sprites read and write their slot through Component descriptors, while
+    systems can process every entity of a kind at once through zero-copy
+    NumPy views of the columns.
+    """
+
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.columns = {
+            name: array(typecode, bytes(array(typecode).itemsize * capacity))
+            for name, typecode in COLUMNS.items()
+        }
+        self.kind = array("b", bytes(capacity))
+        self.live = array("b", bytes(capacity))
+        self.size = 0  # High-water mark of allocated slots
+        self._free = []
+        self._views = {}
+
+    def allocate(self, kind):
+        """Reserve a zeroed slot for a new entity and return its id."""
+        if self._free:
+            eid = self._free.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            eid = self.size
+            self.size += 1
+        for column in self.columns.values():
+            column[eid] = 0
+        self.kind[eid] = kind
+        self.live[eid] = 1
+        return eid
+
+    def release(self, eid):
+        """Return an entity's slot to the free list."""
+        if self.live[eid]:
+            self.live[eid] = 0
+            self._free.append(eid)
+
+    def _grow(self):
+        # New arrays rather than resizing in place: NumPy views of the old
+        # buffers may still be alive, and resizing an exported buffer fails
+        self.capacity *= 2
+        for name, column in self.columns.items():
+            grown = array(column.typecode, bytes(column.itemsize * self.capacity))
+            grown[: self.size] = column
+            self.columns[name] = grown
+        for name in ("kind", "live"):
+            grown = array("b", bytes(self.capacity))
+            grown[: self.size] = getattr(self, name)
+            setattr(self, name, grown)
+        self._views = {}
+
+    def view(self, name):
+        """NumPy view over a column (shares memory with the store)."""
+        cached = self._views.get(name)
+        if cached is None:
+            if name in ("kind", "live"):
+                source = getattr(self, name)
+            else:
+                source = self.columns[name]
+            cached = np.frombuffer(source, dtype=source.typecode)
+            self._views[name] = cached
+        return cached[: self.size]
+
+    def select(self, kind):
+        """Ids of every live entity of a kind, as a NumPy array."""
+        return np.flatnonzero(
+            (self.view("live") == 1) & (self.view("kind") == kind)
+        )
+
+    def __len__(self):
+        return self.size - len(self._free)
+
+
+# Store used by actors created without an explicit one
+default_store = ComponentStore()
+
+
+class Component:
+    """Descriptor exposing one component column as a sprite attribute."""
+
+    def __init__(self, column, cast=float):
+        self.column = column
+        self.cast = cast
+
+    def __get__(self, actor, owner=None):
+        if actor is None:
+            return self
+        return self.cast(actor._store.columns[self.column][actor._eid])
+
+    def __set__(self, actor, value):
+        actor._store.columns[self.column][actor._eid] = value
+
+
+class EnumComponent(Component):
+    """Component storing one of a fixed set of values as a small integer code."""
+
+    def __init__(self, column, values):
+        super().__init__(column)
+        self.values = values
+        self.codes = {value: code for code, value in enumerate(values)}
+
+    def __get__(self, actor, owner=None):
+        if actor is None:
+            return self
+        return self.values[actor._store.columns[self.column][actor._eid]]
+
+    def __set__(self, actor, value):
+        actor._store.columns[self.column][actor._eid] = self.codes[value]
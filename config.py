@@ -15,6 +15,9 @@ CYAN = (0, 255, 255)
 BROWN = (139, 69, 19)
 ORANGE = (255, 165, 0)
 
+# Size player animation frames are scaled to
+PLAYER_SPRITE_SIZE = (45, 60)
+
 # Game settings (all speeds are now per second, not per frame)
 GRAVITY = 2000  # pixels per second squared (was 0.8 per frame² * 50² FPS)
 PLAYER_SPEED = 175  # pixels per second (was 3.5 per frame * 50 FPS)
@@ -0,0 +1,61 @@
+class KeyState:
+    """
+    Set of pressed keys that can stand in for pygame.key.get_pressed().
+
+    Lets scripted agents, network clients and replays drive players without
+    a keyboard or a display.
+    """
+
+    def __init__(self, pressed=()):
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def __eq__(self, other):
+        return isinstance(other, KeyState) and self.pressed == other.pressed
+
+    def __hash__(self):
+        return hash(self.pressed)
+
+    def __repr__(self):
+        return f"KeyState({sorted(self.pressed)})"
+
+
+# Nothing pressed
+NO_KEYS = KeyState()
+
+
+# Controls in an input bitmask, lowest bit first. New controls go on the
+# end so existing masks keep their meaning
+INPUT_CONTROLS = ("left", "right", "jump", "shoot", "down")
+SHOOT_BIT = 1 << INPUT_CONTROLS.index("shoot")
+
+# Controls that move the player, as opposed to firing
+MOVE_CONTROLS = tuple(name for name in INPUT_CONTROLS if name != "shoot")
+
+
+def input_bits(held=(), shoot=False):
+    """Bitmask of held control names, plus the shoot button."""
+    bits = 0
+    for name in held:
+        bits |= 1 << INPUT_CONTROLS.index(name)
+    if shoot:
+        bits |= SHOOT_BIT
+    return bits
+
+
+def key_table(controls):
+    """
+    KeyState for every input bitmask, indexed by the bits. controls maps
+    names to key codes; the shoot key counts as held while its bit is set
+    (players jump off ladders with it).
+    """
+    return [
+        KeyState(
+            controls[name]
+            for index, name in enumerate(INPUT_CONTROLS)
+            if bits & (1 << index)
+        )
+        for bits in range(1 << len(INPUT_CONTROLS))
+    ]
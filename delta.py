@@ -0,0 +1,425 @@
+"""
+Delta-compressed game state for network clients.
+
+A client is sent the level once (encode_level) and then, every tick, only
+what changed since the last frame it was sent (DeltaEncoder). Frames carry
+just what clients need to draw the game, quantised to whole pixels:
+
+- camera, game over / victory flags and stats
+- per roster actor: rect x, y and a state byte (in play, facing, alert,
+  animation frame)
+- projectiles by id: spawned (with position, direction and colour),
+  moved other than along their last step, or removed
+
+Values are bit-packed: unchanged actors and fields cost one bit each, and
+changes are written as zigzag deltas in the smallest of a few widths.
+Frames must be decoded in the order they were encoded.
+
+    python delta.py --ticks 600   # bytes-per-tick report for every map
+"""
+import argparse
+import json
+import random
+import struct
+import zlib
+import numpy as np
+
+# Version of the level format sent by encode_level().
+# 2: the map's rows, so clients can build maps they do not have
+LEVEL_VERSION = 2
+
+# Version of the frame format, bumped whenever DeltaEncoder's output changes.
+# 2: projectiles are predicted to keep their last x step
+DELTA_VERSION = 2
+
+# Widths a signed delta can be written in, chosen by a 2-bit prefix
+DELTA_WIDTHS = (4, 8, 16, 32)
+
+# Projectile ids wrap at this many bits
+PROJECTILE_ID_BITS = 16
+
+# Actor state byte
+IN_PLAY = 1
+ALIVE = 2
+FACING_RIGHT = 4
+MOVING = 8
+ALERT_SHIFT = 1  # Enemies: alert_state code in bits 1-2
+RUN_SHIFT = 4  # Players: run animation frame in bits 4-7
+
+# version, tile size, map name length
+_LEVEL = struct.Struct("<BHB")
+
+
+class BitWriter:
+    """Appends unsigned and signed values of any bit width."""
+
+    def __init__(self):
+        self._value = 0
+        self._length = 0
+
+    def write(self, value, bits):
+        self._value |= (value & ((1 << bits) - 1)) << self._length
+        self._length += bits
+
+    def write_signed(self, value):
+        zigzag = value << 1 if value >= 0 else (-value << 1) - 1
+        for prefix, width in enumerate(DELTA_WIDTHS):
+            if zigzag < 1 << width:
+                break
+        self.write(prefix, 2)
+        self.write(zigzag, width)
+
+    def getvalue(self):
+        return self._value.to_bytes((self._length + 7) // 8, "little")
+
+
+class BitReader:
+    """Reads values written by a BitWriter."""
+
+    def __init__(self, data):
+        self._value = int.from_bytes(data, "little")
+        self._position = 0
+
+    def read(self, bits):
+        value = (self._value >> self._position) & ((1 << bits) - 1)
+        self._position += bits
+        return value
+
+    def read_signed(self):
+        zigzag = self.read(DELTA_WIDTHS[self.read(2)])
+        return zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)
+
+
+def encode_level(game):
+    """The level as the map's rows (tiles and spawn markers), compressed."""
+    name = game.map_name.encode()
+    header = _LEVEL.pack(LEVEL_VERSION, game.map_loader.tile_size, len(name))
+    return header + name + zlib.compress("\n".join(game.map_data).encode())
+
+
+def decode_level(data):
+    """Returns (map name, tile size, map rows) from encode_level() bytes."""
+    version, tile_size, name_length = _LEVEL.unpack_from(data)
+    if version != LEVEL_VERSION:
+        raise ValueError(f"level version {version} (expected {LEVEL_VERSION})")
+    offset = _LEVEL.size
+    map_name = bytes(data[offset : offset + name_length]).decode()
+    rows = zlib.decompress(data[offset + name_length :]).decode().split("\n")
+    return map_name, tile_size, rows
+
+
+def _actor_rows(game):
+    """Quantised (x, y, state) of every roster actor, in roster order."""
+    rows = []
+    for player in game.roster["players"]:
+        state = (
+            (IN_PLAY if player in game.players else 0)
+            | (ALIVE if player.alive else 0)
+            | (FACING_RIGHT if player.facing_right else 0)
+            | (MOVING if player.vel_x != 0 else 0)
+            | player.run_state << RUN_SHIFT
+        )
+        rows.append((player.rect.x, player.rect.y, state))
+    for enemy in game.roster["enemies"]:
+        state = (
+            (IN_PLAY if enemy in game.enemies else 0)
+            | type(enemy).alert_state.values.index(enemy.alert_state) << ALERT_SHIFT
+        )
+        rows.append((enemy.rect.x, enemy.rect.y, state))
+    for machinegunner in game.roster["machinegunners"]:
+        state = IN_PLAY if machinegunner in game.machinegunners else 0
+        rows.append((machinegunner.rect.x, machinegunner.rect.y, state))
+    return rows
+
+
+def _stats_row(game):
+    stats = game.stats
+    return (
+        stats.shots_fired,
+        stats.hits,
+        stats.kills,
+        stats.player_deaths,
+        stats.alerts,
+        int(stats.exit_reached),
+    )
+
+
+def _write_fields(writer, old, new):
+    """One change bit per field, then deltas of the changed ones."""
+    changed = [a != b for a, b in zip(old, new)]
+    for flag in changed:
+        writer.write(flag, 1)
+    for flag, a, b in zip(changed, old, new):
+        if flag:
+            writer.write_signed(b - a)
+
+
+def _read_fields(reader, old):
+    flags = [reader.read(1) for _ in old]
+    return tuple(
+        value + reader.read_signed() if flag else value for flag, value in zip(flags, old)
+    )
+
+
+class DeltaEncoder:
+    """
+    Encodes one client's stream of frames. The first frame (and the first
+    after reset()) is a delta from an empty game, so it holds everything.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._camera = 0
+        self._stats = (0,) * 6
+        self._actors = None
+        self._projectiles = {}  # id -> (x, y, last x step)
+        self._ids = {}  # projectile sprite -> id
+        self._next_id = 0
+
+    def encode(self, game, tick):
+        writer = BitWriter()
+        writer.write(tick, 32)
+        flags = (1 if game.game_over else 0) | (2 if game.victory else 0)
+        writer.write(flags, 2)
+        camera = int(game.camera_y)
+        writer.write_signed(camera - self._camera)
+        self._camera = camera
+
+        stats = _stats_row(game)
+        writer.write(stats != self._stats, 1)
+        if stats != self._stats:
+            for old, new in zip(self._stats, stats):
+                writer.write_signed(new - old)
+            self._stats = stats
+
+        actors = _actor_rows(game)
+        previous = self._actors or [(0, 0, 0)] * len(actors)
+        for old, new in zip(previous, actors):
+            writer.write(old != new, 1)
+            if old != new:
+                _write_fields(writer, old, new)
+        self._actors = actors
+
+        self._encode_projectiles(writer, game)
+        return writer.getvalue()
+
+    def _encode_projectiles(self, writer, game):
+        current = {}
+        spawned = []
+        for projectile in game.projectiles:
+            eid = self._ids.get(projectile)
+            if eid is None:
+                eid = self._next_id
+                self._next_id = (self._next_id + 1) % (1 << PROJECTILE_ID_BITS)
+                self._ids[projectile] = eid
+                spawned.append((eid, projectile))
+            current[eid] = projectile
+
+        removed = [eid for eid in self._projectiles if eid not in current]
+        writer.write_signed(len(removed))
+        for eid in removed:
+            writer.write(eid, PROJECTILE_ID_BITS)
+            del self._projectiles[eid]
+        self._ids = {projectile: eid for eid, projectile in current.items()}
+
+        # Survivors in id order, as the decoder has them. Projectiles fly
+        # straight, so only a departure from the last step is sent
+        for eid in sorted(self._projectiles):
+            rect = current[eid].rect
+            x, y, step = self._projectiles[eid]
+            predicted = (x + step, y)
+            position = (rect.x, rect.y)
+            writer.write(predicted != position, 1)
+            if predicted != position:
+                _write_fields(writer, predicted, position)
+            self._projectiles[eid] = (rect.x, rect.y, rect.x - x)
+
+        writer.write_signed(len(spawned))
+        for eid, projectile in spawned:
+            writer.write(eid, PROJECTILE_ID_BITS)
+            writer.write_signed(projectile.rect.x)
+            writer.write_signed(projectile.rect.y)
+            writer.write(projectile.direction > 0, 1)
+            writer.write(projectile.owner_type == "player", 1)
+            red, green, blue = projectile.color[:3]
+            writer.write(red | green << 8 | blue << 16, 24)
+            self._projectiles[eid] = (projectile.rect.x, projectile.rect.y, 0)
+
+
+class DeltaDecoder:
+    """Applies one encoder's frames, in order, to a client's Game."""
+
+    def __init__(self):
+        self._camera = 0
+        self._stats = (0,) * 6
+        self._actors = None
+        self._projectiles = {}  # id -> Projectile
+        self._steps = {}  # id -> last x step
+
+    def apply(self, game, data):
+        """Bring game up to date with a frame; returns the frame's tick."""
+        from projectile import Projectile
+
+        if self._actors is None:
+            # A first frame holds every projectile, so start from none
+            game.projectiles.empty()
+
+        reader = BitReader(data)
+        tick = reader.read(32)
+        flags = reader.read(2)
+        self._camera += reader.read_signed()
+
+        if reader.read(1):
+            self._stats = tuple(old + reader.read_signed() for old in self._stats)
+
+        roster = game.roster
+        actors = [actor for name in ("players", "enemies", "machinegunners") for actor in roster[name]]
+        previous = self._actors or [(0, 0, 0)] * len(actors)
+        rows = [
+            _read_fields(reader, old) if reader.read(1) else old for old in previous
+        ]
+
+        removed = [reader.read(PROJECTILE_ID_BITS) for _ in range(reader.read_signed())]
+        for eid in removed:
+            self._projectiles.pop(eid).kill()
+            del self._steps[eid]
+        for eid in sorted(self._projectiles):
+            rect = self._projectiles[eid].rect
+            old_x = rect.x
+            predicted = (old_x + self._steps[eid], rect.y)
+            rect.x, rect.y = _read_fields(reader, predicted) if reader.read(1) else predicted
+            self._steps[eid] = rect.x - old_x
+        for _ in range(reader.read_signed()):
+            eid = reader.read(PROJECTILE_ID_BITS)
+            x = reader.read_signed()
+            y = reader.read_signed()
+            direction = 1 if reader.read(1) else -1
+            owner = "player" if reader.read(1) else "enemy"
+            color = reader.read(24)
+            projectile = Projectile(
+                x, y, direction, (color & 255, color >> 8 & 255, color >> 16), owner
+            )
+            projectile.rect.x = x
+            projectile.rect.y = y
+            self._projectiles[eid] = projectile
+            self._steps[eid] = 0
+            game.projectiles.add(projectile)
+
+        self._apply_actors(game, actors, previous, rows)
+        self._actors = rows
+
+        game.camera_y = self._camera
+        game.game_over = bool(flags & 1)
+        game.victory = bool(flags & 2)
+        stats = game.stats
+        (
+            stats.shots_fired,
+            stats.hits,
+            stats.kills,
+            stats.player_deaths,
+            stats.alerts,
+            exit_reached,
+        ) = self._stats
+        stats.exit_reached = bool(exit_reached)
+        game.hud.counts_dirty = True
+        return tick
+
+    def _apply_actors(self, game, actors, previous, rows):
+        regroup = self._actors is None
+        for actor, old, (x, y, state) in zip(actors, previous, rows):
+            actor.rect.x = x
+            actor.rect.y = y
+            if (old[2] ^ state) & IN_PLAY:
+                regroup = True
+
+        roster = game.roster
+        players = len(roster["players"])
+        enemies = len(roster["enemies"])
+        for player, (_, _, state) in zip(roster["players"], rows):
+            player.alive = bool(state & ALIVE)
+            player.facing_right = bool(state & FACING_RIGHT)
+            player.vel_x = 1 if state & MOVING else 0
+            player.run_state = state >> RUN_SHIFT
+            player.image = player.current_frame()
+        for enemy, (_, _, state) in zip(roster["enemies"], rows[players:]):
+            enemy.alert_state = type(enemy).alert_state.values[state >> ALERT_SHIFT & 3]
+
+        if regroup:
+            # Refilled in roster order, as snapshot restores do
+            offset = 0
+            for name, count in (
+                ("players", players),
+                ("enemies", enemies),
+                ("machinegunners", len(roster["machinegunners"])),
+            ):
+                group = getattr(game, name)
+                group.empty()
+                for actor, (_, _, state) in zip(roster[name], rows[offset : offset + count]):
+                    if state & IN_PLAY:
+                        group.add(actor)
+                        game.all_sprites.add(actor)
+                    else:
+                        actor.kill()
+                offset += count
+            game.enemy_index.invalidate()
+
+
+def measure(map_name, ticks=600, seed=0, agent="climber", num_players=1):
+    """
+    Play a headless game with an agent and measure what streaming it costs:
+    the level message, and per tick the delta frame against a full snapshot.
+    """
+    from agents import AGENTS
+    from config import FPS
+    from game import Game
+
+    random.seed(seed)
+    game = Game(num_players, map_name, headless=True)
+    policy = AGENTS[agent](seed)
+    encoder = DeltaEncoder()
+    first = len(encoder.encode(game, 0))
+    delta_sizes = []
+    snapshot_sizes = []
+    for tick in range(1, ticks + 1):
+        if game.game_over or game.victory:
+            break
+        actions = policy(game)
+        for player, (_, shoot) in zip(game.roster["players"], actions):
+            if shoot:
+                game.player_shoot(player)
+        game.update(1.0 / FPS, [keys for keys, _ in actions])
+        delta_sizes.append(len(encoder.encode(game, tick)))
+        snapshot_sizes.append(len(game.snapshot()))
+    return {
+        "map": map_name,
+        "ticks": len(delta_sizes),
+        "level_bytes": len(encode_level(game)),
+        "first_frame_bytes": first,
+        "delta_mean": float(np.mean(delta_sizes)),
+        "delta_max": int(np.max(delta_sizes)),
+        "snapshot_mean": float(np.mean(snapshot_sizes)),
+    }
+
+
+def main(argv=None):
+    from maps import ALL_MAPS
+
+    parser = argparse.ArgumentParser(description="Bytes-per-tick report for each map")
+    parser.add_argument("--maps", nargs="+", default=sorted(ALL_MAPS))
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--agent", default="climber")
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    pygame.init()
+    for map_name in args.maps:
+        print(json.dumps(measure(map_name, args.ticks, args.seed, args.agent)))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,5 @@
-from pygame.sprite import Sprite
 import pygame
+import surfaces
 from config import (
     RED,
     ENEMY_SPEED,
@@ -15,15 +15,29 @@ from config import (
     ENEMY_BURST_COOLDOWN,
 )
 from projectile import Projectile
+from perception import Perception
+from actor import Actor
+from components import KIND_ENEMY, Component, EnumComponent
 import random
 
 
-class Enemy(Sprite):
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((30, 30))
-        self.image.fill(RED)
+class Enemy(Actor):
+    KIND = KIND_ENEMY
+
+    # AI state and weapon components
+    alert_state = EnumComponent("alert_state", ("PATROL", "ALERT", "COOLDOWN"))
+    alert_timer = Component("alert_timer")
+    alert_cooldown = Component("alert_cooldown")
+    raycast_timer = Component("raycast_timer")
+    facing_direction = Component("facing_direction", int)
+    shoot_timer = Component("shoot_timer")
+    burst_shot_count = Component("burst_shot_count", int)
+
+    def __init__(self, x, y, store=None):
+        super().__init__(store)
+        self.image = surfaces.solid((30, 30), RED)
         self.rect = self.image.get_rect()
+        self._init_collider()
         self.x = float(x)  # Store position as floats
         self.y = float(y)
         self.rect.x = int(self.x)
@@ -49,9 +63,27 @@ class Enemy(Sprite):
         self.burst_shot_interval = ENEMY_BURST_SHOT_INTERVAL
         self.burst_cooldown = ENEMY_BURST_COOLDOWN
 
-    def update(self, platforms, obstacles, players, camera_y, delta_time):
+    def update(
+        self,
+        platforms,
+        obstacles,
+        players,
+        camera_y,
+        delta_time,
+        perception=None,
+        integrate_vertical=True,
+    ):
+        """
+        Run AI and movement for one tick. With integrate_vertical=False the
+        gravity and landing step is left to a batched physics system.
+
+        Returns the player that was spotted if it alerted the enemy this
+        tick, otherwise None.
+        """
         # Update alert state machine
-        self._update_alert_state(players, platforms, obstacles, camera_y, delta_time)
+        spotted = self._update_alert_state(
+            players, platforms, obstacles, camera_y, delta_time, perception
+        )
 
         # Movement behavior depends on alert state
         if self.alert_state == "ALERT":
@@ -64,8 +96,15 @@ class Enemy(Sprite):
                 self.vel_x = -self.vel_x
                 self.facing_direction = 1 if self.vel_x > 0 else -1
 
+        # Walking off may leave the ground, so moving enemies never sleep
+        if self.sleeping and self.vel_x != 0:
+            self.wake()
+        # Sleeping enemies rest on static geometry and skip gravity
+        integrate_vertical = integrate_vertical and not self.sleeping
+
         # Apply gravity (multiply by delta_time)
-        self.vel_y += GRAVITY * delta_time
+        if integrate_vertical:
+            self.vel_y += GRAVITY * delta_time
 
         # Update position using floats (multiply by delta_time)
         self.x += self.vel_x * delta_time
@@ -73,11 +112,13 @@ class Enemy(Sprite):
         self.check_platform_collision(platforms, "horizontal")
         self.check_obstacle_collision(obstacles, "horizontal")
 
-        self.y += self.vel_y * delta_time
-        self.rect.y = int(self.y)
-        self.on_ground = False
-        self.check_platform_collision(platforms, "vertical")
-        self.check_obstacle_collision(obstacles, "vertical")
+        if integrate_vertical:
+            self.y += self.vel_y * delta_time
+            self.rect.y = int(self.y)
+            self.on_ground = False
+            self.check_platform_collision(platforms, "vertical")
+            self.check_obstacle_collision(obstacles, "vertical")
+            self._settle()
 
         # Keep enemy within horizontal screen bounds
         if self.rect.left < 0:
@@ -91,51 +132,11 @@ class Enemy(Sprite):
             self.vel_x = -ENEMY_SPEED
             self.facing_direction = -1
 
-    def check_platform_collision(self, platforms, direction):
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if direction == "horizontal":
-                    if self.vel_x > 0:  # Moving right
-                        self.rect.right = platform.rect.left
-                        self.x = float(self.rect.x)
-                        self.vel_x = -ENEMY_SPEED
-                    elif self.vel_x < 0:  # Moving left
-                        self.rect.left = platform.rect.right
-                        self.x = float(self.rect.x)
-                        self.vel_x = ENEMY_SPEED
-                elif direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = platform.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Jumping
-                        self.rect.top = platform.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-
-    def check_obstacle_collision(self, obstacles, direction):
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle.rect):
-                if direction == "horizontal":
-                    if self.vel_x > 0:  # Moving right
-                        self.rect.right = obstacle.rect.left
-                        self.x = float(self.rect.x)
-                        self.vel_x = -ENEMY_SPEED
-                    elif self.vel_x < 0:  # Moving left
-                        self.rect.left = obstacle.rect.right
-                        self.x = float(self.rect.x)
-                        self.vel_x = ENEMY_SPEED
-                elif direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = obstacle.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Jumping
-                        self.rect.top = obstacle.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
+        return spotted
+
+    def _hit_wall(self, bounce_direction):
+        # Turn around when walking into a wall
+        self.vel_x = bounce_direction * ENEMY_SPEED
 
     def _check_platform_edge(self, platforms, delta_time):
         """Check if enemy is approaching a platform edge."""
@@ -164,10 +165,15 @@ class Enemy(Sprite):
 
         return True  # No ground - edge detected
 
-    def _raycast_to_player(self, player, platforms, obstacles, max_distance=SCREEN_WIDTH):
+    def _raycast_to_player(
+        self, player, platforms, obstacles, max_distance=SCREEN_WIDTH, perception=None
+    ):
         """
-        Cast a ray from enemy to player to check if there's a clear line of sight.
+        Check if there's a clear line of sight from enemy to player.
         Returns True if player is visible (no obstacles blocking).
+
+        Uses the shared per-tick perception pass when one is given; otherwise a
+        one-off pass is built from the platforms and obstacles passed in.
         """
         # Get center positions
         enemy_center_x = self.rect.centerx
@@ -180,38 +186,20 @@ class Enemy(Sprite):
         if vertical_distance > ENEMY_DETECTION_VERTICAL_TOLERANCE:
             return False
 
-        # Determine horizontal direction and distance
-        direction = 1 if player_center_x > enemy_center_x else -1
         horizontal_distance = abs(player_center_x - enemy_center_x)
-
         if horizontal_distance > max_distance:
             return False
 
-        # Cast ray in steps checking for collisions
-        step_size = 10  # Check every 10 pixels
-        num_steps = int(horizontal_distance / step_size)
-
-        for i in range(1, num_steps + 1):
-            # Calculate point along ray
-            check_x = enemy_center_x + (direction * step_size * i)
-            check_y = enemy_center_y
+        if perception is None:
+            perception = Perception()
+            perception.begin_tick(platforms, obstacles)
 
-            # Create small test rect
-            test_rect = pygame.Rect(check_x - 2, check_y - 2, 4, 4)
+        # Ray travels horizontally along the enemy's eye row
+        return perception.line_of_sight(enemy_center_x, player_center_x, enemy_center_y)
 
-            # Check collision with platforms
-            for platform in platforms:
-                if test_rect.colliderect(platform.rect):
-                    return False  # Line of sight blocked
-
-            # Check collision with obstacles
-            for obstacle in obstacles:
-                if test_rect.colliderect(obstacle.rect):
-                    return False  # Line of sight blocked
-
-        return True  # Clear line of sight
-
-    def _check_player_detection(self, players, platforms, obstacles, delta_time):
+    def _check_player_detection(
+        self, players, platforms, obstacles, delta_time, perception=None
+    ):
         """
         Check if any player is visible via raycast. Returns detected player or None.
         Uses timer to avoid raycasting every frame.
@@ -233,7 +221,9 @@ class Enemy(Sprite):
             if not player.alive:
                 continue
 
-            can_see = self._raycast_to_player(player, platforms, obstacles)
+            can_see = self._raycast_to_player(
+                player, platforms, obstacles, perception=perception
+            )
             if can_see:
                 return player
 
@@ -255,16 +245,22 @@ class Enemy(Sprite):
         # Resume patrol movement in current facing direction
         self.vel_x = self.facing_direction * ENEMY_SPEED
 
-    def _update_alert_state(self, players, platforms, obstacles, camera_y, delta_time):
+    def _update_alert_state(
+        self, players, platforms, obstacles, camera_y, delta_time, perception=None
+    ):
         """
         Update alert state machine based on player detection and timers.
+        Returns the player that took the enemy out of patrol, if one did.
         """
         if self.alert_state == "PATROL":
             # Check for player detection via raycast
-            detected_player = self._check_player_detection(players, platforms, obstacles, delta_time)
+            detected_player = self._check_player_detection(
+                players, platforms, obstacles, delta_time, perception
+            )
 
             if detected_player:
                 self._enter_alert_state(detected_player)
+                return detected_player
 
         elif self.alert_state == "ALERT":
             # Update alert timer
@@ -275,7 +271,9 @@ class Enemy(Sprite):
                 self._exit_alert_state()
             else:
                 # Re-check for player to refresh alert or update facing
-                detected_player = self._check_player_detection(players, platforms, obstacles, delta_time)
+                detected_player = self._check_player_detection(
+                    players, platforms, obstacles, delta_time, perception
+                )
 
                 if detected_player:
                     # Refresh alert timer and update facing (but don't reset shoot timer)
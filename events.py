@@ -0,0 +1,89 @@
+# Gameplay event types and their payloads
+SHOT_FIRED = "shot_fired"  # (shooter, x, y)
+HIT = "hit"  # (projectile, target)
+DEATH = "death"  # (victim, kind, cause) - kind is "player", "enemy" or
+# "machinegunner"; cause is "shot" or "fell"
+ALERT = "alert"  # (enemy, player)
+EXIT_REACHED = "exit_reached"  # (player,)
+
+EVENT_TYPES = (SHOT_FIRED, HIT, DEATH, ALERT, EXIT_REACHED)
+
+# Rounds of re-draining when consumers publish follow-up events
+MAX_DRAIN_ROUNDS = 4
+
+
+class EventBus:
+    """
+    Per-tick gameplay event queue.
+
+    Systems publish events as they happen and the bus hands each consumer the
+    whole batch for an event type when it is drained once per tick. Queues are
+    double-buffered lists that are reused every tick, and events with no
+    enabled consumer are dropped at publish time, so disabled consumers (e.g.
+    the HUD in headless runs) cost nothing.
+    """
+
+    def __init__(self):
+        self._queues = {event_type: [] for event_type in EVENT_TYPES}
+        self._spares = {event_type: [] for event_type in EVENT_TYPES}
+        self._subscribers = {event_type: [] for event_type in EVENT_TYPES}
+        self._enabled = {}
+        self._active = {event_type: False for event_type in EVENT_TYPES}
+
+    def subscribe(self, event_type, name, handler):
+        """
+        Register handler(events) under a consumer name.
+
+        The handler receives a list of payload tuples, one per event published
+        since the last drain. The list is reused, so don't keep a reference.
+        """
+        self._subscribers[event_type].append((name, handler))
+        self._enabled.setdefault(name, True)
+        self._refresh_active()
+
+    def set_enabled(self, name, enabled):
+        """Turn a consumer on or off without unsubscribing it."""
+        self._enabled[name] = enabled
+        self._refresh_active()
+
+    def is_enabled(self, name):
+        return self._enabled.get(name, False)
+
+    def _refresh_active(self):
+        for event_type, subscribers in self._subscribers.items():
+            self._active[event_type] = any(
+                self._enabled[name] for name, _ in subscribers
+            )
+
+    def publish(self, event_type, *payload):
+        """Queue an event for the next drain."""
+        if self._active[event_type]:
+            self._queues[event_type].append(payload)
+
+    def pending(self, event_type):
+        """Number of queued events of a type."""
+        return len(self._queues[event_type])
+
+    def drain(self, event_types=EVENT_TYPES):
+        """
+        Dispatch queued event batches to their enabled consumers. Only the
+        given event types are dispatched; the rest stay queued.
+        """
+        for _ in range(MAX_DRAIN_ROUNDS):
+            dispatched = False
+            for event_type in event_types:
+                batch = self._queues[event_type]
+                if not batch:
+                    continue
+                dispatched = True
+
+                # Swap buffers so handlers can publish follow-up events
+                self._queues[event_type] = self._spares[event_type]
+                for name, handler in self._subscribers[event_type]:
+                    if self._enabled[name]:
+                        handler(batch)
+                batch.clear()
+                self._spares[event_type] = batch
+
+            if not dispatched:
+                return
@@ -11,79 +11,257 @@ from config import (
     GREEN,
 )
 import sys
+import bisect
 from player import Player
+from controls import NO_KEYS
 from exit import Exit
 from map_loader import MapLoader
 from maps import ALL_MAPS
+from perception import Perception
+from spatial_index import VerticalBandIndex, SortedYIndex
+from events import EventBus, SHOT_FIRED, HIT, DEATH, ALERT, EXIT_REACHED
+from stats import GameStats
+from hud import Hud
+from components import ComponentStore
+from physics import PhysicsSystem, SolidGroup
+from blit_batch import BlitBatch
+from bake import load_bundle
+import snapshot
+
+
+def _no_progress(fraction, phase):
+    pass
 
 
 class Game:
-    def __init__(self, num_players=1, map_name="test"):
-        self.screen = pygame.display.set_mode(
-            (SCREEN_WIDTH, SCREEN_HEIGHT), pygame.DOUBLEBUF
-        )
-        pygame.display.set_caption("Tower Climber")
+    def __init__(
+        self,
+        num_players=1,
+        map_name="test",
+        render_mode="full",
+        headless=False,
+        progress=None,
+        map_data=None,
+    ):
+        # map_data, if given, is the map's rows (as in maps.py) and is played
+        # under map_name instead of the built-in map of that name.
+        # progress, if given, is called with (fraction done, phase name) as
+        # the level is prepared, for loading screens (see loading.py)
+        if progress is None:
+            progress = _no_progress
+
+        # A headless game never opens a window: it draws (if asked) into an
+        # off-screen surface and its players only move on explicit inputs
+        self.headless = headless
+        if headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            # Only the display is needed up front; the HUD starts the font
+            # module when it first draws. Both are no-ops if already started
+            pygame.display.init()
+            self.screen = pygame.display.set_mode(
+                (SCREEN_WIDTH, SCREEN_HEIGHT), pygame.DOUBLEBUF
+            )
+            pygame.display.set_caption("Tower Climber")
+
+        # Use pre-rendered images from the baked asset bundle when it's current
+        progress(0.0, "assets")
+        load_bundle()
         self.clock = pygame.time.Clock()
         self.running = True
         self.num_players = min(num_players, 2)
         self.map_name = map_name
+        if map_data is None:
+            map_data = ALL_MAPS.get(map_name, ALL_MAPS["test"])
+        self.map_data = map_data
+
+        # "full" redraws and flips every frame; "dirty" pushes only changed areas
+        self.render_mode = render_mode
+        self._background = None
+        self._background_key = None
+        self._full_frame = True  # Next dirty-mode frame is drawn and flipped whole
+        self._dirty_rects = []
+        self._hud_drawn = {}
+
+        # One reusable blit sequence per render layer
+        self._layers = {
+            name: BlitBatch()
+            for name in (
+                "ladders",
+                "platforms",
+                "obstacles",
+                "projectiles",
+                "players",
+                "enemies",
+                "machinegunners",
+                "exit",
+            )
+        }
 
         # Sprite groups
         self.all_sprites = pygame.sprite.Group()
-        self.platforms = pygame.sprite.Group()
+        self.platforms = SolidGroup()
         self.players = pygame.sprite.Group()
         self.enemies = pygame.sprite.Group()
         self.machinegunners = pygame.sprite.Group()
         self.projectiles = pygame.sprite.Group()
-        self.obstacles = pygame.sprite.Group()
+        self.obstacles = SolidGroup()
         self.ladders = pygame.sprite.Group()
         self.exit_sprite = None
 
+        # Static sprites sorted by y so drawing can bisect to the viewport.
+        # Rebuilt whenever a group's size changes
+        self._static_index = {
+            name: SortedYIndex() for name in ("ladders", "platforms", "obstacles", "exit")
+        }
+
+        # Component storage for every actor in this game
+        self.components = ComponentStore()
+
+        # Batched gravity and landing for enemies and machinegunners
+        self.physics = PhysicsSystem()
+
         # Camera settings
         self.camera_y = 0  # Camera vertical offset
 
+        # Shared line-of-sight queries, refreshed every tick
+        self.perception = Perception()
+
+        # Enemies bucketed by vertical band for shot alerts, rebuilt once per tick
+        self.enemy_index = VerticalBandIndex(band_height=64)
+
+        # Gameplay events, drained once per tick. Consumers ("alerts", "stats",
+        # "hud") can be switched off independently with events.set_enabled()
+        self.hud = Hud()
+        self.recorder = None  # replay.ReplayRecorder while recording
+        self._setup_events()
+
         # Map loader
         self.map_loader = MapLoader(tile_size=64)
 
         # Store spawn points from map
         self.spawn_points = []
 
-        self.setup_level()
+        self.setup_level(progress)
+        progress(0.7, "players")
         self.setup_players()
         self.initialize_camera()
 
         self.game_over = False
         self.victory = False
 
-    def setup_level(self):
-        # Load map data
-        map_data = ALL_MAPS.get(self.map_name, ALL_MAPS["test"])
+        # Every actor the level started with, by group in load order.
+        # Snapshots refer to actors by their place in the roster
+        self.roster = {
+            "players": list(self.players),
+            "enemies": list(self.enemies),
+            "machinegunners": list(self.machinegunners),
+        }
+
+        # Sort the static layers now rather than on the first frame
+        progress(0.8, "static layers")
+        for name in ("ladders", "platforms", "obstacles"):
+            self._static_sprites(name, getattr(self, name))
+        self._static_sprites("exit", (self.exit_sprite,) if self.exit_sprite else ())
+        if render_mode == "dirty":
+            # The first frame's background, so it isn't drawn on the main loop
+            progress(0.9, "background")
+            self._render_background(self._frame_key())
+
+        # Dynamic state at level start, restored by reset()
+        self._level_start = self.snapshot()
+        progress(1.0, "ready")
+
+    def attach_display(self, screen):
+        """
+        Show a game built headless (on a loading thread, say) on the display
+        surface and hand its players to the keyboard.
+        """
+        self.headless = False
+        self.screen = screen
+        if self._background is not None:
+            if self._background.get_size() == screen.get_size():
+                # Match the display's pixel format for fast blits
+                self._background = self._background.convert(screen)
+            else:
+                self._background = None
+                self._background_key = None
+        self._full_frame = True
+        self._dirty_rects = []
+        self._hud_drawn = {}
+
+    def _setup_events(self):
+        """Fresh event bus and stats, with every consumer subscribed."""
+        self.events = EventBus()
+        self.events.subscribe(SHOT_FIRED, "alerts", self._on_shots_fired)
+        self.stats = GameStats()
+        self.stats.subscribe(self.events)
+        self.hud.subscribe(self.events)
+        self.hud.counts_dirty = True
+        if self.recorder is not None:
+            self.recorder.subscribe(self.events)
+
+    def snapshot(self):
+        """Dynamic game state as compact, versioned bytes (see snapshot.py)."""
+        return snapshot.capture(self)
+
+    def restore(self, data):
+        """
+        Return to the state in a snapshot() of this level. The display,
+        loaded images and level geometry are kept as they are.
+        """
+        snapshot.restore(self, data)
+        self.enemy_index.invalidate()
+        self.hud.counts_dirty = True
+
+        # Next dirty-mode frame is drawn in full
+        self._full_frame = True
+        self._dirty_rects = []
+        self._hud_drawn = {}
 
-        # Parse the map
-        map_objects = self.map_loader.load_map(map_data)
-        sprites = self.map_loader.create_sprites(map_objects)
+    def reset(self):
+        """Restart the level from the snapshot taken when it was loaded."""
+        self._setup_events()
+        self.restore(self._level_start)
+
+    def setup_level(self, progress=_no_progress):
+        # Load map data
+        progress(0.2, "level")
+
+        # Parse the map (shared with other games of the same map)
+        map_objects, self.tile_grid = self.map_loader.compile(self.map_data)
+        sprites = self.map_loader.create_sprites(
+            map_objects,
+            self.components,
+            lambda created, total: progress(0.25 + 0.3 * created / total, "sprites"),
+        )
 
         # Add platforms
+        progress(0.55, "platforms")
         for platform in sprites["platforms"]:
             self.platforms.add(platform)
             self.all_sprites.add(platform)
 
         # Add enemies
+        progress(0.6, "enemies")
         for enemy in sprites["enemies"]:
             self.enemies.add(enemy)
             self.all_sprites.add(enemy)
 
         # Add machinegunners
+        progress(0.62, "machinegunners")
         for machinegunner in sprites["machinegunners"]:
             self.machinegunners.add(machinegunner)
             self.all_sprites.add(machinegunner)
 
         # Add obstacles
+        progress(0.64, "obstacles")
         for obstacle in sprites["obstacles"]:
             self.obstacles.add(obstacle)
             self.all_sprites.add(obstacle)
 
         # Add ladders
+        progress(0.67, "ladders")
         for ladder in sprites["ladders"]:
             self.ladders.add(ladder)
             self.all_sprites.add(ladder)
@@ -109,9 +287,12 @@ class Game:
             "left": pygame.K_a,
             "right": pygame.K_d,
             "jump": pygame.K_w,
+            "down": pygame.K_s,
             "shoot": pygame.K_SPACE,
         }
-        player1 = Player(spawn_x, spawn_y, BLUE, player1_controls)
+        player1 = Player(
+            spawn_x, spawn_y, BLUE, player1_controls, self.components
+        )
         self.players.add(player1)
         self.all_sprites.add(player1)
 
@@ -127,9 +308,12 @@ class Game:
                 "left": pygame.K_LEFT,
                 "right": pygame.K_RIGHT,
                 "jump": pygame.K_UP,
+                "down": pygame.K_DOWN,
                 "shoot": pygame.K_RSHIFT,
             }
-            player2 = Player(spawn2_x, spawn2_y, CYAN, player2_controls)
+            player2 = Player(
+                spawn2_x, spawn2_y, CYAN, player2_controls, self.components
+            )
             self.players.add(player2)
             self.all_sprites.add(player2)
 
@@ -167,34 +351,71 @@ class Game:
         """
         Alert nearby enemies when a player fires a shot.
 
+        Only enemies in the vertical bands covered by the screen are visited,
+        and the alive players are sorted once per shot so each enemy finds its
+        closest player with a bisect.
+
         Args:
             shooter_x: X position of the shooter
             shooter_y: Y position of the shooter
         """
-        # Check each enemy
-        for enemy in self.enemies:
-            # Check if enemy is on same screen (vertically)
-            enemy_screen_y = enemy.rect.centery - self.camera_y
-            shooter_screen_y = shooter_y - self.camera_y
-
-            # Both must be within visible screen bounds
-            if (0 <= enemy_screen_y <= SCREEN_HEIGHT and
-                0 <= shooter_screen_y <= SCREEN_HEIGHT):
-
-                # Enemy is on same screen, trigger alert
-                # Find closest player to determine facing direction
-                closest_player = None
-                min_distance = float('inf')
+        # Shooter must be within visible screen bounds
+        shooter_screen_y = shooter_y - self.camera_y
+        if not 0 <= shooter_screen_y <= SCREEN_HEIGHT:
+            return
 
-                for player in self.players:
-                    if player.alive:
-                        distance = abs(player.rect.centerx - enemy.rect.centerx)
-                        if distance < min_distance:
-                            min_distance = distance
-                            closest_player = player
+        # Closest-player lookup, built once per shot
+        alive_players = sorted(
+            (player for player in self.players if player.alive),
+            key=lambda player: player.rect.centerx,
+        )
+        if not alive_players:
+            return
+        player_xs = [player.rect.centerx for player in alive_players]
+        last = len(alive_players) - 1
+
+        if self.enemy_index.stale:
+            self.enemy_index.rebuild(self.enemies)
+
+        # Enemies on the same screen (vertically) get alerted
+        for enemy in self.enemy_index.query(
+            self.camera_y, self.camera_y + SCREEN_HEIGHT
+        ):
+            enemy_x = enemy.rect.centerx
+            i = bisect.bisect_left(player_xs, enemy_x)
+            if i > last:
+                i = last
+            elif i > 0 and enemy_x - player_xs[i - 1] <= player_xs[i] - enemy_x:
+                i -= 1
+
+            # Face the closest player
+            enemy._enter_alert_state(alive_players[i])
+            self.events.publish(ALERT, enemy, alive_players[i])
+
+    def _on_shots_fired(self, events):
+        """Alert propagation consumer: alert enemies for each shot this tick."""
+        for shooter, shooter_x, shooter_y in events:
+            self._alert_enemies_to_shot(shooter_x, shooter_y)
+
+    def player_shoot(self, player):
+        """Fire a player's gun and publish the shot."""
+        if not player.alive:
+            return
+        player.shoot(self.projectiles)
+        self.events.publish(
+            SHOT_FIRED, player, player.rect.centerx, player.rect.centery
+        )
 
-                if closest_player:
-                    enemy._enter_alert_state(closest_player)
+    def _player_keys(self, player, inputs):
+        """Key state for a player this tick; None means read the keyboard."""
+        if inputs is None:
+            return NO_KEYS if self.headless else None
+        players = self.roster["players"]
+        if player in players:
+            index = players.index(player)
+            if index < len(inputs):
+                return inputs[index]
+        return NO_KEYS
 
     def handle_events(self):
         for event in pygame.event.get():
@@ -204,7 +425,7 @@ class Game:
             if event.type == pygame.KEYDOWN:
                 if self.game_over or self.victory:
                     if event.key == pygame.K_r:
-                        self.__init__(self.num_players, self.map_name)  # Restart
+                        self.reset()  # Restart
                     elif event.key == pygame.K_q:
                         self.running = False
                 else:
@@ -212,37 +433,80 @@ class Game:
                     if event.key == pygame.K_SPACE:
                         player_list = list(self.players)
                         if len(player_list) > 0:
-                            player = player_list[0]
-                            player.shoot(self.projectiles)
-                            # Alert enemies on same screen
-                            self._alert_enemies_to_shot(player.rect.centerx, player.rect.centery)
+                            # Enemies on the same screen are alerted when the
+                            # shot event is drained, before they next move
+                            self.player_shoot(player_list[0])
 
                     # Player 2 shoot
                     if event.key == pygame.K_RSHIFT:
                         player_list = list(self.players)
                         if len(player_list) > 1:
-                            player = player_list[1]
-                            player.shoot(self.projectiles)
-                            # Alert enemies on same screen
-                            self._alert_enemies_to_shot(player.rect.centerx, player.rect.centery)
+                            self.player_shoot(player_list[1])
 
-    def update(self, delta_time):
+    def update(self, delta_time, inputs=None):
+        """
+        Advance the game by delta_time seconds.
+
+        inputs optionally gives each player's key state (anything indexable
+        by key code, such as a controls.KeyState), in roster order. Without
+        it players read the keyboard, or press nothing when headless.
+        """
         if self.game_over or self.victory:
             return
 
+        # Shots fired since the last tick alert enemies before any of them
+        # move, as if the alert had happened when the shot was fired
+        self.events.drain((SHOT_FIRED,))
+
         # Update camera position
         self.update_camera()
 
         # Update all sprites with delta_time
         for player in self.players:
-            player.update(self.platforms, self.obstacles, self.ladders, delta_time)
+            player.update(
+                self.platforms,
+                self.obstacles,
+                self.ladders,
+                delta_time,
+                self._player_keys(player, inputs),
+            )
+
+        # One perception pass per tick shared by every enemy's line-of-sight checks
+        self.perception.begin_tick(self.platforms, self.obstacles)
+
+        for enemy in self.enemies:
+            spotted = enemy.update(
+                self.platforms,
+                self.obstacles,
+                self.players,
+                self.camera_y,
+                delta_time,
+                self.perception,
+                integrate_vertical=False,
+            )
+            if spotted is not None:
+                self.events.publish(ALERT, enemy, spotted)
+
+        for machinegunner in self.machinegunners:
+            machinegunner.update(
+                self.platforms,
+                self.obstacles,
+                self.players,
+                self.camera_y,
+                delta_time,
+                integrate_vertical=False,
+            )
+
+        # Gravity and landing for every enemy and machinegunner in one batch
+        self.physics.sync_level(self.platforms, self.obstacles)
+        self.physics.step(
+            self.enemies.sprites() + self.machinegunners.sprites(), delta_time
+        )
 
         for enemy in self.enemies:
-            enemy.update(self.platforms, self.obstacles, self.players, self.camera_y, delta_time)
             enemy.try_shoot(self.projectiles, delta_time)
 
         for machinegunner in self.machinegunners:
-            machinegunner.update(self.platforms, self.obstacles, self.players, self.camera_y, delta_time)
             machinegunner.try_shoot(self.projectiles, delta_time)
 
         self.projectiles.update(delta_time)
@@ -264,6 +528,9 @@ class Game:
                 )
                 if hit_enemies:
                     projectile.kill()
+                    for enemy in hit_enemies:
+                        self.events.publish(HIT, projectile, enemy)
+                        self.events.publish(DEATH, enemy, "enemy", "shot")
                     continue
 
                 # Player projectiles also hit machinegunners
@@ -272,6 +539,11 @@ class Game:
                 )
                 if hit_machinegunners:
                     projectile.kill()
+                    for machinegunner in hit_machinegunners:
+                        self.events.publish(HIT, projectile, machinegunner)
+                        self.events.publish(
+                            DEATH, machinegunner, "machinegunner", "shot"
+                        )
 
             elif projectile.owner_type == "enemy":
                 # Enemy projectiles hit players
@@ -280,12 +552,15 @@ class Game:
                         player.alive = False
                         player.kill()
                         projectile.kill()
+                        self.events.publish(HIT, projectile, player)
+                        self.events.publish(DEATH, player, "player", "shot")
 
         # Check if player reached the exit
         if self.exit_sprite:
             for player in self.players:
                 if player.alive and player.rect.colliderect(self.exit_sprite.rect):
                     self.victory = True
+                    self.events.publish(EXIT_REACHED, player)
 
         # Check if player fell off the bottom (below camera view)
         alive_players = [p for p in self.players if p.alive]
@@ -293,91 +568,160 @@ class Game:
             if player.rect.y > self.camera_y + SCREEN_HEIGHT + 100:
                 player.alive = False
                 player.kill()
+                self.events.publish(DEATH, player, "player", "fell")
 
         # Remove enemies that fell too far off screen
         for enemy in list(self.enemies):
             if enemy.rect.y > self.camera_y + SCREEN_HEIGHT + 200:
                 enemy.kill()
+                self.events.publish(DEATH, enemy, "enemy", "fell")
 
         # Remove machinegunners that fell too far off screen
         for machinegunner in list(self.machinegunners):
             if machinegunner.rect.y > self.camera_y + SCREEN_HEIGHT + 200:
                 machinegunner.kill()
+                self.events.publish(DEATH, machinegunner, "machinegunner", "fell")
+
+        # Enemies moved or died this tick
+        self.enemy_index.invalidate()
 
         # Check lose condition
         alive_players = [p for p in self.players if p.alive]
         if len(alive_players) == 0:
             self.game_over = True
 
+        # Hand this tick's events to their consumers in one batch
+        self.events.drain()
+
+        if self.recorder is not None:
+            self.recorder.record_tick()
+
     def draw(self):
+        if self.render_mode == "dirty":
+            self._draw_dirty()
+            return
+
         self.screen.fill(BLACK)
+        self._draw_static_layers(self.screen)
+        for batch in self._dynamic_layers():
+            batch.draw(self.screen)
+        self._draw_exit(self.screen)
 
-        # Draw all sprites with camera offset
-        # Draw ladders first (in background)
-        for ladder in self.ladders:
-            offset_rect = ladder.rect.copy()
-            offset_rect.y -= self.camera_y
-            # Only draw if any part is on screen (check top and bottom)
-            if offset_rect.y < SCREEN_HEIGHT + 100 and offset_rect.y + ladder.rect.height > -100:
-                self.screen.blit(ladder.image, offset_rect)
-
-        for platform in self.platforms:
-            offset_rect = platform.rect.copy()
-            offset_rect.y -= self.camera_y
-            # Only draw if on screen
-            if -50 < offset_rect.y < SCREEN_HEIGHT + 50:
-                self.screen.blit(platform.image, offset_rect)
-
-        for obstacle in self.obstacles:
-            offset_rect = obstacle.rect.copy()
-            offset_rect.y -= self.camera_y
-            if -100 < offset_rect.y < SCREEN_HEIGHT + 100:
-                self.screen.blit(obstacle.image, offset_rect)
+        # Draw UI
+        for slot, surface, position in self._hud_lines():
+            self.screen.blit(surface, position)
+        self._draw_overlay()
 
-        for projectile in self.projectiles:
-            offset_rect = projectile.rect.copy()
-            offset_rect.y -= self.camera_y
-            if -50 < offset_rect.y < SCREEN_HEIGHT + 50:
-                self.screen.blit(projectile.image, offset_rect)
+        self._present()
 
-        for player in self.players:
-            offset_rect = player.rect.copy()
-            offset_rect.y -= self.camera_y
-            self.screen.blit(player.image, offset_rect)
+    def _present(self, rects=None):
+        """Push the frame (or just rects of it) to the display."""
+        if self.headless:
+            return
+        if rects is None:
+            pygame.display.flip()
+        else:
+            pygame.display.update(rects)
 
-        for enemy in self.enemies:
-            offset_rect = enemy.rect.copy()
-            offset_rect.y -= self.camera_y
-            if -100 < offset_rect.y < SCREEN_HEIGHT + 100:
-                self.screen.blit(enemy.image, offset_rect)
+    def _draw_static_layers(self, surface):
+        """Draw ladders, platforms and obstacles with camera offset."""
+        camera_y = self.camera_y
+        layers = self._layers
 
-        for machinegunner in self.machinegunners:
-            offset_rect = machinegunner.rect.copy()
-            offset_rect.y -= self.camera_y
-            if -100 < offset_rect.y < SCREEN_HEIGHT + 100:
-                self.screen.blit(machinegunner.image, offset_rect)
+        # Draw ladders first (in background)
+        batch = layers["ladders"]
+        batch.clear()
+        index = self._static_sprites("ladders", self.ladders)
+        # Tall ladders can start above the window and still reach into it
+        for ladder in index.window(
+            camera_y - 100 - index.max_height, camera_y + SCREEN_HEIGHT + 100
+        ):
+            rect = ladder.rect
+            offset_y = rect.y - camera_y
+            # Only draw if any part is on screen (check top and bottom)
+            if offset_y + rect.height > -100:
+                batch.add(ladder.image, rect.x, offset_y)
+        batch.draw(surface)
+
+        # Only draw if on screen
+        self._fill_static_layer("platforms", self.platforms, 50).draw(surface)
+        self._fill_static_layer("obstacles", self.obstacles, 100).draw(surface)
+
+    def _static_sprites(self, name, sprites):
+        """Y-sorted index of a static group, rebuilt if the group changed."""
+        index = self._static_index[name]
+        if len(index) != len(sprites) or (
+            name == "exit" and index.sprites != list(sprites)
+        ):
+            index.rebuild(sprites)
+        return index
+
+    def _fill_static_layer(self, name, sprites, margin):
+        """Queue the static sprites whose top is within margin of the screen."""
+        camera_y = self.camera_y
+        batch = self._layers[name]
+        batch.clear()
+        index = self._static_sprites(name, sprites)
+        for sprite in index.window(
+            camera_y - margin, camera_y + SCREEN_HEIGHT + margin
+        ):
+            rect = sprite.rect
+            batch.add(sprite.image, rect.x, rect.y - camera_y)
+        return batch
+
+    def _fill_layer(self, batch, sprites, margin):
+        """Queue the sprites whose top is within margin of the screen."""
+        camera_y = self.camera_y
+        batch.clear()
+        for sprite in sprites:
+            rect = sprite.rect
+            offset_y = rect.y - camera_y
+            if -margin < offset_y < SCREEN_HEIGHT + margin:
+                batch.add(sprite.image, rect.x, offset_y)
+        return batch
+
+    def _dynamic_layers(self):
+        """Projectile and actor layers to draw this frame, in draw order."""
+        layers = self._layers
+
+        players = layers["players"]
+        players.clear()
+        for player in self.players:
+            players.add(player.image, player.rect.x, player.rect.y - self.camera_y)
 
-        # Draw exit
-        if self.exit_sprite:
-            offset_rect = self.exit_sprite.rect.copy()
-            offset_rect.y -= self.camera_y
-            if -100 < offset_rect.y < SCREEN_HEIGHT + 100:
-                self.screen.blit(self.exit_sprite.image, offset_rect)
+        return (
+            self._fill_layer(layers["projectiles"], self.projectiles, 50),
+            players,
+            self._fill_layer(layers["enemies"], self.enemies, 100),
+            self._fill_layer(layers["machinegunners"], self.machinegunners, 100),
+        )
 
-        # Draw UI
-        font = pygame.font.Font(None, 36)
+    def _draw_exit(self, surface):
+        exits = (self.exit_sprite,) if self.exit_sprite else ()
+        self._fill_static_layer("exit", exits, 100).draw(surface)
+
+    def height_climbed(self):
+        """How far the highest living player is above the first spawn point."""
+        if len(self.spawn_points) == 0:
+            return 0
+        spawn_y = self.spawn_points[0][1]
+        highest_player = min(
+            (player.rect.y for player in self.players if player.alive),
+            default=spawn_y,
+        )
+        return max(0, spawn_y - highest_player)
+
+    def _hud_lines(self):
+        """HUD text as (slot, surface, position) tuples."""
+        hud = self.hud
+        lines = []
 
         # Height climbed (distance from spawn point)
         if len(self.players) > 0 and len(self.spawn_points) > 0:
             spawn_y = self.spawn_points[0][1]
-            highest_player = (
-                min(player.rect.y for player in self.players if player.alive)
-                if any(p.alive for p in self.players)
-                else spawn_y
-            )
-            height_climbed = max(0, spawn_y - highest_player)
-            height_text = font.render(f"Height: {int(height_climbed)}", True, WHITE)
-            self.screen.blit(height_text, (10, 10))
+            height_climbed = self.height_climbed()
+            height_text = hud.render("height", f"Height: {int(height_climbed)}", WHITE)
+            lines.append(("height", height_text, (10, 10)))
 
             # Progress to exit
             if self.exit_sprite:
@@ -387,22 +731,31 @@ class Game:
                     if total_height > 0
                     else 0
                 )
-                progress_text = font.render(f"Progress: {progress}%", True, WHITE)
-                self.screen.blit(progress_text, (10, 50))
+                progress_text = hud.render("progress", f"Progress: {progress}%", WHITE)
+                lines.append(("progress", progress_text, (10, 50)))
+
+        # Enemy and player counts only change when something dies
+        if hud.counts_dirty or not self.events.is_enabled("hud"):
+            hud.enemy_count = len(self.enemies) + len(self.machinegunners)
+            hud.alive_players = sum(1 for p in self.players if p.alive)
+            hud.counts_dirty = False
 
         # Enemy count
-        total_enemies = len(self.enemies) + len(self.machinegunners)
-        enemy_text = font.render(f"Enemies: {total_enemies}", True, WHITE)
-        self.screen.blit(enemy_text, (10, 90))
+        enemy_text = hud.render("enemies", f"Enemies: {hud.enemy_count}", WHITE)
+        lines.append(("enemies", enemy_text, (10, 90)))
 
         # Player status
-        alive_players = sum(1 for p in self.players if p.alive)
-        player_text = font.render(
-            f"Players: {alive_players}/{self.num_players}", True, WHITE
+        player_text = hud.render(
+            "players", f"Players: {hud.alive_players}/{self.num_players}", WHITE
         )
-        self.screen.blit(player_text, (10, 130))
+        lines.append(("players", player_text, (10, 130)))
+
+        return lines
+
+    def _draw_overlay(self):
+        """Draw the game over / victory messages."""
+        font = self.hud.font
 
-        # Game over / victory messages
         if self.game_over:
             game_over_text = font.render("GAME OVER!", True, RED)
             restart_text = font.render("Press R to restart or Q to quit", True, WHITE)
@@ -427,16 +780,128 @@ class Game:
             self.screen.blit(victory_text, text_rect)
             self.screen.blit(restart_text, restart_rect)
 
-        pygame.display.flip()
+    def _frame_key(self):
+        """What the dirty-mode background depends on."""
+        return (
+            self.camera_y,
+            self.game_over,
+            self.victory,
+            len(self.ladders),
+            len(self.platforms),
+            len(self.obstacles),
+        )
+
+    def _render_background(self, frame_key):
+        """Draw the static layers for a view into the background surface."""
+        self._background_key = frame_key
+        if self._background is None:
+            self._background = pygame.Surface(self.screen.get_size())
+        self._background.fill(BLACK)
+        self._draw_static_layers(self._background)
 
-    def run(self):
-        while self.running:
+    def _draw_dirty(self):
+        """
+        Dirty-rectangle render path.
+
+        Static layers are cached in a background surface for the current
+        camera position. While the camera is still, only the areas covered by
+        actors and projectiles last frame and this frame, plus HUD lines that
+        changed, are redrawn and pushed with pygame.display.update(rects).
+        Camera moves, level changes and the game over / victory screens fall
+        back to a full redraw and flip.
+        """
+        screen = self.screen
+        frame_key = self._frame_key()
+
+        if frame_key != self._background_key or self._full_frame:
+            if frame_key != self._background_key:
+                self._render_background(frame_key)
+            self._full_frame = False
+
+            screen.blit(self._background, (0, 0))
+            self._dirty_rects = []
+            for batch in self._dynamic_layers():
+                self._dirty_rects.extend(batch.draw(screen, True))
+            self._draw_exit(screen)
+            self._hud_drawn = {}
+            for slot, surface, position in self._hud_lines():
+                self._hud_drawn[slot] = (surface, screen.blit(surface, position))
+            self._draw_overlay()
+            self._present()
+            return
+
+        if self.game_over or self.victory:
+            # Nothing moves under the end-of-game screen
+            return
+
+        background = self._background
+        erased = self._dirty_rects
+        dynamic = self._dynamic_layers()
+        moving = list(erased)
+        for batch in dynamic:
+            moving.extend(batch.dest_rects())
+
+        # HUD lines that changed or overlap moving sprites are redrawn whole,
+        # so antialiased text is never blended over itself
+        hud_lines = self._hud_lines()
+        hud_dirty = []
+        hud_drawn = {}
+        for slot, surface, position in hud_lines:
+            area = surface.get_rect(topleft=position)
+            previous = self._hud_drawn.get(slot)
+            if previous is None:
+                hud_dirty.append((surface, position, area))
+            else:
+                area.union_ip(previous[1])
+                if previous[0] is not surface or area.collidelist(moving) != -1:
+                    hud_dirty.append((surface, position, area))
+            hud_drawn[slot] = (surface, surface.get_rect(topleft=position))
+
+        # Restore the background where actors were last frame and under HUD
+        # lines being redrawn
+        updates = []
+        for rect in erased:
+            updates.append(screen.blit(background, rect, rect))
+        for surface, position, area in hud_dirty:
+            updates.append(screen.blit(background, area, area))
+
+        # Lines that disappeared (e.g. height once nobody is alive)
+        for slot, (surface, rect) in self._hud_drawn.items():
+            if slot not in hud_drawn:
+                updates.append(screen.blit(background, rect, rect))
+        self._hud_drawn = hud_drawn
+
+        drawn = []
+        for batch in dynamic:
+            drawn.extend(batch.draw(screen, True))
+        self._draw_exit(screen)
+        for surface, position, area in hud_dirty:
+            screen.blit(surface, position)
+
+        self._dirty_rects = drawn
+        self._present(updates + drawn)
+
+    def play(self, fps=FPS, max_ticks=None, on_tick=None):
+        """
+        Run the window loop until it's closed (or for max_ticks frames) and
+        return the frames run. An fps of 0 runs uncapped. on_tick, if given,
+        is called with the game after every frame.
+        """
+        ticks = 0
+        while self.running and (max_ticks is None or ticks < max_ticks):
             # Get delta_time in seconds
-            delta_time = self.clock.tick(FPS) / 1000.0
+            delta_time = self.clock.tick(fps) / 1000.0
 
             self.handle_events()
             self.update(delta_time)
             self.draw()
+            ticks += 1
+            if on_tick is not None:
+                on_tick(self)
+        return ticks
 
+    def run(self):
+        self.play()
         pygame.quit()
         sys.exit()
+
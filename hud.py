@@ -0,0 +1,44 @@
+import pygame
+from events import DEATH
+
+
+class Hud:
+    """
+    Heads-up display text with cached renders.
+
+    Each HUD line is re-rendered only when its text changes. Enemy and player
+    counts are recomputed only after the event bus reports deaths, instead of
+    walking the sprite groups every frame.
+    """
+
+    def __init__(self, font_size=36):
+        self.font_size = font_size
+        self._font = None
+        self._lines = {}  # slot -> (text, color, surface)
+        self.counts_dirty = True
+        self.enemy_count = 0
+        self.alive_players = 0
+
+    @property
+    def font(self):
+        # Created on first use so the font module is only started when drawing
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, self.font_size)
+        return self._font
+
+    def subscribe(self, bus, name="hud"):
+        bus.subscribe(DEATH, name, self.on_deaths)
+
+    def on_deaths(self, events):
+        self.counts_dirty = True
+
+    def render(self, slot, text, color):
+        """Return the surface for a HUD slot, rendering only if it changed."""
+        cached = self._lines.get(slot)
+        if cached is not None and cached[0] == text and cached[1] == color:
+            return cached[2]
+        surface = self.font.render(text, True, color)
+        self._lines[slot] = (text, color, surface)
+        return surface
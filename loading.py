@@ -0,0 +1,110 @@
+"""
+Load levels on a background thread behind a loading screen.
+
+LevelLoader builds a headless Game on a worker thread: map parsing, sprite
+construction, image loading and sorting the static layers. Meanwhile
+load_game() keeps the window responsive and draws the loader's progress;
+when the level is ready it is attached to the display and returned.
+"""
+import threading
+import pygame
+from config import SCREEN_WIDTH, SCREEN_HEIGHT, BLACK, WHITE, FPS
+
+BAR_WIDTH = 400
+BAR_HEIGHT = 24
+
+
+class LevelLoader:
+    """Builds a Game on a worker thread."""
+
+    def __init__(self, num_players=1, map_name="test", **options):
+        self.num_players = num_players
+        self.map_name = map_name
+        self.options = options
+        self.progress = (0.0, "starting")  # (fraction done, phase name)
+        self._game = None
+        self._error = None
+        self._thread = threading.Thread(target=self._load, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    @property
+    def done(self):
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    def result(self):
+        """The loaded game; waits for it, and re-raises anything loading raised."""
+        self._thread.join()
+        if self._error is not None:
+            raise self._error
+        return self._game
+
+    def _load(self):
+        # Imported here so the game's modules load on the worker too
+        from game import Game
+
+        try:
+            self._game = Game(
+                self.num_players,
+                self.map_name,
+                headless=True,
+                progress=self._report,
+                **self.options,
+            )
+        except Exception as error:
+            self._error = error
+
+    def _report(self, fraction, phase):
+        self.progress = (fraction, phase)
+
+
+class LoadingScreen:
+    """Progress bar and phase name, centred on the screen."""
+
+    def __init__(self, screen, title="Loading"):
+        self.screen = screen
+        self.title = title
+        self._font = None
+
+    @property
+    def font(self):
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, 36)
+        return self._font
+
+    def draw(self, fraction, phase):
+        screen = self.screen
+        screen.fill(BLACK)
+        left = (SCREEN_WIDTH - BAR_WIDTH) // 2
+        top = (SCREEN_HEIGHT - BAR_HEIGHT) // 2
+        pygame.draw.rect(screen, WHITE, (left, top, BAR_WIDTH, BAR_HEIGHT), 2)
+        pygame.draw.rect(
+            screen, WHITE, (left, top, int(BAR_WIDTH * fraction), BAR_HEIGHT)
+        )
+        text = self.font.render(f"{self.title}: {phase}", True, WHITE)
+        screen.blit(text, text.get_rect(midbottom=(SCREEN_WIDTH // 2, top - 10)))
+
+
+def load_game(num_players, map_name, screen, **options):
+    """
+    Load a level behind a loading screen and attach it to screen. Returns
+    None if the window is closed first.
+    """
+    loader = LevelLoader(num_players, map_name, **options).start()
+    loading_screen = LoadingScreen(screen)
+    clock = pygame.time.Clock()
+    while not loader.done:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                return None
+        loading_screen.draw(*loader.progress)
+        pygame.display.flip()
+        clock.tick(FPS)
+
+    game = loader.result()
+    game.attach_display(screen)
+    return game
@@ -1,20 +1,29 @@
-from pygame.sprite import Sprite
-import pygame
+import surfaces
 from config import BLUE, GRAVITY, ORANGE
 from projectile import Projectile
+from actor import Actor
+from components import KIND_MACHINEGUNNER, Component
 
 
-class Machinegunner(Sprite):
+class Machinegunner(Actor):
     """
     Stationary enemy that always faces the player and fires in bursts.
     Fires 6 shots 0.25 seconds apart, with a 3 second cooldown between bursts.
     """
 
-    def __init__(self, x, y):
-        super().__init__()
-        self.image = pygame.Surface((30, 30))
-        self.image.fill(BLUE)
+    KIND = KIND_MACHINEGUNNER
+
+    # AI state and weapon components
+    facing_direction = Component("facing_direction", int)
+    shoot_timer = Component("shoot_timer")
+    burst_shot_count = Component("burst_shot_count", int)
+    in_cooldown = Component("in_cooldown", bool)
+
+    def __init__(self, x, y, store=None):
+        super().__init__(store)
+        self.image = surfaces.solid((30, 30), BLUE)
         self.rect = self.image.get_rect()
+        self._init_collider()
         self.x = float(x)
         self.y = float(y)
         self.rect.x = int(self.x)
@@ -37,11 +46,20 @@ class Machinegunner(Sprite):
         self.shoot_timer = 0.0
         self.in_cooldown = False
 
-    def update(self, platforms, obstacles, players, camera_y, delta_time):
-        """Update machinegunner state - tracks player and handles gravity."""
+    def update(
+        self, platforms, obstacles, players, camera_y, delta_time, integrate_vertical=True
+    ):
+        """
+        Update machinegunner state - tracks player and handles gravity.
+        With integrate_vertical=False gravity is left to a batched physics system.
+        """
         # Always face towards the nearest player
         self._update_facing_direction(players)
 
+        # Sleeping machinegunners rest on static geometry until woken
+        if not integrate_vertical or self.sleeping:
+            return
+
         # Apply gravity
         self.vel_y += GRAVITY * delta_time
 
@@ -51,6 +69,7 @@ class Machinegunner(Sprite):
         self.on_ground = False
         self.check_platform_collision(platforms, "vertical")
         self.check_obstacle_collision(obstacles, "vertical")
+        self._settle()
 
     def _update_facing_direction(self, players):
         """Always face towards the nearest alive player."""
@@ -75,36 +94,6 @@ class Machinegunner(Sprite):
             else:
                 self.facing_direction = -1  # Face left
 
-    def check_platform_collision(self, platforms, direction):
-        """Handle collision with platforms."""
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = platform.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Moving up
-                        self.rect.top = platform.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-
-    def check_obstacle_collision(self, obstacles, direction):
-        """Handle collision with obstacles."""
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle.rect):
-                if direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = obstacle.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Moving up
-                        self.rect.top = obstacle.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-
     def try_shoot(self, projectiles_group, delta_time):
         """
         Fire in bursts: 6 shots 0.25 seconds apart, then 3 second cooldown.
@@ -3,6 +3,31 @@ from enemy import Enemy
 from machinegunner import Machinegunner
 from obstacles import Obstacle
 from ladder import Ladder
+import numpy as np
+
+# Static tile codes in tile_grid(); actor spawn markers count as empty
+TILE_EMPTY = 0
+TILE_PLATFORM = 1
+TILE_OBSTACLE = 2
+TILE_LADDER = 3
+TILE_EXIT = 4
+
+TILE_CODES = {'-': TILE_PLATFORM, 'O': TILE_OBSTACLE, 'H': TILE_LADDER, 'X': TILE_EXIT}
+
+# Sprites created between create_sprites() progress reports
+PROGRESS_INTERVAL = 16
+
+# Compiled levels shared by every game in the process, by (tile size, map
+# rows), least recently used first
+_compiled = {}
+
+# Compiled levels kept; games hold on to their own even once evicted
+MAX_COMPILED_LEVELS = 16
+
+
+def clear_compiled():
+    """Forget every compiled level."""
+    _compiled.clear()
 
 
 class MapLoader:
@@ -68,6 +93,42 @@ class MapLoader:
             'exit_pos': exit_pos
         }
 
+    def compile(self, map_data):
+        """
+        Parsed map objects and tile grid for a map, built once per process
+        and shared by every game that loads it. Both are read-only: object
+        lists are tuples and the grid isn't writeable.
+        """
+        key = (self.tile_size, tuple(map_data))
+        compiled = _compiled.pop(key, None)
+        if compiled is None:
+            map_objects = {
+                name: tuple(value) if isinstance(value, list) else value
+                for name, value in self.load_map(map_data).items()
+            }
+            grid = self.tile_grid(map_data)
+            grid.flags.writeable = False
+            compiled = (map_objects, grid)
+            if len(_compiled) >= MAX_COMPILED_LEVELS:
+                del _compiled[next(iter(_compiled))]
+        # Most recently used last
+        _compiled[key] = compiled
+        return compiled
+
+    def tile_grid(self, map_data):
+        """
+        Static tiles of a map as a (rows, columns) int8 array of TILE_* codes.
+        Short rows are padded with empty tiles.
+        """
+        width = max((len(row) for row in map_data), default=0)
+        grid = np.zeros((len(map_data), width), dtype=np.int8)
+        for row_idx, row in enumerate(map_data):
+            for col_idx, char in enumerate(row):
+                code = TILE_CODES.get(char)
+                if code is not None:
+                    grid[row_idx, col_idx] = code
+        return grid
+
     def _merge_platforms(self, platform_tiles):
         """Merge adjacent horizontal platform tiles into longer platforms."""
         if not platform_tiles:
@@ -124,12 +185,14 @@ class MapLoader:
 
         return merged
 
-    def create_sprites(self, map_objects):
+    def create_sprites(self, map_objects, store=None, progress=None):
         """
         Create pygame sprite objects from parsed map data.
 
         Args:
             map_objects: dict from load_map()
+            store: ComponentStore for the actors (defaults to the shared store)
+            progress: called with (sprites created, total) as sprites are made
 
         Returns:
             dict with sprite groups
@@ -140,20 +203,37 @@ class MapLoader:
         obstacle_sprites = []
         ladder_sprites = []
 
+        total = sum(
+            len(map_objects[name])
+            for name in ('platforms', 'enemies', 'machinegunners', 'obstacles', 'ladders')
+        )
+        created = 0
+
+        def made(sprites, sprite):
+            nonlocal created
+            sprites.append(sprite)
+            created += 1
+            if progress is not None and created % PROGRESS_INTERVAL == 0:
+                progress(created, total)
+
         for x, y, width, height in map_objects['platforms']:
-            platform_sprites.append(Platform(x, y, width, height))
+            made(platform_sprites, Platform(x, y, width, height))
 
         for x, y in map_objects['enemies']:
-            enemy_sprites.append(Enemy(x, y))
+            made(enemy_sprites, Enemy(x, y, store))
 
         for x, y in map_objects['machinegunners']:
-            machinegunner_sprites.append(Machinegunner(x, y))
+            made(machinegunner_sprites, Machinegunner(x, y, store))
 
         for x, y, width, height in map_objects['obstacles']:
-            obstacle_sprites.append(Obstacle(x, y, width, height))
+            made(obstacle_sprites, Obstacle(x, y, width, height))
 
         for x, y, width, height in map_objects['ladders']:
-            ladder_sprites.append(Ladder(x, y, width, height))
+            made(ladder_sprites, Ladder(x, y, width, height))
+
+        # A map of only markers has no sprites to report
+        if progress is not None and total:
+            progress(total, total)
 
         return {
             'platforms': platform_sprites,
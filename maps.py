@@ -3,6 +3,7 @@
 #   ' ' = Empty space
 #   '-' = Platform
 #   'E' = Enemy
+#   'M' = Machinegunner
 #   'O' = Obstacle
 #   'H' = Ladder (vertical)
 #   'P' = Player spawn point
@@ -10,6 +11,8 @@
 
 # Each map is 20 characters wide to fit 1280px screen (64px per tile)
 
+import os
+
 TOWER_LEVEL_1 = [
     "                    ",
     "         X          ",
@@ -134,3 +137,26 @@ ALL_MAPS = {
     "level_2": TOWER_LEVEL_2,
     "test": TOWER_TEST,
 }
+
+# Characters a map may use
+MAP_TILES = frozenset(" -EMOHPX")
+
+
+def load_map_file(path):
+    """
+    Read a map from a text file, one row per line using the legend above.
+    Returns (the file's name without its extension, the map's rows), to be
+    played as Game(map_name=name, map_data=rows); ALL_MAPS is left as is.
+    """
+    name = os.path.splitext(os.path.basename(path))[0]
+    with open(path) as map_file:
+        rows = [line.rstrip("\r\n") for line in map_file]
+    while rows and not rows[-1].strip():
+        rows.pop()
+    if not rows:
+        raise ValueError(f"{path}: map is empty")
+    for row_idx, row in enumerate(rows, 1):
+        unknown = set(row) - MAP_TILES
+        if unknown:
+            raise ValueError(f"{path}:{row_idx}: unknown map tiles {''.join(sorted(unknown))!r}")
+    return name, rows
@@ -0,0 +1,270 @@
+"""
+Host many headless matches in one process on a shared fixed tick.
+
+MatchScheduler steps every active match once per tick, in turn, and keeps
+tick-time metrics per match and for the whole server. Each match gets an
+equal share of the tick as its budget, and a match tick that takes longer
+counts as an overrun. A match that overruns OVERRUN_LIMIT ticks in a row
+is deferred: it runs after the others, and only if the tick has time
+left, otherwise it skips that tick (and gets a fresh start on the next),
+so one heavy match slows itself down rather than every match on the
+server. A whole server tick that ends past its deadline
+counts as late. capacity() estimates how many matches of the measured
+cost fit in a tick.
+
+Games of the same map share their compiled level (MapLoader.compile) and
+images (surfaces.cached), so an extra match costs only its sprites and
+actor state.
+
+    python matches.py --matches 40 --maps level_1 level_2 --ticks 600
+"""
+import argparse
+import itertools
+import json
+import random
+import time
+from config import FPS
+from controls import SHOOT_BIT, key_table
+
+# Share of each tick the matches may use; the rest is left for networking
+TARGET_LOAD = 0.8
+
+# A server this many ticks behind stops catching up and drops them
+MAX_CATCH_UP_TICKS = 5
+
+# Overruns in a row after which a match is deferred behind the others
+OVERRUN_LIMIT = 3
+
+
+class Match:
+    """One hosted game, its inputs and its tick-time metrics."""
+
+    def __init__(self, match_id, game, seed):
+        self.match_id = match_id
+        self.game = game
+        self.ticks = 0
+        self.outcome = None  # "victory" or "death" once finished
+        self._rng_state = random.Random(seed).getstate()
+        players = game.roster["players"]
+        self._keys = [key_table(player.controls) for player in players]
+        self._bits = [0] * len(players)
+        self._shots = [False] * len(players)
+
+        self.tick_time = 0.0
+        self.max_tick_time = 0.0
+        self.overruns = 0
+        self.overrun_streak = 0
+        self.skipped_ticks = 0  # Ticks deferred and then not run
+
+    def set_input(self, slot, bits):
+        """Controls a player holds (controls.input_bits()); shoot fires once."""
+        if bits & SHOOT_BIT:
+            self._shots[slot] = True
+        self._bits[slot] = bits
+
+    def step(self, delta_time):
+        game = self.game
+        inputs = []
+        for slot, player in enumerate(game.roster["players"]):
+            inputs.append(self._keys[slot][self._bits[slot]])
+            if self._shots[slot]:
+                self._shots[slot] = False
+                game.player_shoot(player)
+
+        outer_state = random.getstate()
+        random.setstate(self._rng_state)
+        try:
+            game.update(delta_time, inputs)
+        finally:
+            self._rng_state = random.getstate()
+            random.setstate(outer_state)
+        self.ticks += 1
+
+        if game.victory:
+            self.outcome = "victory"
+        elif game.game_over:
+            self.outcome = "death"
+
+    def metrics(self):
+        return {
+            "ticks": self.ticks,
+            "mean_tick_ms": 1000 * self.tick_time / max(self.ticks, 1),
+            "max_tick_ms": 1000 * self.max_tick_time,
+            "overruns": self.overruns,
+            "skipped_ticks": self.skipped_ticks,
+            "outcome": self.outcome,
+        }
+
+
+class MatchScheduler:
+    """Steps every hosted match on one fixed-rate clock."""
+
+    def __init__(self, tick_rate=FPS, target_load=TARGET_LOAD, before_tick=None):
+        self.tick_interval = 1.0 / tick_rate
+        self.target_load = target_load
+        # Called with the scheduler at the start of every tick, to feed in
+        # inputs that arrived since the last one
+        self.before_tick = before_tick
+        self.matches = {}
+        self.finished = {}  # match id -> Match, for matches that ended
+        self._ids = itertools.count()
+
+        self.ticks = 0
+        self.late_ticks = 0
+        self.dropped_ticks = 0
+        self.busy_time = 0.0
+        self.max_busy_time = 0.0
+
+    def add_match(self, map_name="test", num_players=1, seed=0):
+        """Start a match; returns its id."""
+        # Imported here so the module can be loaded without pygame initialised
+        from game import Game
+
+        outer_state = random.getstate()
+        random.seed(seed)
+        try:
+            game = Game(num_players, map_name, headless=True)
+        finally:
+            random.setstate(outer_state)
+        match_id = next(self._ids)
+        self.matches[match_id] = Match(match_id, game, seed)
+        return match_id
+
+    def remove_match(self, match_id):
+        return self.matches.pop(match_id)
+
+    def budget(self):
+        """Seconds each match may take per tick."""
+        return self.tick_interval * self.target_load / max(len(self.matches), 1)
+
+    def step(self):
+        """
+        Run one tick of every active match; finished matches are retired.
+        Deferred matches run last, and only while the tick has time left.
+        """
+        if self.before_tick is not None:
+            self.before_tick(self)
+        budget = self.budget()
+        started = time.perf_counter()
+        deferred = []
+        for match in list(self.matches.values()):
+            if match.overrun_streak >= OVERRUN_LIMIT:
+                deferred.append(match)
+            else:
+                self._step_match(match, budget)
+
+        available = self.tick_interval * self.target_load
+        for match in deferred:
+            if time.perf_counter() - started < available:
+                self._step_match(match, budget)
+            else:
+                match.skipped_ticks += 1
+                match.overrun_streak = 0
+
+        busy = time.perf_counter() - started
+        self.busy_time += busy
+        self.max_busy_time = max(self.max_busy_time, busy)
+        self.ticks += 1
+        return busy
+
+    def _step_match(self, match, budget):
+        before = time.perf_counter()
+        match.step(self.tick_interval)
+        elapsed = time.perf_counter() - before
+        match.tick_time += elapsed
+        match.max_tick_time = max(match.max_tick_time, elapsed)
+        if elapsed > budget:
+            match.overruns += 1
+            match.overrun_streak += 1
+        else:
+            match.overrun_streak = 0
+        if match.outcome is not None:
+            self.finished[match.match_id] = self.matches.pop(match.match_id)
+
+    def run(self, ticks=None):
+        """Tick on the wall clock until no matches are left (or for ticks ticks)."""
+        deadline = time.perf_counter()
+        stop = None if ticks is None else self.ticks + ticks
+        while self.matches and (stop is None or self.ticks < stop):
+            self.step()
+            deadline += self.tick_interval
+            now = time.perf_counter()
+            if now > deadline:
+                self.late_ticks += 1
+                behind = int((now - deadline) / self.tick_interval)
+                if behind > MAX_CATCH_UP_TICKS:
+                    # Give up on the missed ticks rather than rush through them
+                    self.dropped_ticks += behind
+                    deadline += behind * self.tick_interval
+            else:
+                time.sleep(deadline - now)
+
+    def capacity(self):
+        """Matches that would fit in a tick at the mean cost measured so far."""
+        all_matches = [*self.matches.values(), *self.finished.values()]
+        ticks = sum(match.ticks for match in all_matches)
+        if not ticks:
+            return None
+        mean = sum(match.tick_time for match in all_matches) / ticks
+        return int(self.tick_interval * self.target_load / mean)
+
+    def metrics(self):
+        ticks = max(self.ticks, 1)
+        all_matches = [*self.matches.values(), *self.finished.values()]
+        return {
+            "active_matches": len(self.matches),
+            "finished_matches": len(self.finished),
+            "ticks": self.ticks,
+            "late_ticks": self.late_ticks,
+            "dropped_ticks": self.dropped_ticks,
+            "load": self.busy_time / (ticks * self.tick_interval),
+            "mean_tick_ms": 1000 * self.busy_time / ticks,
+            "max_tick_ms": 1000 * self.max_busy_time,
+            "budget_ms": 1000 * self.budget(),
+            "match_overruns": sum(match.overruns for match in all_matches),
+            "skipped_match_ticks": sum(match.skipped_ticks for match in all_matches),
+            "capacity": self.capacity(),
+        }
+
+
+def main(argv=None):
+    from agents import AGENTS
+    from controls import MOVE_CONTROLS, input_bits
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--matches", type=int, default=20)
+    parser.add_argument("--maps", nargs="+", default=["test"])
+    parser.add_argument("--players", type=int, default=1)
+    parser.add_argument("--agent", choices=sorted(AGENTS), default="climber")
+    parser.add_argument("--ticks", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    # Agents stand in for clients, setting every match's inputs each tick
+    agents = {}
+    moves = MOVE_CONTROLS
+
+    def agent_inputs(scheduler):
+        for match_id, match in scheduler.matches.items():
+            players = match.game.roster["players"]
+            for slot, (keys, shoot) in enumerate(agents[match_id](match.game)):
+                controls = players[slot].controls
+                match.set_input(
+                    slot, input_bits([name for name in moves if keys[controls[name]]], shoot)
+                )
+
+    pygame.init()
+    scheduler = MatchScheduler(before_tick=agent_inputs)
+    for index, map_name in zip(range(args.matches), itertools.cycle(args.maps)):
+        seed = args.seed + index
+        match_id = scheduler.add_match(map_name, args.players, seed)
+        agents[match_id] = AGENTS[args.agent](seed)
+    scheduler.run(args.ticks)
+    print(json.dumps(scheduler.metrics(), indent=2))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,342 @@
+"""
+Networked play: a headless authoritative server and thin clients.
+
+The server runs the only simulating Game. Clients send the controls they
+hold, the server applies every player's latest input each tick and sends
+back what changed (see delta.py), which clients apply to their own local
+Game and draw. Everything runs on asyncio streams, so any
+number of servers and clients can share one process and one event loop.
+
+    python net.py serve --map level_1 --players 2 --port 5555
+    python net.py join --host 127.0.0.1 --port 5555
+
+Messages are framed as a type byte and a payload length (see _FRAME).
+"""
+import argparse
+import asyncio
+import random
+import struct
+from config import FPS
+from controls import SHOOT_BIT, input_bits, key_table
+from delta import DeltaEncoder, DeltaDecoder, DELTA_VERSION, encode_level, decode_level
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 5555
+
+# Message types
+MSG_HELLO = 1  # server -> client: player slot, player count, versions
+MSG_INPUT = 2  # client -> server: input sequence number, held controls
+MSG_DELTA = 3  # server -> client: changes since the last delta (delta.py)
+MSG_FULL = 4  # server -> client: every player slot is taken
+MSG_LEVEL = 5  # server -> client: level geometry, sent once after hello
+
+# Deltas queued for a client beyond this many bytes are skipped until it
+# catches up. The next delta sent covers the skipped ticks too
+SEND_BUFFER_LIMIT = 64 * 1024
+
+# Version of the messages and input bits, checked by clients on connect.
+# 2: hello carries both versions; inputs have a "down" bit
+PROTOCOL_VERSION = 2
+
+# type, payload length
+_FRAME = struct.Struct("<BI")
+# slot, player count, protocol version, delta frame version
+_HELLO = struct.Struct("<BBBB")
+# sequence number, control bits
+_INPUT = struct.Struct("<IB")
+
+
+def pack_message(kind, payload=b""):
+    """Frame a message for the wire."""
+    return _FRAME.pack(kind, len(payload)) + payload
+
+
+async def read_message(reader):
+    """Read one framed message; returns (type, payload)."""
+    kind, length = _FRAME.unpack(await reader.readexactly(_FRAME.size))
+    return kind, await reader.readexactly(length)
+
+
+class GameServer:
+    """
+    Hosts one match: accepts a client per player and runs the game on a
+    fixed tick once every slot is filled.
+
+    The game's random state is swapped in only while it updates, so several
+    servers can run side by side in one process.
+    """
+
+    def __init__(self, map_name="test", num_players=2, seed=0, tick_rate=FPS, map_data=None):
+        # Imported here so the module can be loaded without pygame initialised
+        from game import Game
+
+        self.map_name = map_name
+        self.num_players = num_players
+        self.delta_time = 1.0 / tick_rate
+
+        outer_state = random.getstate()
+        random.seed(seed)
+        self.game = Game(num_players, map_name, headless=True, map_data=map_data)
+        self._rng_state = random.getstate()
+        random.setstate(outer_state)
+
+        players = self.game.roster["players"]
+        self.tick = 0
+        self._writers = [None] * len(players)
+        self._encoders = [None] * len(players)
+        self._bits = [0] * len(players)
+        self._pending_shots = [False] * len(players)
+        self._keys = [key_table(player.controls) for player in players]
+        self._ready = asyncio.Event()
+        self._handlers = set()
+        self._server = None
+        self.port = None
+
+    async def start(self, host=DEFAULT_HOST, port=0):
+        """Start listening; port 0 picks a free port (see self.port)."""
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def wait_for_players(self):
+        await self._ready.wait()
+
+    async def run(self, ticks=None):
+        """Wait for every player, then tick until closed (or for ticks ticks)."""
+        await self.wait_for_players()
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        stop = None if ticks is None else self.tick + ticks
+        while self._server is not None and (stop is None or self.tick < stop):
+            self.step()
+            next_tick += self.delta_time
+            await asyncio.sleep(max(0.0, next_tick - loop.time()))
+
+    def step(self):
+        """Apply the latest inputs, advance the game one tick and send the state."""
+        game = self.game
+        players = game.roster["players"]
+        inputs = []
+        for slot, player in enumerate(players):
+            inputs.append(self._keys[slot][self._bits[slot]])
+            if self._pending_shots[slot]:
+                self._pending_shots[slot] = False
+                game.player_shoot(player)
+
+        outer_state = random.getstate()
+        random.setstate(self._rng_state)
+        try:
+            game.update(self.delta_time, inputs)
+        finally:
+            self._rng_state = random.getstate()
+            random.setstate(outer_state)
+        self.tick += 1
+        self._broadcast()
+
+    def _broadcast(self):
+        for writer, encoder in zip(self._writers, self._encoders):
+            if writer is None or writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > SEND_BUFFER_LIMIT:
+                continue
+            writer.write(pack_message(MSG_DELTA, encoder.encode(self.game, self.tick)))
+
+    async def close(self):
+        """Stop listening and disconnect every client."""
+        server = self._server
+        self._server = None
+        if server is not None:
+            server.close()
+        # Closing a connection ends its handler's read loop
+        for writer in self._writers:
+            if writer is not None:
+                writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if server is not None:
+            await server.wait_closed()
+
+    async def _handle_client(self, reader, writer):
+        if None not in self._writers:
+            writer.write(pack_message(MSG_FULL))
+            writer.close()
+            return
+
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        slot = self._writers.index(None)
+        self._writers[slot] = writer
+        self._encoders[slot] = DeltaEncoder()
+        writer.write(pack_message(MSG_HELLO, _HELLO.pack(slot, self.num_players, PROTOCOL_VERSION, DELTA_VERSION)))
+        writer.write(pack_message(MSG_LEVEL, encode_level(self.game)))
+        if None not in self._writers:
+            self._ready.set()
+
+        try:
+            while True:
+                kind, payload = await read_message(reader)
+                if kind == MSG_INPUT:
+                    self._receive_input(slot, payload)
+        except (asyncio.IncompleteReadError, ConnectionError, struct.error):
+            # Disconnected, or sent a malformed message: drop the client
+            pass
+        finally:
+            # The player stays in the game holding nothing
+            self._writers[slot] = None
+            self._bits[slot] = 0
+            self._handlers.discard(handler)
+            writer.close()
+
+    def _receive_input(self, slot, payload):
+        _, bits = _INPUT.unpack(payload)
+        # Shots fire on the press, like the keyboard's KEYDOWN
+        if bits & SHOOT_BIT and not self._bits[slot] & SHOOT_BIT:
+            self._pending_shots[slot] = True
+        self._bits[slot] = bits
+
+
+class GameClient:
+    """
+    Connects to a GameServer, sends this player's input and mirrors the
+    server's game into a local Game for drawing.
+    """
+
+    def __init__(self, headless=False):
+        self.headless = headless
+        self.game = None
+        self.slot = None
+        self.tick = 0
+        self._reader = None
+        self._writer = None
+        self._decoder = DeltaDecoder()
+        self._sequence = 0
+
+    async def connect(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        """
+        Join a server and build its level from the map it sends, so the
+        client needs no copy of the map. Raises ConnectionError if the match
+        is full or the server speaks a different protocol, delta version or
+        tile size.
+        """
+        # Imported here so the module can be loaded without pygame initialised
+        from game import Game
+
+        self._reader, self._writer = await asyncio.open_connection(host, port)
+        kind, payload = await read_message(self._reader)
+        if kind != MSG_HELLO:
+            self._writer.close()
+            raise ConnectionError("server is full")
+        self.slot, num_players, protocol, version = _HELLO.unpack(payload)
+        if protocol != PROTOCOL_VERSION:
+            self._writer.close()
+            raise ConnectionError(f"server speaks protocol {protocol} (expected {PROTOCOL_VERSION})")
+        if version != DELTA_VERSION:
+            self._writer.close()
+            raise ConnectionError(f"server sends delta version {version} (expected {DELTA_VERSION})")
+        _, payload = await read_message(self._reader)
+        map_name, tile_size, rows = decode_level(payload)
+        self.game = Game(num_players, map_name, headless=self.headless, map_data=rows)
+        if self.game.map_loader.tile_size != tile_size:
+            self._writer.close()
+            raise ConnectionError(f"server uses {tile_size}px tiles (expected {self.game.map_loader.tile_size})")
+
+    def send_input(self, held=(), shoot=False):
+        """Send the controls this player holds (names from controls.INPUT_CONTROLS)."""
+        self._sequence += 1
+        self._writer.write(
+            pack_message(MSG_INPUT, _INPUT.pack(self._sequence, input_bits(held, shoot)))
+        )
+
+    async def receive_state(self):
+        """Wait for the next state from the server and apply it; returns its tick."""
+        while True:
+            kind, payload = await read_message(self._reader)
+            if kind == MSG_DELTA:
+                self.tick = self._decoder.apply(self.game, payload)
+                return self.tick
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def run(self):
+        """Play from the keyboard until the window is closed or the server goes."""
+        import pygame
+
+        game = self.game
+        # Either player's keys on this keyboard control this client's player
+        keymap = {
+            "left": (pygame.K_a, pygame.K_LEFT),
+            "right": (pygame.K_d, pygame.K_RIGHT),
+            "jump": (pygame.K_w, pygame.K_UP),
+            "down": (pygame.K_s, pygame.K_DOWN),
+            "shoot": (pygame.K_SPACE, pygame.K_RSHIFT),
+        }
+        receiver = asyncio.create_task(self._receive_forever())
+        try:
+            while game.running and not receiver.done():
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        game.running = False
+                pressed = pygame.key.get_pressed()
+                held = [
+                    name
+                    for name, keys in keymap.items()
+                    if name != "shoot" and any(pressed[key] for key in keys)
+                ]
+                shoot = any(pressed[key] for key in keymap["shoot"])
+                self.send_input(held, shoot)
+                game.draw()
+                await asyncio.sleep(1.0 / FPS)
+        finally:
+            receiver.cancel()
+            await self.close()
+
+    async def _receive_forever(self):
+        try:
+            while True:
+                await self.receive_state()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+
+
+async def _serve(args):
+    server = GameServer(args.map, args.players, args.seed)
+    await server.start(args.host, args.port)
+    print(f"Serving {args.map} for {args.players} players on {args.host}:{server.port}")
+    try:
+        await server.run()
+    finally:
+        await server.close()
+
+
+async def _join(args):
+    client = GameClient()
+    await client.connect(args.host, args.port)
+    await client.run()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="host a match")
+    serve.add_argument("--map", default="test")
+    serve.add_argument("--players", type=int, default=2)
+    serve.add_argument("--seed", type=int, default=0)
+    join = commands.add_parser("join", help="join a match")
+    for command in (serve, join):
+        command.add_argument("--host", default=DEFAULT_HOST)
+        command.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    pygame.init()
+    asyncio.run(_serve(args) if args.command == "serve" else _join(args))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Fixed-size numeric observations of a game, one float32 vector per player.
+
+Each vector holds, in order (see ObservationEncoder.layout):
+
+- player: x, y, vel_x, vel_y, alive, on_ground, climbing
+- tiles: the static tile codes (map_loader.TILE_*) in a square window
+  centred on the player, row by row; cells outside the map are -1
+- enemies: the nearest enemies and machinegunners as dx, dy, kind
+  (components.KIND_ENEMY or KIND_MACHINEGUNNER), alert, present
+- projectiles: the nearest projectiles as dx, dy, direction, fired by a
+  player, present
+- exit: dx, dy, present
+
+Offsets are measured from the player's centre to the entity's centre.
+Unused entity slots are zero. encode() writes into an array the caller
+owns and computes offsets and distances in scratch arrays it keeps, so
+encoding every tick for many games allocates little beyond index arrays.
+"""
+import numpy as np
+from enemy import Enemy
+
+# Tile code for cells outside the map
+TILE_OUTSIDE = -1
+
+PLAYER_FEATURES = 7
+ENEMY_FEATURES = 5
+PROJECTILE_FEATURES = 5
+EXIT_FEATURES = 3
+
+# Stored code of an alert enemy
+_ALERT = Enemy.alert_state.values.index("ALERT")
+
+
+class ObservationEncoder:
+    """Encodes one map's games into preallocated observation arrays."""
+
+    def __init__(self, tile_grid, tile_size, tile_radius=3, max_enemies=4, max_projectiles=4):
+        self.tile_size = tile_size
+        self.tile_radius = tile_radius
+        self.window = 2 * tile_radius + 1
+        self.max_enemies = max_enemies
+        self.max_projectiles = max_projectiles
+
+        # Padding by the radius puts a window's top-left corner on the
+        # player's own cell in padded coordinates
+        self._padded = np.pad(
+            np.asarray(tile_grid, dtype=np.float32),
+            tile_radius,
+            constant_values=TILE_OUTSIDE,
+        )
+
+        sizes = (
+            ("player", PLAYER_FEATURES),
+            ("tiles", self.window * self.window),
+            ("enemies", max_enemies * ENEMY_FEATURES),
+            ("projectiles", max_projectiles * PROJECTILE_FEATURES),
+            ("exit", EXIT_FEATURES),
+        )
+        self.layout = {}
+        offset = 0
+        for name, size in sizes:
+            self.layout[name] = slice(offset, offset + size)
+            offset += size
+        self.size = offset
+        self._scratch = {}
+
+    @classmethod
+    def for_game(cls, game, **options):
+        """Encoder for the map a game is playing."""
+        return cls(game.tile_grid, game.map_loader.tile_size, **options)
+
+    def new_buffer(self, num_players):
+        """Zeroed output array for encode()."""
+        return np.zeros((num_players, self.size), dtype=np.float32)
+
+    def views(self, buffer):
+        """
+        Named views into a buffer of any leading shape (no copies). Tiles
+        and entity lists are reshaped into windows and rows.
+        """
+        lead = buffer.shape[:-1]
+        layout = self.layout
+        return {
+            "player": buffer[..., layout["player"]],
+            "tiles": buffer[..., layout["tiles"]].reshape(lead + (self.window, self.window)),
+            "enemies": buffer[..., layout["enemies"]].reshape(
+                lead + (self.max_enemies, ENEMY_FEATURES)
+            ),
+            "projectiles": buffer[..., layout["projectiles"]].reshape(
+                lead + (self.max_projectiles, PROJECTILE_FEATURES)
+            ),
+            "exit": buffer[..., layout["exit"]],
+        }
+
+    def _buffer(self, name, count, dtype=np.float64, columns=()):
+        """The first count rows of a scratch array, grown as needed."""
+        array = self._scratch.get(name)
+        if array is None or len(array) < count:
+            capacity = max(count, 2 * len(array) if array is not None else 16)
+            array = np.empty((capacity,) + columns, dtype=dtype)
+            self._scratch[name] = array
+        return array[:count]
+
+    def _centres(self, store, eids, axis, size):
+        """Entity centres along one axis, from the component store."""
+        count = len(eids)
+        centres = self._buffer(f"{axis}_centre", count)
+        np.take(store.view(axis), eids, out=centres, mode="clip")
+        sizes = store.view(size)
+        sizes = np.take(sizes, eids, out=self._buffer(size, count, sizes.dtype), mode="clip")
+        half = self._buffer("half", count)
+        np.divide(sizes, 2, out=half)
+        return np.add(centres, half, out=centres)
+
+    def encode(self, game, out):
+        """Write every roster player's observation into out[slot]."""
+        layout = self.layout
+        store = game.components
+
+        # Enemy-like actors still in play, from the component store
+        actors = [*game.enemies, *game.machinegunners]
+        eids = np.fromiter((actor.eid for actor in actors), dtype=np.intp, count=len(actors))
+        enemy_x = self._centres(store, eids, "x", "width")
+        enemy_y = self._centres(store, eids, "y", "height")
+        enemy_extra = self._buffer("enemy_extra", len(actors), np.float32, (3,))
+        enemy_extra[:, 0] = store.view("kind")[eids]
+        enemy_extra[:, 1] = store.view("alert_state")[eids] == _ALERT
+        enemy_extra[:, 2] = 1
+
+        projectiles = list(game.projectiles)
+        count = len(projectiles)
+        shot_x = self._buffer("shot_x", count)
+        shot_x[:] = [p.rect.centerx for p in projectiles]
+        shot_y = self._buffer("shot_y", count)
+        shot_y[:] = [p.rect.centery for p in projectiles]
+        shot_extra = self._buffer("shot_extra", count, np.float32, (3,))
+        shot_extra[:, 0] = np.fromiter((p.direction for p in projectiles), np.float32, count)
+        shot_extra[:, 1] = np.fromiter(
+            (p.owner_type == "player" for p in projectiles), np.float32, count
+        )
+        shot_extra[:, 2] = 1
+
+        exit_sprite = game.exit_sprite
+        window = self.window
+        padded = self._padded
+
+        for slot, player in enumerate(game.roster["players"]):
+            row = out[slot]
+            rect = player.rect
+            cx = rect.centerx
+            cy = rect.centery
+
+            row[layout["player"]] = (
+                player.x,
+                player.y,
+                player.vel_x,
+                player.vel_y,
+                player.alive,
+                player.on_ground,
+                player.climbing,
+            )
+
+            tile_row = min(max(cy // self.tile_size, 0), padded.shape[0] - window)
+            tile_col = min(max(cx // self.tile_size, 0), padded.shape[1] - window)
+            row[layout["tiles"]].reshape(window, window)[:] = padded[
+                tile_row : tile_row + window, tile_col : tile_col + window
+            ]
+
+            self._write_nearest(
+                row[layout["enemies"]].reshape(self.max_enemies, ENEMY_FEATURES),
+                enemy_x,
+                enemy_y,
+                cx,
+                cy,
+                enemy_extra,
+            )
+            self._write_nearest(
+                row[layout["projectiles"]].reshape(self.max_projectiles, PROJECTILE_FEATURES),
+                shot_x,
+                shot_y,
+                cx,
+                cy,
+                shot_extra,
+            )
+
+            if exit_sprite:
+                row[layout["exit"]] = (
+                    exit_sprite.rect.centerx - cx,
+                    exit_sprite.rect.centery - cy,
+                    1,
+                )
+            else:
+                row[layout["exit"]] = 0
+        return out
+
+
+    def _write_nearest(self, block, x, y, cx, cy, extra):
+        """Fill block with the rows closest to (cx, cy), nearest first."""
+        count = len(x)
+        dx = np.subtract(x, cx, out=self._buffer("dx", count))
+        dy = np.subtract(y, cy, out=self._buffer("dy", count))
+        distance = np.abs(dx, out=self._buffer("distance", count))
+        distance += np.abs(dy, out=self._buffer("distance_y", count))
+        slots = len(block)
+        if count > slots:
+            nearest = np.argpartition(distance, slots - 1)[:slots]
+            nearest = nearest[np.argsort(distance[nearest], kind="stable")]
+        else:
+            nearest = np.argsort(distance, kind="stable")
+        used = len(nearest)
+        picked = self._buffer("picked", used)
+        block[:used, 0] = np.take(dx, nearest, out=picked, mode="clip")
+        block[:used, 1] = np.take(dy, nearest, out=picked, mode="clip")
+        picked = self._buffer("picked_extra", used, np.float32, (3,))
+        block[:used, 2:] = np.take(extra, nearest, axis=0, out=picked, mode="clip")
+        block[used:] = 0
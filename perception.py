@@ -0,0 +1,97 @@
+import bisect
+
+# Half-size of the probe used for line-of-sight checks (matches the 4x4 test rect
+# the enemy raycast originally stepped along the ray)
+PROBE_HALF_SIZE = 2
+
+# Height of the vertical bands solids are bucketed into
+BAND_HEIGHT = 64
+
+
+class Perception:
+    """
+    Per-tick visibility query shared by every enemy.
+
+    Instead of each enemy marching a ray through every platform and obstacle,
+    solid geometry is bucketed into vertical bands once per tick. For each ray
+    row that is queried, the horizontal intervals blocked by solids are merged
+    and cached, so a line-of-sight check becomes an interval containment test.
+    """
+
+    def __init__(self, band_height=BAND_HEIGHT):
+        self.band_height = band_height
+        self._solid_groups = ()
+        self._bands = None
+        self._rows = {}
+
+    def begin_tick(self, platforms, obstacles):
+        """Start a new perception pass against the current level geometry."""
+        self._solid_groups = (platforms, obstacles)
+        self._bands = None  # Built lazily on the first query of the tick
+        self._rows = {}
+
+    def _build_bands(self):
+        bands = {}
+        for group in self._solid_groups:
+            for solid in group:
+                rect = solid.rect
+                first_band = rect.top // self.band_height
+                last_band = (rect.bottom - 1) // self.band_height
+                for band in range(first_band, last_band + 1):
+                    bands.setdefault(band, []).append(rect)
+        self._bands = bands
+
+    def blocked_intervals(self, row_y):
+        """
+        Return (starts, ends) of the merged x-intervals blocked on a ray row.
+
+        An interval is blocked for a probe centre x when start < x < end.
+        """
+        cached = self._rows.get(row_y)
+        if cached is not None:
+            return cached
+
+        if self._bands is None:
+            self._build_bands()
+
+        probe_top = row_y - PROBE_HALF_SIZE
+        probe_bottom = row_y + PROBE_HALF_SIZE
+
+        # Collect solids overlapping the probe's vertical extent
+        spans = []
+        seen = set()
+        first_band = probe_top // self.band_height
+        last_band = (probe_bottom - 1) // self.band_height
+        for band in range(first_band, last_band + 1):
+            for rect in self._bands.get(band, ()):
+                if id(rect) in seen:
+                    continue
+                seen.add(id(rect))
+                if rect.top < probe_bottom and rect.bottom > probe_top:
+                    spans.append(
+                        (rect.left - PROBE_HALF_SIZE, rect.right + PROBE_HALF_SIZE)
+                    )
+
+        # Merge overlapping spans so starts and ends are both sorted
+        spans.sort()
+        starts = []
+        ends = []
+        for start, end in spans:
+            if ends and start < ends[-1]:
+                ends[-1] = max(ends[-1], end)
+            else:
+                starts.append(start)
+                ends.append(end)
+
+        self._rows[row_y] = (starts, ends)
+        return starts, ends
+
+    def line_of_sight(self, x0, x1, row_y):
+        """Return True if nothing solid lies between x0 and x1 on the given row."""
+        low, high = (x0, x1) if x0 <= x1 else (x1, x0)
+        starts, ends = self.blocked_intervals(row_y)
+
+        # Last interval starting before the far end of the segment; since the
+        # intervals are disjoint it also has the largest end among them
+        i = bisect.bisect_left(starts, high) - 1
+        return i < 0 or ends[i] <= low
@@ -0,0 +1,196 @@
+import numpy as np
+import pygame
+from config import GRAVITY
+
+
+class SolidGroup(pygame.sprite.Group):
+    """
+    Sprite group of level solids with a version that changes whenever a
+    solid is added or removed. Rects are not watched: call moved() after
+    changing a solid's rect in place.
+    """
+
+    def __init__(self, *sprites):
+        self.version = 0
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.version += 1
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.version += 1
+
+    def moved(self):
+        """Note that a solid in the group changed its rect."""
+        self.version += 1
+
+
+class SolidTable:
+    """
+    Level solids (platforms and obstacles) as arrays sorted by top edge.
+
+    Synced from SolidGroups and rebuilt only when one of their versions
+    changes; each rebuild bumps version so systems can tell that the geometry
+    under resting actors may have changed.
+    """
+
+    def __init__(self):
+        self.left = np.zeros(0, dtype=np.int64)
+        self.right = np.zeros(0, dtype=np.int64)
+        self.top = np.zeros(0, dtype=np.int64)
+        self.bottom = np.zeros(0, dtype=np.int64)
+        self.max_height = 0
+        self.version = 0
+        self._groups = ()
+        self._group_versions = ()
+
+    def sync(self, platforms, obstacles):
+        """Rebuild the table if either SolidGroup changed since the last sync."""
+        groups = (platforms, obstacles)
+        versions = (platforms.version, obstacles.version)
+        if (
+            versions == self._group_versions
+            and all(group is synced for group, synced in zip(groups, self._groups))
+        ):
+            return
+        self._groups = groups
+        self._group_versions = versions
+
+        rects = [tuple(solid.rect) for solid in platforms]
+        rects.extend(tuple(solid.rect) for solid in obstacles)
+
+        # (left, top, width, height) rows, sorted by top edge
+        table = np.array(sorted(rects, key=lambda rect: rect[1]), dtype=np.int64).reshape(-1, 4)
+        self.left = table[:, 0].copy()
+        self.top = table[:, 1].copy()
+        self.right = self.left + table[:, 2]
+        self.bottom = self.top + table[:, 3]
+        self.max_height = int(table[:, 3].max()) if len(table) else 0
+        self.version += 1
+
+
+class PhysicsSystem:
+    """
+    Batched gravity and vertical collision for enemies and machinegunners.
+
+    Integrates every actor's vertical motion with NumPy over the component
+    store, then resolves landings and ceiling bumps against the sorted solid
+    table in one pass. Actors that come to rest on the ground without moving
+    horizontally are put to sleep and skipped until woken; every sleeper is
+    woken when the level geometry changes.
+    """
+
+    def __init__(self):
+        self.solids = SolidTable()
+        self._stepped_version = None
+
+    def sync_level(self, platforms, obstacles):
+        self.solids.sync(platforms, obstacles)
+
+    def step(self, actors, delta_time):
+        """Apply one tick of vertical motion to the given actors."""
+        # Actors added from outside a game may live in a different store
+        by_store = {}
+        for actor in actors:
+            by_store.setdefault(actor.store, []).append(actor)
+
+        geometry_unchanged = self._stepped_version == self.solids.version
+        for store, store_actors in by_store.items():
+            self._step_store(store, store_actors, delta_time, geometry_unchanged)
+        self._stepped_version = self.solids.version
+
+    def _step_store(self, store, actors, delta_time, geometry_unchanged):
+        eids = np.fromiter((actor.eid for actor in actors), dtype=np.intp, count=len(actors))
+        x = store.view("x")
+        y = store.view("y")
+        vel_y = store.view("vel_y")
+        on_ground = store.view("on_ground")
+
+        sleeping = store.view("sleeping")
+        if not geometry_unchanged:
+            sleeping[eids] = 0
+
+        # Sleeping actors have nothing to integrate
+        active = sleeping[eids] == 0
+        if not active.all():
+            if not active.any():
+                return
+            eids = eids[active]
+            actors = [actor for actor, keep in zip(actors, active.tolist()) if keep]
+
+        # Integrate gravity and position
+        vel_y[eids] += GRAVITY * delta_time
+        y[eids] += vel_y[eids] * delta_time
+        on_ground[eids] = 0
+
+        # Rect edges after the move (rect coordinates truncate like int())
+        top = np.trunc(y[eids]).astype(np.int64)
+        left = np.trunc(x[eids]).astype(np.int64)
+        bottom = top + store.view("height")[eids]
+        right = left + store.view("width")[eids]
+
+        self._resolve(eids, top, left, bottom, right, y, vel_y, on_ground)
+
+        # Actors resting on the ground with no horizontal motion go to sleep
+        sleeping[eids] = (on_ground[eids] == 1) & (store.view("vel_x")[eids] == 0)
+
+        # Copy the results back onto the sprite rects
+        new_tops = np.trunc(y[eids]).astype(np.int64).tolist()
+        for actor, new_top in zip(actors, new_tops):
+            actor.rect.y = new_top
+
+    def _resolve(self, eids, top, left, bottom, right, y, vel_y, on_ground):
+        solids = self.solids
+        if len(solids.top) == 0:
+            return
+
+        # Solids that can overlap vertically: top below the actor's top minus
+        # the tallest solid, and above the actor's bottom
+        lo = np.searchsorted(solids.top, top - solids.max_height, side="right")
+        hi = np.searchsorted(solids.top, bottom, side="left")
+        counts = np.maximum(hi - lo, 0)
+        total = int(counts.sum())
+        if total == 0:
+            return
+
+        # Flatten (actor, solid) candidate pairs
+        owner = np.repeat(np.arange(len(eids)), counts)
+        starts = np.repeat(lo, counts)
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        solid = starts + offsets
+
+        hit = (
+            (solids.bottom[solid] > top[owner])
+            & (solids.left[solid] < right[owner])
+            & (solids.right[solid] > left[owner])
+        )
+        owner = owner[hit]
+        solid = solid[hit]
+        if len(owner) == 0:
+            return
+
+        velocity = vel_y[eids]
+        heights = bottom - top
+
+        # Falling actors land on the highest solid they overlap
+        falling = velocity[owner] > 0
+        if falling.any():
+            landing = np.full(len(eids), np.iinfo(np.int64).max, dtype=np.int64)
+            np.minimum.at(landing, owner[falling], solids.top[solid[falling]])
+            landed = np.flatnonzero(landing != np.iinfo(np.int64).max)
+            landed_eids = eids[landed]
+            y[landed_eids] = landing[landed] - heights[landed]
+            vel_y[landed_eids] = 0
+            on_ground[landed_eids] = 1
+
+        # Rising actors bump their head on the lowest solid they overlap
+        rising = velocity[owner] < 0
+        if rising.any():
+            ceiling = np.full(len(eids), np.iinfo(np.int64).min, dtype=np.int64)
+            np.maximum.at(ceiling, owner[rising], solids.bottom[solid[rising]])
+            bumped = np.flatnonzero(ceiling != np.iinfo(np.int64).min)
+            bumped_eids = eids[bumped]
+            y[bumped_eids] = ceiling[bumped]
+            vel_y[bumped_eids] = 0
@@ -1,7 +1,8 @@
-from pygame.sprite import Sprite
 import pygame
 from projectile import Projectile
-from spritesheet import SpriteSheet
+from atlas import load_player_atlas
+from actor import Actor
+from components import KIND_PLAYER
 from config import (
     PLAYER_SPEED,
     PLAYER_JUMP,
@@ -12,57 +13,42 @@ from config import (
 )
 
 
-class Player(Sprite):
-    def __init__(self, x, y, color, controls):
-        super().__init__()
+class Player(Actor):
+    KIND = KIND_PLAYER
+
+    def __init__(self, x, y, color, controls, store=None):
+        super().__init__(store)
 
         # Load sprite animations
         self.animation_delay = 4  # Lower delay for faster animation
         self.idle_counter = 0
         self.run_counter = 0
 
+        # Animation frames are views into the shared player atlas
+        atlas = load_player_atlas()
+
         # Idle animation (11 frames)
         self.idle_state = 0
-        self.idle_length = 11
-        player_idle = SpriteSheet(pygame.image.load("./Assets/Player/player_idle.png"))
-        self.idle_frames = [
-            player_idle.getimage(32 * x, 0, 32, 32) for x in range(self.idle_length)
-        ]
-        self.idle_frames_flipped = []
-        for i in range(len(self.idle_frames)):
-            self.idle_frames[i] = pygame.transform.scale(self.idle_frames[i], (45, 60))
-            self.idle_frames_flipped.append(
-                pygame.transform.flip(self.idle_frames[i], True, False)
-            )
+        self.idle_frames = atlas.frames("idle")
+        self.idle_frames_flipped = atlas.frames("idle_flipped")
+        self.idle_length = len(self.idle_frames)
 
         # Run animation (12 frames)
         self.run_state = 0
-        self.run_length = 12
-        player_run = SpriteSheet(pygame.image.load("./Assets/Player/player_run.png"))
-        self.run_frames = [
-            player_run.getimage(32 * x, 0, 32, 32) for x in range(self.run_length)
-        ]
-        self.run_frames_flipped = []
-        for i in range(len(self.run_frames)):
-            self.run_frames[i] = pygame.transform.scale(self.run_frames[i], (45, 60))
-            self.run_frames_flipped.append(
-                pygame.transform.flip(self.run_frames[i], True, False)
-            )
+        self.run_frames = atlas.frames("run")
+        self.run_frames_flipped = atlas.frames("run_flipped")
+        self.run_length = len(self.run_frames)
 
         # Jump and fall (single frames)
-        self.jump_frame = pygame.transform.scale(
-            pygame.image.load("./Assets/Player/player_jump.png"), (45, 60)
-        )
-        self.jump_frame_flipped = pygame.transform.flip(self.jump_frame, True, False)
-
-        self.fall_frame = pygame.transform.scale(
-            pygame.image.load("./Assets/Player/player_fall.png"), (45, 60)
-        )
-        self.fall_frame_flipped = pygame.transform.flip(self.fall_frame, True, False)
+        self.jump_frame = atlas.frame("jump")
+        self.jump_frame_flipped = atlas.frame("jump_flipped")
+        self.fall_frame = atlas.frame("fall")
+        self.fall_frame_flipped = atlas.frame("fall_flipped")
 
         # Set initial image
         self.image = self.idle_frames[0]
         self.rect = self.image.get_rect()
+        self._init_collider()
         self.x = float(x)  # Store position as floats
         self.y = float(y)
         self.rect.x = int(self.x)
@@ -80,11 +66,13 @@ class Player(Sprite):
         self.on_ladder = False
         self.climbing = False
 
-    def update(self, platforms, obstacles, ladders, delta_time):
+    def update(self, platforms, obstacles, ladders, delta_time, keys=None):
+        """Move for one tick. keys defaults to the live keyboard state."""
         if not self.alive:
             return
 
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
 
         # Check if player is touching a ladder
         self.on_ladder = self._check_ladder_collision(ladders)
@@ -105,7 +93,7 @@ class Player(Sprite):
             # Vertical climbing movement
             if keys[self.controls["jump"]]:  # W or UP - climb up
                 self.vel_y = -PLAYER_CLIMB_SPEED
-            elif keys[pygame.K_s] or keys[pygame.K_DOWN]:  # S or DOWN - climb down
+            elif keys[self.controls["down"]]:  # S or DOWN - climb down
                 self.vel_y = PLAYER_CLIMB_SPEED
 
             # Horizontal movement (slower while on ladder)
@@ -117,10 +105,10 @@ class Player(Sprite):
                 self.vel_x = PLAYER_SPEED * 0.5  # Half speed on ladder
                 self.facing_right = True
 
-            # Jump off ladder
-            if (keys[self.controls["left"]] or keys[self.controls["right"]]) and (
-                keys[pygame.K_SPACE] or keys[pygame.K_RSHIFT]
-            ):
+            # Jump off ladder: a direction with the shoot key held
+            if (keys[self.controls["left"]] or keys[self.controls["right"]]) and keys[
+                self.controls["shoot"]
+            ]:
                 # Player wants to jump off sideways
                 self.climbing = False
                 self.vel_y = PLAYER_JUMP * 0.7  # Smaller jump when jumping off ladder
@@ -179,48 +167,6 @@ class Player(Sprite):
                 return True
         return False
 
-    def check_platform_collision(self, platforms, direction):
-        for platform in platforms:
-            if self.rect.colliderect(platform.rect):
-                if direction == "horizontal":
-                    if self.vel_x > 0:  # Moving right
-                        self.rect.right = platform.rect.left
-                        self.x = float(self.rect.x)
-                    elif self.vel_x < 0:  # Moving left
-                        self.rect.left = platform.rect.right
-                        self.x = float(self.rect.x)
-                elif direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = platform.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Jumping
-                        self.rect.top = platform.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-
-    def check_obstacle_collision(self, obstacles, direction):
-        for obstacle in obstacles:
-            if self.rect.colliderect(obstacle.rect):
-                if direction == "horizontal":
-                    if self.vel_x > 0:  # Moving right
-                        self.rect.right = obstacle.rect.left
-                        self.x = float(self.rect.x)
-                    elif self.vel_x < 0:  # Moving left
-                        self.rect.left = obstacle.rect.right
-                        self.x = float(self.rect.x)
-                elif direction == "vertical":
-                    if self.vel_y > 0:  # Falling
-                        self.rect.bottom = obstacle.rect.top
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-                        self.on_ground = True
-                    elif self.vel_y < 0:  # Jumping
-                        self.rect.top = obstacle.rect.bottom
-                        self.y = float(self.rect.y)
-                        self.vel_y = 0
-
     def _update_animation(self):
         """Animate when walking, static when idle"""
         if self.vel_x != 0:
@@ -230,20 +176,22 @@ class Player(Sprite):
                 self.run_counter = 0
             else:
                 self.run_counter += 1
-
-            if self.facing_right:
-                self.image = self.run_frames[self.run_state]
-            else:
-                self.image = self.run_frames_flipped[self.run_state]
         else:
             # Standing still - static idle frame
             self.run_counter = 0
             self.run_state = 0
 
+        self.image = self.current_frame()
+
+    def current_frame(self):
+        """Animation frame for the current movement and facing."""
+        if self.vel_x != 0:
             if self.facing_right:
-                self.image = self.idle_frames[0]
-            else:
-                self.image = self.idle_frames_flipped[0]
+                return self.run_frames[self.run_state]
+            return self.run_frames_flipped[self.run_state]
+        if self.facing_right:
+            return self.idle_frames[0]
+        return self.idle_frames_flipped[0]
 
     def shoot(self, projectiles_group):
         if not self.alive:
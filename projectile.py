@@ -1,4 +1,4 @@
-from pygame import Surface
+import surfaces
 from pygame.sprite import Sprite
 from config import PROJECTILE_SPEED, SCREEN_WIDTH
 
@@ -6,8 +6,8 @@ from config import PROJECTILE_SPEED, SCREEN_WIDTH
 class Projectile(Sprite):
     def __init__(self, x, y, direction, color, owner_type):
         super().__init__()
-        self.image = Surface((8, 8))
-        self.image.fill(color)
+        self.image = surfaces.solid((8, 8), color)
+        self.color = color
         self.rect = self.image.get_rect()
         self.x = float(x)  # Store position as float
         self.y = float(y)
@@ -0,0 +1,342 @@
+"""
+Record games to replay files and play them back.
+
+A replay is an append-only stream of records after a short header. Every
+tick adds a delta frame (see delta.py) of what changed, plus the tick's
+gameplay events if any happened. Every keyframe_interval ticks the frame
+is a keyframe: a delta from an empty game, which holds everything and so
+can be decoded on its own. Playback seeks by decoding from the nearest
+keyframe before the target tick.
+
+Recording only encodes on the game's thread. Encoded bytes are buffered
+and handed to a background thread that does the file writes.
+
+    python replay.py recording.tcr   # watch a replay
+"""
+import argparse
+import queue
+import struct
+import threading
+from bisect import bisect_right
+from config import FPS
+from delta import DeltaEncoder, DeltaDecoder
+from events import EVENT_TYPES, HIT, DEATH
+
+REPLAY_MAGIC = b"TCRP"
+# Bumped with delta.DELTA_VERSION, since replays hold delta frames
+REPLAY_VERSION = 1
+
+# Ticks between keyframes: two seconds of play
+KEYFRAME_INTERVAL = 2 * FPS
+
+# Bytes buffered before they're handed to the writer thread
+FLUSH_BYTES = 16 * 1024
+
+# Record types
+RECORD_KEYFRAME = 1
+RECORD_DELTA = 2
+RECORD_EVENTS = 3
+
+# magic, version, player count, keyframe interval, map name length
+_HEADER = struct.Struct("<4sHBHB")
+# record type, payload length
+_RECORD = struct.Struct("<BI")
+# event type, detail, actor (roster position or NO_ACTOR), x, y
+_EVENT = struct.Struct("<BBHii")
+# tick of an events record
+_TICK = struct.Struct("<I")
+
+NO_ACTOR = 0xFFFF
+DEATH_CAUSES = ("shot", "fell")
+
+
+class ReplayError(ValueError):
+    """Raised when a file isn't a replay this version can play."""
+
+
+def _roster_actors(game):
+    roster = game.roster
+    return [*roster["players"], *roster["enemies"], *roster["machinegunners"]]
+
+
+class ReplayRecorder:
+    """
+    Records a game to a file from now until close(). The game calls
+    record_tick() at the end of every update.
+    """
+
+    def __init__(self, game, path, keyframe_interval=KEYFRAME_INTERVAL, flush_bytes=FLUSH_BYTES):
+        self.game = game
+        self.keyframe_interval = keyframe_interval
+        self.flush_bytes = flush_bytes
+        self.tick = 0
+        self._encoder = DeltaEncoder()
+        self._actors = {actor: index for index, actor in enumerate(_roster_actors(game))}
+        self._events = []
+
+        name = game.map_name.encode()
+        self._buffer = bytearray(
+            _HEADER.pack(
+                REPLAY_MAGIC,
+                REPLAY_VERSION,
+                len(game.roster["players"]),
+                keyframe_interval,
+                len(name),
+            )
+            + name
+        )
+        self._queue = queue.Queue()
+        self._error = None  # Raised by the writer thread, re-raised here
+        self._writer = threading.Thread(target=self._write_loop, args=(path,), daemon=True)
+        self._writer.start()
+
+        game.recorder = self
+        self.subscribe(game.events)
+        # The state the recording starts from
+        self.record_tick()
+
+    def subscribe(self, events):
+        for event_type in EVENT_TYPES:
+            events.subscribe(
+                event_type,
+                "replay",
+                lambda batch, event_type=event_type: self._on_events(event_type, batch),
+            )
+
+    def record_tick(self):
+        """Append this tick's frame and events."""
+        if self.tick % self.keyframe_interval == 0:
+            self._encoder.reset()
+            kind = RECORD_KEYFRAME
+        else:
+            kind = RECORD_DELTA
+        frame = self._encoder.encode(self.game, self.tick)
+        self._buffer += _RECORD.pack(kind, len(frame))
+        self._buffer += frame
+
+        if self._events:
+            payload = _TICK.pack(self.tick) + b"".join(self._events)
+            self._buffer += _RECORD.pack(RECORD_EVENTS, len(payload))
+            self._buffer += payload
+            self._events.clear()
+
+        self.tick += 1
+        if len(self._buffer) >= self.flush_bytes:
+            self._flush()
+
+    def close(self):
+        """
+        Write out everything recorded and stop recording. Raises whatever
+        stopped the file being written, if anything did.
+        """
+        self._detach()
+        try:
+            self._flush()
+        finally:
+            self._queue.put(None)
+            self._writer.join()
+        self._raise_error()
+
+    def _detach(self):
+        if self.game.recorder is self:
+            self.game.recorder = None
+            self.game.events.set_enabled("replay", False)
+
+    def _flush(self):
+        self._raise_error()
+        if self._buffer:
+            self._queue.put(bytes(self._buffer))
+            self._buffer.clear()
+
+    def _raise_error(self):
+        """Stop recording and raise the writer thread's error, if it had one."""
+        error, self._error = self._error, None
+        if error is not None:
+            self._detach()
+            raise error
+
+    def _write_loop(self, path):
+        try:
+            with open(path, "wb") as out:
+                while True:
+                    chunk = self._queue.get()
+                    if chunk is None:
+                        return
+                    out.write(chunk)
+        except Exception as error:
+            self._error = error
+
+    def _on_events(self, event_type, batch):
+        code = EVENT_TYPES.index(event_type)
+        for payload in batch:
+            detail = 0
+            if event_type == DEATH:
+                detail = DEATH_CAUSES.index(payload[2])
+            # The subject of the event: shooter, hit target, victim or alerted enemy
+            subject = payload[1] if event_type == HIT else payload[0]
+            actor = self._actors.get(subject, NO_ACTOR)
+            rect = getattr(subject, "rect", None)
+            x, y = (rect.centerx, rect.centery) if rect is not None else (0, 0)
+            self._events.append(_EVENT.pack(code, detail, actor, x, y))
+
+
+class ReplayEvent:
+    """One recorded gameplay event."""
+
+    __slots__ = ("tick", "type", "actor", "x", "y", "cause")
+
+    def __init__(self, tick, event_type, actor, x, y, cause=None):
+        self.tick = tick
+        self.type = event_type
+        self.actor = actor  # Roster position, or None
+        self.x = x
+        self.y = y
+        self.cause = cause  # For deaths: "shot" or "fell"
+
+    def __repr__(self):
+        return f"ReplayEvent({self.tick}, {self.type!r}, actor={self.actor})"
+
+
+class ReplayPlayer:
+    """Shows a replay in a Game of its level without simulating it."""
+
+    def __init__(self, path, headless=False):
+        # Imported here so the module can be loaded without pygame initialised
+        from game import Game
+
+        with open(path, "rb") as replay:
+            self._data = replay.read()
+        try:
+            magic, version, num_players, self.keyframe_interval, name_length = (
+                _HEADER.unpack_from(self._data)
+            )
+        except struct.error:
+            raise ReplayError("replay is truncated")
+        if magic != REPLAY_MAGIC:
+            raise ReplayError("not a replay")
+        if version != REPLAY_VERSION:
+            raise ReplayError(f"replay version {version} (expected {REPLAY_VERSION})")
+        offset = _HEADER.size
+        self.map_name = self._data[offset : offset + name_length].decode()
+        self._records = self._index(offset + name_length)
+        # Record positions of every tick's frame, and of the keyframes
+        self._frames = [
+            position for position, (kind, _, _) in enumerate(self._records)
+            if kind != RECORD_EVENTS
+        ]
+        self._keyframes = [
+            position for position in self._frames
+            if self._records[position][0] == RECORD_KEYFRAME
+        ]
+        if not self._keyframes:
+            raise ReplayError("replay has no frames")
+        self.length = len(self._frames)
+
+        self.game = Game(num_players, self.map_name, headless=headless)
+        self.tick = -1  # Tick currently shown
+        self._position = 0  # Next record to read
+        self._decoder = None
+        self.seek(0)
+
+    def _index(self, offset):
+        """(type, start, end) of every complete record."""
+        records = []
+        data = self._data
+        while offset + _RECORD.size <= len(data):
+            kind, length = _RECORD.unpack_from(data, offset)
+            start = offset + _RECORD.size
+            if start + length > len(data):
+                break  # Cut off mid-record: the recording didn't finish
+            records.append((kind, start, start + length))
+            offset = start + length
+        return records
+
+    def step(self):
+        """Show the next tick; returns its events, or None at the end."""
+        if self._position >= len(self._records):
+            return None
+        kind, start, end = self._records[self._position]
+        if kind == RECORD_KEYFRAME:
+            self._decoder = DeltaDecoder()
+        self.tick = self._decoder.apply(self.game, self._data[start:end])
+        self._position += 1
+
+        events = []
+        if self._position < len(self._records):
+            kind, start, end = self._records[self._position]
+            if kind == RECORD_EVENTS:
+                events = self._read_events(start, end)
+                self._position += 1
+        return events
+
+    def seek(self, tick):
+        """Show the given tick (clamped to the recording)."""
+        tick = max(0, min(tick, len(self._frames) - 1))
+        target = self._frames[tick]
+        keyframe = self._keyframes[bisect_right(self._keyframes, target) - 1]
+        self._decoder = DeltaDecoder()
+        for position in range(keyframe, target + 1):
+            kind, start, end = self._records[position]
+            if kind != RECORD_EVENTS:
+                self.tick = self._decoder.apply(self.game, self._data[start:end])
+        self._position = target + 1
+        # Skip the shown tick's events
+        if self._position < len(self._records) and self._records[self._position][0] == RECORD_EVENTS:
+            self._position += 1
+
+    def _read_events(self, start, end):
+        (tick,) = _TICK.unpack_from(self._data, start)
+        events = []
+        for code, detail, actor, x, y in _EVENT.iter_unpack(self._data[start + _TICK.size : end]):
+            event_type = EVENT_TYPES[code]
+            events.append(
+                ReplayEvent(
+                    tick,
+                    event_type,
+                    None if actor == NO_ACTOR else actor,
+                    x,
+                    y,
+                    DEATH_CAUSES[detail] if event_type == DEATH else None,
+                )
+            )
+        return events
+
+    def play(self):
+        """Watch the replay: space pauses, left/right skip 5 seconds, escape quits."""
+        import pygame
+
+        game = self.game
+        paused = False
+        while game.running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    game.running = False
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        game.running = False
+                    elif event.key == pygame.K_SPACE:
+                        paused = not paused
+                    elif event.key == pygame.K_LEFT:
+                        self.seek(self.tick - 5 * FPS)
+                    elif event.key == pygame.K_RIGHT:
+                        self.seek(self.tick + 5 * FPS)
+            if not paused and self.tick < self.length - 1:
+                self.step()
+            game.draw()
+            game.clock.tick(FPS)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Watch a replay")
+    parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    pygame.init()
+    ReplayPlayer(args.path).play()
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
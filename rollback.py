@@ -0,0 +1,211 @@
+"""
+Rollback netcode for peer-to-peer play.
+
+Each peer runs the whole game. Its own player's input is applied straight
+away; the other players' inputs, which arrive late, are predicted by
+repeating the last input received from them. The state before every tick
+is saved, so when a real input turns out to differ from its prediction the
+game is restored to that tick and the ticks since are simulated again.
+
+Inputs are controls.input_bits() masks. The shoot bit means "fired this
+tick" and is never predicted. Both peers must build their Game the same
+way (same map, player count and random seed) and give the session the
+same seed.
+
+    python rollback.py --depth 8   # re-simulation benchmark for every map
+"""
+import argparse
+import contextlib
+import json
+import random
+import time
+from config import FPS
+from controls import MOVE_CONTROLS, SHOOT_BIT, input_bits, key_table
+
+# Ticks a peer may run ahead of the last input confirmed by every peer
+MAX_ROLLBACK = 8
+
+
+class RollbackSession:
+    """One peer's view of a match: its game, inputs and saved states."""
+
+    def __init__(self, game, local_slot, seed=0, max_rollback=MAX_ROLLBACK, delta_time=1.0 / FPS):
+        self.game = game
+        self.local_slot = local_slot
+        self.max_rollback = max_rollback
+        self.delta_time = delta_time
+        self.tick = 0  # Next tick to simulate
+
+        players = game.roster["players"]
+        self._keys = [key_table(player.controls) for player in players]
+        self._inputs = [{} for _ in players]  # slot -> {tick: bits}, confirmed
+        self._latest = [-1] * len(players)  # Newest confirmed tick per slot
+        self._used = {}  # tick -> bits each player was simulated with
+        self._states = {}  # tick -> (snapshot, random state) before the tick
+        self._rollback_to = None
+        self._rng_state = random.Random(seed).getstate()
+
+        self.rollbacks = 0
+        self.resimulated_ticks = 0
+
+    def add_local_input(self, bits):
+        """Set this peer's input for the next tick; returns that tick (to send)."""
+        self._confirm(self.local_slot, self.tick, bits)
+        return self.tick
+
+    def add_remote_input(self, slot, tick, bits):
+        """Record another peer's input for a tick, rolling back if it was mispredicted."""
+        if tick < self.tick - self.max_rollback:
+            raise ValueError(f"input for tick {tick} is older than the rollback window")
+        self._confirm(slot, tick, bits)
+        used = self._used.get(tick)
+        if used is not None and used[slot] != bits:
+            if self._rollback_to is None or tick < self._rollback_to:
+                self._rollback_to = tick
+
+    def confirmed_tick(self):
+        """Newest tick for which every player's input is known."""
+        return min(self._latest)
+
+    def can_advance(self):
+        return self.tick - self.confirmed_tick() <= self.max_rollback
+
+    def advance(self):
+        """
+        Correct any misprediction, then simulate the next tick. Returns False
+        (and does nothing) while too far ahead of the other peers.
+        """
+        with self._game_random():
+            if self._rollback_to is not None:
+                self._rollback(self._rollback_to)
+                self._rollback_to = None
+            if not self.can_advance():
+                return False
+            self._simulate(self.tick)
+            self.tick += 1
+            self._forget_before(min(self.confirmed_tick(), self.tick - self.max_rollback))
+            return True
+
+    @contextlib.contextmanager
+    def _game_random(self):
+        """Swap the game's random state in, so peers in one process don't share it."""
+        outer_state = random.getstate()
+        random.setstate(self._rng_state)
+        try:
+            yield
+        finally:
+            self._rng_state = random.getstate()
+            random.setstate(outer_state)
+
+    def _confirm(self, slot, tick, bits):
+        self._inputs[slot][tick] = bits
+        if tick > self._latest[slot]:
+            self._latest[slot] = tick
+
+    def _input(self, slot, tick):
+        bits = self._inputs[slot].get(tick)
+        if bits is not None:
+            return bits
+        # Predict: keep holding what they held last, without firing again
+        latest = self._latest[slot]
+        if latest < 0:
+            return 0
+        return self._inputs[slot][latest] & ~SHOOT_BIT
+
+    def _simulate(self, tick):
+        game = self.game
+        self._states[tick] = (game.snapshot(), random.getstate())
+        used = tuple(self._input(slot, tick) for slot in range(len(self._keys)))
+        self._used[tick] = used
+
+        keys = []
+        for slot, (player, bits) in enumerate(zip(game.roster["players"], used)):
+            keys.append(self._keys[slot][bits])
+            if bits & SHOOT_BIT:
+                game.player_shoot(player)
+        game.update(self.delta_time, keys)
+
+    def _rollback(self, tick):
+        """Restore the state before tick and simulate up to the present again."""
+        data, rng_state = self._states[tick]
+        self.game.restore(data)
+        random.setstate(rng_state)
+        for replayed in range(tick, self.tick):
+            self._simulate(replayed)
+        self.rollbacks += 1
+        self.resimulated_ticks += self.tick - tick
+
+    def _forget_before(self, tick):
+        """Drop saved states and inputs that can no longer be rolled back to."""
+        for old in [t for t in self._states if t < tick]:
+            del self._states[old]
+            self._used.pop(old, None)
+        for inputs, latest in zip(self._inputs, self._latest):
+            for old in [t for t in inputs if t < min(tick, latest)]:
+                del inputs[old]
+
+
+def benchmark(map_name, ticks=300, depth=MAX_ROLLBACK, seed=0, agent="climber"):
+    """
+    Play a map with an agent, rolling back depth ticks after every tick,
+    and time the parts of the rollback path.
+    """
+    from agents import AGENTS
+    from game import Game
+
+    random.seed(seed)
+    game = Game(1, map_name, headless=True)
+    session = RollbackSession(game, 0, seed, max_rollback=depth)
+    policy = AGENTS[agent](seed)
+    controls = game.roster["players"][0].controls
+
+    simulate_time = 0.0
+    rollback_time = 0.0
+    played = 0
+    while played < ticks and not (game.game_over or game.victory):
+        (keys, shoot), = policy(game)
+        bits = input_bits([name for name in MOVE_CONTROLS if keys[controls[name]]], shoot)
+        started = time.perf_counter()
+        session.add_local_input(bits)
+        session.advance()
+        simulate_time += time.perf_counter() - started
+        played += 1
+
+        if session.tick > depth:
+            started = time.perf_counter()
+            with session._game_random():
+                session._rollback(session.tick - depth)
+            rollback_time += time.perf_counter() - started
+
+    resimulated = session.resimulated_ticks
+    return {
+        "map": map_name,
+        "ticks": played,
+        "depth": depth,
+        "tick_with_save_ms": 1000 * simulate_time / played,
+        "resimulated_ticks": resimulated,
+        "resimulated_per_second": resimulated / rollback_time if rollback_time else None,
+        "rollback_ms": 1000 * rollback_time / max(session.rollbacks, 1),
+    }
+
+
+def main(argv=None):
+    from maps import ALL_MAPS
+
+    parser = argparse.ArgumentParser(description="Rollback re-simulation benchmark")
+    parser.add_argument("--maps", nargs="+", default=sorted(ALL_MAPS))
+    parser.add_argument("--ticks", type=int, default=300)
+    parser.add_argument("--depth", type=int, default=MAX_ROLLBACK)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    import pygame
+
+    pygame.init()
+    for map_name in args.maps:
+        print(json.dumps(benchmark(map_name, args.ticks, args.depth, args.seed)))
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
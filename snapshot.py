@@ -0,0 +1,247 @@
+"""
+Compact binary snapshots of a running game.
+
+A snapshot holds everything that changes while a level is played: actor
+components, rects and group membership, per-actor state that isn't in the
+component store, projectiles, the camera, end-of-game flags and stats. Level
+geometry, images and the display are not included, so a snapshot can only
+be restored into a game running the same map with the same player count.
+
+Actors are identified by their position in Game.roster, so a snapshot taken
+in one game can be restored into another game of the same level (to fork a
+simulation, for example).
+"""
+import math
+import struct
+import numpy as np
+from components import COLUMNS
+from projectile import Projectile
+
+SNAPSHOT_MAGIC = b"TCSN"
+SNAPSHOT_VERSION = 1
+
+# magic, version, flags (game over, victory), camera_y
+_HEADER = struct.Struct("<4sHBi")
+# map name length, player count, enemy count, machinegunner count, projectiles
+_COUNTS = struct.Struct("<BHHHH")
+# shots fired, hits, kills, player deaths, alerts, exit reached
+_STATS = struct.Struct("<IIIII?")
+# facing right, alive, on ladder, climbing, idle/run counters and states
+_PLAYER = struct.Struct("<????iiii")
+# x, y, rect x, rect y, direction, owner, colour
+_PROJECTILE = struct.Struct("<ddiib?BBB")
+
+ROSTER_GROUPS = ("players", "enemies", "machinegunners")
+
+_GAME_OVER = 1
+_VICTORY = 2
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot can't be restored into a game."""
+
+
+def capture(game):
+    """Serialise the game's dynamic state to bytes."""
+    roster = game.roster
+    actors = [actor for name in ROSTER_GROUPS for actor in roster[name]]
+    players = roster["players"]
+    map_name = game.map_name.encode()
+    flags = (_GAME_OVER if game.game_over else 0) | (_VICTORY if game.victory else 0)
+    stats = game.stats
+    projectiles = list(game.projectiles)
+
+    parts = [
+        _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, int(game.camera_y)),
+        _COUNTS.pack(
+            len(map_name),
+            len(players),
+            len(roster["enemies"]),
+            len(roster["machinegunners"]),
+            len(projectiles),
+        ),
+        map_name,
+        _STATS.pack(
+            stats.shots_fired,
+            stats.hits,
+            stats.kills,
+            stats.player_deaths,
+            stats.alerts,
+            stats.exit_reached,
+        ),
+    ]
+
+    # Group membership and rect position of every roster actor
+    groups = [getattr(game, name) for name in ROSTER_GROUPS]
+    parts.append(
+        bytes(
+            1 if actor in group else 0
+            for name, group in zip(ROSTER_GROUPS, groups)
+            for actor in roster[name]
+        )
+    )
+    rects = np.array(
+        [(actor.rect.x, actor.rect.y) for actor in actors], dtype=np.int32
+    ).reshape(-1, 2)
+    parts.append(rects.tobytes())
+
+    # Component rows, one column at a time
+    store = game.components
+    eids = np.array([actor.eid for actor in actors], dtype=np.intp)
+    for name in COLUMNS:
+        parts.append(store.view(name)[eids].tobytes())
+
+    # State kept on the sprites rather than in the store
+    for player in players:
+        parts.append(
+            _PLAYER.pack(
+                player.facing_right,
+                player.alive,
+                player.on_ladder,
+                player.climbing,
+                player.idle_counter,
+                player.run_counter,
+                player.run_state,
+                player.idle_state,
+            )
+        )
+    last_seen = [
+        math.nan if enemy.last_seen_player_x is None else enemy.last_seen_player_x
+        for enemy in roster["enemies"]
+    ]
+    parts.append(np.array(last_seen, dtype=np.float64).tobytes())
+
+    for projectile in projectiles:
+        parts.append(
+            _PROJECTILE.pack(
+                projectile.x,
+                projectile.y,
+                projectile.rect.x,
+                projectile.rect.y,
+                projectile.direction,
+                projectile.owner_type == "player",
+                *projectile.color[:3],
+            )
+        )
+    return b"".join(parts)
+
+
+class _Reader:
+    def __init__(self, data):
+        self.data = memoryview(data)
+        self.offset = 0
+
+    def take(self, size):
+        if self.offset + size > len(self.data):
+            raise SnapshotError("snapshot is truncated")
+        chunk = self.data[self.offset : self.offset + size]
+        self.offset += size
+        return chunk
+
+    def unpack(self, layout):
+        return layout.unpack(self.take(layout.size))
+
+    def array(self, dtype, count):
+        dtype = np.dtype(dtype)
+        return np.frombuffer(self.take(dtype.itemsize * count), dtype=dtype)
+
+
+def restore(game, data):
+    """
+    Put the game into the state captured in data.
+
+    Raises SnapshotError if the data isn't a snapshot of this format
+    version, or was taken in a different level.
+    """
+    reader = _Reader(data)
+    magic, version, flags, camera_y = reader.unpack(_HEADER)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("not a game snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(
+            f"snapshot version {version} (expected {SNAPSHOT_VERSION})"
+        )
+    name_length, n_players, n_enemies, n_gunners, n_projectiles = reader.unpack(_COUNTS)
+    map_name = bytes(reader.take(name_length)).decode()
+
+    roster = game.roster
+    counts = (n_players, n_enemies, n_gunners)
+    if map_name != game.map_name or counts != tuple(
+        len(roster[name]) for name in ROSTER_GROUPS
+    ):
+        raise SnapshotError(f"snapshot is of a different level ({map_name!r})")
+
+    stats = reader.unpack(_STATS)
+    actors = [actor for name in ROSTER_GROUPS for actor in roster[name]]
+    membership = reader.take(len(actors))
+    rects = reader.array(np.int32, 2 * len(actors)).reshape(-1, 2).tolist()
+
+    columns = {
+        name: reader.array(typecode, len(actors)) for name, typecode in COLUMNS.items()
+    }
+    player_state = [reader.unpack(_PLAYER) for _ in range(n_players)]
+    last_seen = reader.array(np.float64, n_enemies).tolist()
+    projectiles = [reader.unpack(_PROJECTILE) for _ in range(n_projectiles)]
+
+    # Everything has been read, so the game is only changed by a valid snapshot
+    store = game.components
+    eids = np.array([actor.eid for actor in actors], dtype=np.intp)
+    for name, values in columns.items():
+        store.view(name)[eids] = values
+
+    for actor, (x, y) in zip(actors, rects):
+        actor.rect.x = x
+        actor.rect.y = y
+
+    # Groups are refilled in roster order so actors update in the same order
+    # as they did when the snapshot was taken
+    index = 0
+    for name in ROSTER_GROUPS:
+        group = getattr(game, name)
+        group.empty()
+        for actor in roster[name]:
+            if membership[index]:
+                group.add(actor)
+                game.all_sprites.add(actor)
+            else:
+                actor.kill()
+            index += 1
+
+    for player, state in zip(roster["players"], player_state):
+        (
+            player.facing_right,
+            player.alive,
+            player.on_ladder,
+            player.climbing,
+            player.idle_counter,
+            player.run_counter,
+            player.run_state,
+            player.idle_state,
+        ) = state
+        player.image = player.current_frame()
+
+    for enemy, seen in zip(roster["enemies"], last_seen):
+        enemy.last_seen_player_x = None if math.isnan(seen) else seen
+
+    game.projectiles.empty()
+    for x, y, rect_x, rect_y, direction, from_player, *color in projectiles:
+        projectile = Projectile(
+            x, y, direction, tuple(color), "player" if from_player else "enemy"
+        )
+        projectile.x = x
+        projectile.y = y
+        projectile.rect.x = rect_x
+        projectile.rect.y = rect_y
+        game.projectiles.add(projectile)
+
+    game.camera_y = camera_y
+    game.game_over = bool(flags & _GAME_OVER)
+    game.victory = bool(flags & _VICTORY)
+    (
+        game.stats.shots_fired,
+        game.stats.hits,
+        game.stats.kills,
+        game.stats.player_deaths,
+        game.stats.alerts,
+        game.stats.exit_reached,
+    ) = stats
@@ -0,0 +1,73 @@
+import bisect
+
+
+class VerticalBandIndex:
+    """
+    Bucket sprites into horizontal bands by their vertical center.
+
+    Lets callers visit only the sprites inside a vertical window (such as the
+    visible screen) instead of walking every sprite in the level. The index is
+    a snapshot: mark it stale whenever the sprites may have moved and it is
+    rebuilt on the next query.
+    """
+
+    def __init__(self, band_height=64):
+        self.band_height = band_height
+        self._bands = {}
+        self.stale = True
+
+    def invalidate(self):
+        """Mark the index as out of date."""
+        self.stale = True
+
+    def rebuild(self, sprites):
+        """Re-bucket every sprite by its current rect.centery."""
+        bands = {}
+        band_height = self.band_height
+        for sprite in sprites:
+            band = sprite.rect.centery // band_height
+            bucket = bands.get(band)
+            if bucket is None:
+                bands[band] = [sprite]
+            else:
+                bucket.append(sprite)
+        self._bands = bands
+        self.stale = False
+
+    def query(self, top, bottom):
+        """Yield sprites whose rect.centery lies within [top, bottom]."""
+        band_height = self.band_height
+        for band in range(int(top // band_height), int(bottom // band_height) + 1):
+            for sprite in self._bands.get(band, ()):
+                if top <= sprite.rect.centery <= bottom:
+                    yield sprite
+
+
+class SortedYIndex:
+    """
+    Static sprites sorted by rect.top.
+
+    Lets the renderer bisect straight to the sprites near the viewport, so
+    culling cost depends on what is on screen rather than how tall the level
+    is. Sprites must not move; rebuild the index if the set of sprites changes.
+    """
+
+    def __init__(self, sprites=()):
+        self.rebuild(sprites)
+
+    def rebuild(self, sprites):
+        # Stable sort keeps insertion order for sprites on the same row
+        self.sprites = sorted(sprites, key=lambda sprite: sprite.rect.top)
+        self.tops = [sprite.rect.top for sprite in self.sprites]
+        self.max_height = max(
+            (sprite.rect.height for sprite in self.sprites), default=0
+        )
+
+    def __len__(self):
+        return len(self.sprites)
+
+    def window(self, top_min, top_max):
+        """Sprites whose rect.top lies strictly between top_min and top_max."""
+        lo = bisect.bisect_right(self.tops, top_min)
+        hi = bisect.bisect_left(self.tops, top_max)
+        return self.sprites[lo:hi]
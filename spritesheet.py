@@ -1,13 +1,15 @@
-import pygame
+import surfaces
 
 
 class SpriteSheet:
     def __init__(self, image):
-        self.ss = image.convert_alpha()
+        # Flattened onto black once, with black keyed out, so frames sliced
+        # from it share the colorkey instead of each having it set
+        sheet = surfaces.convert(image, alpha=True)
+        self.ss = surfaces.blank(sheet.get_size())
+        self.ss.blit(sheet, (0, 0))
+        self.ss.set_colorkey((0, 0, 0))
 
     def getimage(self, x, y, width, height):
-        image = pygame.Surface([width, height]).convert()
-        image.blit(self.ss, (0, 0), (x, y, width, height))
-        image.set_colorkey((0, 0, 0))
-
-        return image
+        # copy() keeps the sheet's pixel format and colorkey
+        return self.ss.subsurface((x, y, width, height)).copy()
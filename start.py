@@ -1,11 +1,88 @@
-import pygame
-from game import Game
+"""
+Start Tower Climber.
 
-# Initialize Pygame
-pygame.init()
+With no options this asks for the player count and map. Options start a
+game (or a headless benchmark) in one command instead:
 
+    python start.py --players 2 --map level_1
+    python start.py --map-file my_tower.txt --fps 0 --ticks 1000 --benchmark out.json
+    python start.py --headless --map level_2 --seed 3 --ticks 3000 --profile
+"""
+import sys
+import time
 
-def main():
+# Taken before anything heavy is imported, for the startup report
+_START = time.perf_counter()
+
+import argparse
+import json
+import random
+from agents import AGENTS
+from config import FPS
+from maps import ALL_MAPS, load_map_file
+
+# Ticks a headless run plays if not told otherwise: a minute of game time
+HEADLESS_TICKS = 60 * FPS
+
+# Functions listed in the --profile report
+PROFILE_LINES = 30
+
+
+class StartupTimer:
+    """Wall-clock time of each startup phase, for tracking cold-start latency."""
+
+    def __init__(self, start=None):
+        self.start = time.perf_counter() if start is None else start
+        self._last = self.start
+        self.phases = []  # (name, seconds, counted)
+
+    def mark(self, name, counted=True):
+        """End the current phase. Uncounted phases (waiting on input) are
+        reported but left out of the total."""
+        now = time.perf_counter()
+        self.phases.append((name, now - self._last, counted))
+        self._last = now
+
+    @property
+    def total(self):
+        return sum(seconds for _, seconds, counted in self.phases if counted)
+
+    def report(self):
+        lines = ["Startup time:"]
+        for name, seconds, counted in self.phases:
+            note = "" if counted else " (not counted)"
+            lines.append(f"  {name:<16}{seconds * 1000:8.1f} ms{note}")
+        lines.append(f"  {'total':<16}{self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Tower Climber")
+    parser.add_argument("--players", type=int, choices=(1, 2))
+    level = parser.add_mutually_exclusive_group()
+    level.add_argument("--map", choices=sorted(ALL_MAPS))
+    level.add_argument("--map-file", metavar="PATH", help="text file with one map row per line")
+    parser.add_argument("--seed", type=int, help="random seed for the level")
+    parser.add_argument(
+        "--headless", action="store_true", help="no window: an agent plays, as fast as it can"
+    )
+    parser.add_argument("--agent", choices=sorted(AGENTS), default="climber", help="headless player")
+    parser.add_argument("--ticks", type=int, help="stop after this many frames")
+    parser.add_argument("--fps", type=int, default=FPS, help="frame rate cap (0: uncapped)")
+    parser.add_argument("--renderer", choices=("full", "dirty"), default="full")
+    parser.add_argument("--profile", action="store_true", help="print a cProfile report at the end")
+    parser.add_argument("--benchmark", metavar="PATH", help="write frame timings here as JSON")
+    parser.add_argument("--startup-report", action="store_true")
+    args = parser.parse_args(argv)
+    if args.ticks is not None and args.ticks < 0:
+        parser.error("--ticks can't be negative")
+    if args.fps < 0:
+        parser.error("--fps can't be negative")
+    return args
+
+
+def choose_interactively():
+    """Ask for the player count and map on the terminal."""
     print("=== Tower Climber Game ===")
     print("Select number of players:")
     print("1. Single Player")
@@ -34,9 +111,159 @@ def main():
     print("Defeat enemies along the way!")
     print("Don't fall off the bottom of the screen!")
     print("Starting game...\n")
+    return num_players, map_name
+
+
+def run_headless(game, agent, max_ticks, delta_time, on_tick=None):
+    """
+    Play game with an agent, drawing off-screen, until it ends or max_ticks
+    frames have run. Returns the frames run.
+    """
+    players = game.roster["players"]
+    ticks = 0
+    while ticks < max_ticks and not (game.game_over or game.victory):
+        actions = agent(game)
+        for player, (_, shoot) in zip(players, actions):
+            if shoot:
+                game.player_shoot(player)
+        game.update(delta_time, [keys for keys, _ in actions])
+        game.draw()
+        ticks += 1
+        if on_tick is not None:
+            on_tick(game)
+    return ticks
+
+
+class FrameTimer:
+    """Wall-clock time between frames, for --benchmark."""
+
+    def __init__(self):
+        self.times = []
+        self._last = None
+
+    def start(self):
+        self._last = time.perf_counter()
+
+    def __call__(self, game):
+        now = time.perf_counter()
+        self.times.append(now - self._last)
+        self._last = now
+
+    def summary(self):
+        times = sorted(self.times)
+        total = sum(times)
+        count = len(times)
+        return {
+            "ticks": count,
+            "seconds": total,
+            "ticks_per_second": count / total if total else None,
+            "mean_tick_ms": 1000 * total / count if count else None,
+            "p95_tick_ms": 1000 * times[int(0.95 * (count - 1))] if count else None,
+            "max_tick_ms": 1000 * times[-1] if count else None,
+        }
+
+
+def _outcome(game):
+    if game.victory:
+        return "victory"
+    if game.game_over:
+        return "death"
+    return None
+
+
+def main(argv=None):
+    timer = StartupTimer(_START)
+    args = parse_args(argv)
+    timer.mark("launcher")
+
+    map_data = None
+    if args.map_file is not None:
+        try:
+            map_name, map_data = load_map_file(args.map_file)
+        except (OSError, ValueError) as error:
+            sys.exit(f"start.py: {error}")
+    else:
+        map_name = args.map
+    num_players = args.players
+
+    # The menu is only for someone at a terminal who gave no choices
+    if num_players is None and map_name is None and not args.headless and sys.stdin.isatty():
+        num_players, map_name = choose_interactively()
+        timer.mark("menu", counted=False)
+    num_players = num_players or 1
+    map_name = map_name or "test"
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    # Deferred until a level is chosen so the menu comes up straight away.
+    # Only the display is started here (not audio or joysticks); the font
+    # module is started by the HUD on first draw
+    import pygame
+    timer.mark("pygame import")
+    if args.headless:
+        from game import Game
+        game = Game(
+            num_players, map_name, render_mode=args.renderer, headless=True, map_data=map_data
+        )
+        timer.mark("level setup")
+    else:
+        pygame.display.init()
+        from config import SCREEN_WIDTH, SCREEN_HEIGHT
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.DOUBLEBUF)
+        pygame.display.set_caption("Tower Climber")
+        timer.mark("pygame display")
+
+        # The level is built on a worker thread behind a loading screen
+        from loading import load_game
+        game = load_game(
+            num_players, map_name, screen, render_mode=args.renderer, map_data=map_data
+        )
+        timer.mark("level setup")
+        if game is None:
+            pygame.quit()
+            return
+
+    if args.startup_report:
+        print(timer.report())
+
+    # Only the frames are profiled: startup has its own report
+    profiler = None
+    if args.profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    frames = FrameTimer()
+    frames.start()
+    if args.headless:
+        # Headless frames step by the capped frame time but never wait
+        delta_time = 1.0 / (args.fps or FPS)
+        ticks = HEADLESS_TICKS if args.ticks is None else args.ticks
+        run_headless(game, AGENTS[args.agent](args.seed or 0), ticks, delta_time, frames)
+    else:
+        game.play(args.fps, args.ticks, frames)
+
+    if profiler is not None:
+        import pstats
+        profiler.disable()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_LINES)
+
+    if args.benchmark is not None:
+        result = {
+            "map": map_name,
+            "players": num_players,
+            "seed": args.seed,
+            "headless": args.headless,
+            "agent": args.agent if args.headless else None,
+            "renderer": args.renderer,
+            "fps_cap": args.fps,
+            "startup_ms": 1000 * timer.total,
+            "outcome": _outcome(game),
+        }
+        result.update(frames.summary())
+        with open(args.benchmark, "w") as out:
+            json.dump(result, out, indent=2)
 
-    game = Game(num_players, map_name)
-    game.run()
+    pygame.quit()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,49 @@
+from events import SHOT_FIRED, HIT, DEATH, ALERT, EXIT_REACHED
+
+
+class GameStats:
+    """Per-run gameplay counters, fed in batches from the event bus."""
+
+    def __init__(self):
+        self.shots_fired = 0
+        self.hits = 0
+        self.kills = 0
+        self.player_deaths = 0
+        self.alerts = 0
+        self.exit_reached = False
+
+    def subscribe(self, bus, name="stats"):
+        bus.subscribe(SHOT_FIRED, name, self.on_shots)
+        bus.subscribe(HIT, name, self.on_hits)
+        bus.subscribe(DEATH, name, self.on_deaths)
+        bus.subscribe(ALERT, name, self.on_alerts)
+        bus.subscribe(EXIT_REACHED, name, self.on_exit_reached)
+
+    def on_shots(self, events):
+        self.shots_fired += len(events)
+
+    def on_hits(self, events):
+        self.hits += len(events)
+
+    def on_deaths(self, events):
+        for victim, kind, cause in events:
+            if kind == "player":
+                self.player_deaths += 1
+            elif cause == "shot":
+                self.kills += 1
+
+    def on_alerts(self, events):
+        self.alerts += len(events)
+
+    def on_exit_reached(self, events):
+        self.exit_reached = True
+
+    def as_dict(self):
+        return {
+            "shots_fired": self.shots_fired,
+            "hits": self.hits,
+            "kills": self.kills,
+            "player_deaths": self.player_deaths,
+            "alerts": self.alerts,
+            "exit_reached": self.exit_reached,
+        }
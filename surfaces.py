@@ -0,0 +1,67 @@
+import pygame
+
+# Shared surfaces by key; see cached()
+_cache = {}
+
+
+def _display_format():
+    """Pixel format of the current display, or None when there isn't one."""
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    return display.get_bitsize(), display.get_masks()
+
+
+def convert(surface, alpha=False):
+    """
+    Convert a surface to the display's pixel format so blits take SDL's
+    fast path. Returned unchanged when no display mode has been set, which
+    keeps headless use working.
+    """
+    if pygame.display.get_surface() is None:
+        return surface
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def blank(size):
+    """New display-format surface of the given size."""
+    return convert(pygame.Surface(size))
+
+
+def cached(key, build, alpha=False):
+    """
+    Surface shared by every caller using the same key.
+
+    build() is only called the first time a key is seen (per display format)
+    and must return a surface; the result is converted and reused. Callers
+    must treat shared surfaces as read-only.
+    """
+    full_key = (key, _display_format())
+    surface = _cache.get(full_key)
+    if surface is None:
+        surface = convert(build(), alpha)
+        _cache[full_key] = surface
+    return surface
+
+
+def solid(size, color):
+    """Shared surface of the given size filled with one colour."""
+    size = tuple(size)
+    color = tuple(color)
+
+    def build():
+        surface = pygame.Surface(size)
+        surface.fill(color)
+        return surface
+
+    return cached(("solid", size, color), build)
+
+
+def unique_count():
+    """Number of distinct shared surfaces currently cached."""
+    return len(_cache)
+
+
+def clear():
+    """Drop every shared surface."""
+    _cache.clear()
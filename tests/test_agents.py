@@ -0,0 +1,46 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from game import Game
+from agents import AGENTS, RandomAgent
+from controls import KeyState
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def game(pygame_init):
+    with patch('random.choice', return_value=100):
+        with patch('random.randint', return_value=60):
+            return Game(num_players=2, headless=True)
+
+
+class TestAgents:
+    @pytest.mark.parametrize("name", sorted(AGENTS))
+    def test_one_action_per_player(self, game, name):
+        agent = AGENTS[name](seed=1)
+        for _ in range(3):
+            actions = agent(game)
+            assert len(actions) == 2
+            for keys, shoot in actions:
+                assert isinstance(keys, KeyState)
+                assert isinstance(shoot, bool)
+            game.update(0.02, [keys for keys, _ in actions])
+
+    def test_random_agent_is_seeded(self, game):
+        first = [RandomAgent(seed=5)(game) for _ in range(3)]
+        second = [RandomAgent(seed=5)(game) for _ in range(3)]
+        assert first == second
+
+    def test_random_agent_leaves_global_random_alone(self, game):
+        import random
+        random.seed(3)
+        expected = random.random()
+        random.seed(3)
+        RandomAgent(seed=1)(game)
+        assert random.random() == expected
@@ -0,0 +1,61 @@
+import pytest
+import pygame
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import atlas
+from config import PLAYER_SPRITE_SIZE
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    pygame.display.set_mode((800, 600))  # Frames are converted to display format
+    yield
+    pygame.quit()
+
+
+class TestPlayerAtlas:
+    def test_layout_has_flipped_twin_for_each_animation(self):
+        layout = atlas.player_layout()
+        for name, count in atlas.PLAYER_ANIMATIONS:
+            assert len(layout[name]) == count
+            assert len(layout[name + "_flipped"]) == count
+
+    def test_layout_rects_fit_atlas_without_overlap(self):
+        bounds = pygame.Rect((0, 0), atlas.player_atlas_size())
+        rects = [rect for rects in atlas.player_layout().values() for rect in rects]
+        for i, rect in enumerate(rects):
+            assert rect.size == PLAYER_SPRITE_SIZE
+            assert bounds.contains(rect)
+            assert rect.collidelist(rects[i + 1:]) == -1
+
+    def test_flipped_frame_mirrors_frame(self, pygame_init):
+        built = atlas.Atlas(atlas.build_player_atlas(), atlas.player_layout())
+        frame = built.frame("run", 3)
+        flipped = built.frame("run_flipped", 3)
+        mirrored = pygame.transform.flip(frame, True, False)
+        assert pygame.image.tostring(mirrored, "RGBA") == pygame.image.tostring(flipped, "RGBA")
+
+    def test_players_share_atlas(self, pygame_init):
+        first = atlas.load_player_atlas()
+        assert atlas.load_player_atlas() is first
+        assert first.frame("idle").get_parent() is first.surface
+
+
+class TestSpriteSheet:
+    def test_frames_sliced_with_black_keyed_out(self, pygame_init):
+        from spritesheet import SpriteSheet
+
+        image = pygame.Surface((64, 32), pygame.SRCALPHA)
+        image.fill((255, 0, 0, 255), (32, 0, 32, 32))
+        sheet = SpriteSheet(image)
+        empty, red = sheet.getimage(0, 0, 32, 32), sheet.getimage(32, 0, 32, 32)
+
+        assert red.get_size() == (32, 32)
+        assert red.get_at((5, 5))[:3] == (255, 0, 0)
+        assert empty.get_colorkey()[:3] == (0, 0, 0)
+        assert empty.get_at((5, 5))[:3] == (0, 0, 0)
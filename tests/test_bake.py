@@ -0,0 +1,73 @@
+import json
+import pytest
+import pygame
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import bake
+import surfaces
+import atlas
+from ladder import Ladder
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    pygame.display.set_mode((800, 600))  # Baking converts to display format
+    surfaces.clear()
+    yield
+    surfaces.clear()
+    pygame.quit()
+
+
+def pixels(surface):
+    return pygame.image.tostring(surface, "RGBA")
+
+
+class TestBake:
+    def test_key_is_stable(self):
+        assert bake.bundle_key() == bake.bundle_key()
+
+    def test_key_changes_with_parameters(self, monkeypatch):
+        key = bake.bundle_key()
+        monkeypatch.setattr(bake, "PLAYER_SPRITE_SIZE", (90, 120))
+        assert bake.bundle_key() != key
+
+    def test_bake_writes_bundle(self, pygame_init, tmp_path):
+        assert bake.bake(str(tmp_path)) is True
+
+        manifest = bake.read_manifest(str(tmp_path))
+        assert manifest["key"] == bake.bundle_key()
+        assert (tmp_path / bake.PLAYER_ATLAS_FILE).exists()
+        for width, height in manifest["ladders"]:
+            assert (tmp_path / f"ladder_{width}x{height}.png").exists()
+
+    def test_bake_skips_current_bundle(self, pygame_init, tmp_path):
+        bake.bake(str(tmp_path))
+        assert bake.bake(str(tmp_path)) is False
+        assert bake.bake(str(tmp_path), force=True) is True
+
+    def test_load_bundle_installs_baked_images(self, pygame_init, tmp_path):
+        bake.bake(str(tmp_path))
+        assert bake.load_bundle(str(tmp_path)) is True
+
+        width, height = bake.ladder_sizes()[0]
+        ladder = Ladder(0, 0, width, height)
+        assert pixels(ladder.image) == pixels(Ladder.build_image(width, height))
+        assert pixels(atlas.load_player_atlas().surface) == pixels(atlas.build_player_atlas())
+
+    def test_stale_bundle_is_ignored(self, pygame_init, tmp_path):
+        bake.bake(str(tmp_path))
+        manifest_path = tmp_path / bake.MANIFEST_NAME
+        manifest = json.loads(manifest_path.read_text())
+        manifest["key"] = "stale"
+        manifest_path.write_text(json.dumps(manifest))
+
+        assert bake.load_bundle(str(tmp_path)) is False
+        assert surfaces.unique_count() == 0
+
+    def test_missing_bundle_is_ignored(self, pygame_init, tmp_path):
+        assert bake.load_bundle(str(tmp_path / "missing")) is False
@@ -0,0 +1,67 @@
+import pytest
+import pygame
+import batch
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def without_timings(result):
+    return {key: value for key, value in result.items() if key != "timings"}
+
+
+class TestBatch:
+    def test_episode_reports_outcome(self, pygame_init):
+        result = batch.run_episode("test", seed=1, agent="random", max_ticks=50)
+
+        assert result["outcome"] in ("victory", "death", "timeout")
+        assert result["ticks"] <= 50
+        assert result["time"] == pytest.approx(result["ticks"] * 0.02)
+        assert set(result["timings"]) == {"setup", "agent", "simulate", "total"}
+        assert result["max_height"] >= 0
+
+    def test_idle_agent_times_out(self, pygame_init):
+        result = batch.run_episode("test", seed=1, agent="idle", max_ticks=20)
+        assert result["outcome"] == "timeout"
+        assert result["ticks"] == 20
+        assert result["death_height"] is None
+
+    def test_episode_is_deterministic_for_seed(self, pygame_init):
+        first = batch.run_episode("level_1", seed=7, agent="climber", max_ticks=200)
+        second = batch.run_episode("level_1", seed=7, agent="climber", max_ticks=200)
+        assert without_timings(first) == without_timings(second)
+
+    def test_make_tasks_cycles_maps_with_new_seeds(self):
+        tasks = list(batch.make_tasks(3, ["test", "level_1"], "idle", seed=10, max_ticks=5))
+        assert [task["map_name"] for task in tasks] == ["test", "level_1", "test"]
+        assert [task["seed"] for task in tasks] == [10, 11, 12]
+        assert all(task["max_ticks"] == 5 for task in tasks)
+
+    def test_run_batch_in_process(self, pygame_init):
+        tasks = batch.make_tasks(2, ["test"], "idle", max_ticks=5)
+        results = list(batch.run_batch(tasks, workers=1))
+        assert sorted(result["seed"] for result in results) == [0, 1]
+
+    def test_run_batch_over_pool(self):
+        tasks = batch.make_tasks(3, ["test"], "random", max_ticks=20)
+        results = list(batch.run_batch(tasks, workers=2, chunksize=1))
+        assert sorted(result["seed"] for result in results) == [0, 1, 2]
+
+    def test_summary_totals(self):
+        summary = batch.BatchSummary()
+        summary.add({"outcome": "death", "kills": 2, "ticks": 10, "max_height": 100,
+                     "timings": {"simulate": 1.0}})
+        summary.add({"outcome": "victory", "kills": 0, "ticks": 30, "max_height": 300,
+                     "timings": {"simulate": 2.0}})
+
+        report = summary.as_dict()
+        assert report["episodes"] == 2
+        assert report["outcomes"]["victory"] == 1
+        assert report["win_rate"] == 0.5
+        assert report["mean_height"] == 200
+        assert report["max_height"] == 300
+        assert report["timings"]["simulate"] == 3.0
@@ -0,0 +1,100 @@
+import pytest
+import pygame
+import sys
+import os
+from unittest.mock import MagicMock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from blit_batch import BlitBatch
+from config import RED, BLACK
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def image(pygame_init):
+    surface = pygame.Surface((10, 10))
+    surface.fill(RED)
+    return surface
+
+
+class TestBlitBatch:
+    def test_add_and_iterate(self, image):
+        batch = BlitBatch()
+        batch.add(image, 5, 15)
+
+        pairs = list(batch)
+        assert len(batch) == 1
+        assert pairs[0][0] is image
+        assert pairs[0][1].topleft == (5, 15)
+
+    def test_clear_empties_batch(self, image):
+        batch = BlitBatch()
+        batch.add(image, 0, 0)
+        batch.clear()
+
+        assert len(batch) == 0
+        assert list(batch) == []
+
+    def test_destination_rects_reused_between_frames(self, image):
+        batch = BlitBatch()
+        batch.add(image, 0, 0)
+        first_dest = list(batch)[0][1]
+
+        batch.clear()
+        batch.add(image, 30, 40)
+        second_dest = list(batch)[0][1]
+
+        assert first_dest is second_dest
+        assert second_dest.topleft == (30, 40)
+
+    def test_draw_uses_single_blits_call(self, image):
+        batch = BlitBatch()
+        for i in range(5):
+            batch.add(image, i * 20, 0)
+        surface = MagicMock()
+
+        batch.draw(surface)
+
+        assert surface.blits.call_count == 1
+        assert surface.blit.call_count == 0
+
+    def test_draw_paints_surface(self, image):
+        batch = BlitBatch()
+        batch.add(image, 20, 30)
+        surface = pygame.Surface((100, 100))
+        surface.fill(BLACK)
+
+        batch.draw(surface)
+
+        assert surface.get_at((25, 35))[:3] == RED
+        assert surface.get_at((5, 5))[:3] == BLACK
+
+    def test_draw_returns_affected_rects(self, image):
+        batch = BlitBatch()
+        batch.add(image, 20, 30)
+        surface = pygame.Surface((100, 100))
+
+        rects = batch.draw(surface, True)
+
+        assert rects == [pygame.Rect(20, 30, 10, 10)]
+
+    def test_draw_empty_batch(self, pygame_init):
+        batch = BlitBatch()
+        surface = MagicMock()
+
+        assert batch.draw(surface, True) == []
+        assert surface.blits.call_count == 0
+
+    def test_dest_rects_have_image_size(self, image):
+        batch = BlitBatch()
+        batch.add(image, 20, 30)
+
+        assert batch.dest_rects() == [pygame.Rect(20, 30, 10, 10)]
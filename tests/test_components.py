@@ -0,0 +1,131 @@
+import pytest
+import pygame
+import gc
+import sys
+import os
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from components import (
+    ComponentStore,
+    KIND_ENEMY,
+    KIND_MACHINEGUNNER,
+    KIND_PLAYER,
+)
+from enemy import Enemy
+from machinegunner import Machinegunner
+from config import ENEMY_SPEED
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def store():
+    return ComponentStore(capacity=4)
+
+
+class TestComponentStore:
+    def test_allocate_returns_sequential_ids(self, store):
+        assert store.allocate(KIND_ENEMY) == 0
+        assert store.allocate(KIND_ENEMY) == 1
+        assert len(store) == 2
+
+    def test_released_slot_is_reused(self, store):
+        first = store.allocate(KIND_ENEMY)
+        store.allocate(KIND_ENEMY)
+        store.release(first)
+
+        assert len(store) == 1
+        assert store.allocate(KIND_PLAYER) == first
+
+    def test_reused_slot_is_zeroed(self, store):
+        eid = store.allocate(KIND_ENEMY)
+        store.columns["x"][eid] = 42.0
+        store.release(eid)
+
+        eid = store.allocate(KIND_ENEMY)
+        assert store.columns["x"][eid] == 0.0
+
+    def test_store_grows_past_capacity(self, store):
+        ids = [store.allocate(KIND_ENEMY) for _ in range(10)]
+        store.columns["y"][ids[0]] = 5.0
+
+        assert store.capacity >= 10
+        assert len(store) == 10
+        assert store.columns["y"][ids[0]] == 5.0
+
+    def test_view_shares_memory_with_column(self, store):
+        eid = store.allocate(KIND_ENEMY)
+        store.view("vel_y")[eid] = 12.5
+
+        assert store.columns["vel_y"][eid] == 12.5
+
+    def test_view_valid_after_growth(self, store):
+        store.allocate(KIND_ENEMY)
+        store.view("x")
+        for _ in range(10):
+            store.allocate(KIND_ENEMY)
+
+        assert len(store.view("x")) == 11
+
+    def test_select_filters_by_kind_and_liveness(self, store):
+        enemy = store.allocate(KIND_ENEMY)
+        gunner = store.allocate(KIND_MACHINEGUNNER)
+        dead = store.allocate(KIND_ENEMY)
+        store.release(dead)
+
+        assert list(store.select(KIND_ENEMY)) == [enemy]
+        assert list(store.select(KIND_MACHINEGUNNER)) == [gunner]
+
+
+class TestActorViews:
+    def test_enemy_state_lives_in_store(self, pygame_init, store):
+        with patch('random.choice', return_value=ENEMY_SPEED):
+            enemy = Enemy(100, 200, store)
+
+        assert store.columns["x"][enemy.eid] == 100.0
+        assert store.columns["vel_x"][enemy.eid] == ENEMY_SPEED
+        assert store.columns["width"][enemy.eid] == 30
+        assert store.kind[enemy.eid] == KIND_ENEMY
+
+    def test_attribute_writes_go_to_store(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        mg.vel_y = 250
+        mg.in_cooldown = True
+
+        assert store.columns["vel_y"][mg.eid] == 250.0
+        assert store.columns["in_cooldown"][mg.eid] == 1
+        assert mg.in_cooldown is True
+
+    def test_alert_state_round_trips_through_code(self, pygame_init, store):
+        with patch('random.choice', return_value=ENEMY_SPEED):
+            enemy = Enemy(100, 100, store)
+
+        assert enemy.alert_state == "PATROL"
+        enemy.alert_state = "COOLDOWN"
+        assert enemy.alert_state == "COOLDOWN"
+        assert store.columns["alert_state"][enemy.eid] == 2
+
+    def test_system_updates_visible_through_views(self, pygame_init, store):
+        gunners = [Machinegunner(64 * i, 0, store) for i in range(3)]
+
+        eids = store.select(KIND_MACHINEGUNNER)
+        store.view("vel_y")[eids] += 100.0
+
+        assert all(mg.vel_y == 100.0 for mg in gunners)
+
+    def test_slot_released_when_actor_collected(self, pygame_init, store):
+        mg = Machinegunner(0, 0, store)
+        assert len(store) == 1
+
+        del mg
+        gc.collect()
+
+        assert len(store) == 0
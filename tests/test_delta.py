@@ -0,0 +1,112 @@
+import random
+import pytest
+import pygame
+from game import Game
+from projectile import Projectile
+from delta import (BitWriter, BitReader, DeltaEncoder, DeltaDecoder, encode_level,
+                   decode_level, measure)
+from unittest.mock import patch
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_game(num_players=1, map_name="test"):
+    with patch('random.choice', return_value=100):
+        with patch('random.randint', return_value=60):
+            return Game(num_players=num_players, map_name=map_name, headless=True)
+
+
+def visible_state(game):
+    return (
+        game.camera_y,
+        game.game_over,
+        [(p.rect.topleft, p.facing_right, p.alive) for p in game.players],
+        [(e.rect.topleft, e.alert_state) for e in game.enemies],
+        [m.rect.topleft for m in game.machinegunners],
+        sorted((p.rect.topleft, p.direction, p.owner_type) for p in game.projectiles),
+        game.stats.kills,
+    )
+
+
+class TestBits:
+    def test_round_trip(self):
+        writer = BitWriter()
+        writer.write(5, 3)
+        for value in (0, 1, -1, 7, -8, 300, -70000):
+            writer.write_signed(value)
+        writer.write(1, 1)
+        reader = BitReader(writer.getvalue())
+
+        assert reader.read(3) == 5
+        assert [reader.read_signed() for _ in range(7)] == [0, 1, -1, 7, -8, 300, -70000]
+        assert reader.read(1) == 1
+
+    def test_small_deltas_are_small(self):
+        writer = BitWriter()
+        writer.write_signed(3)
+
+        assert len(writer.getvalue()) == 1
+
+
+class TestLevel:
+    def test_level_round_trip(self, pygame_init):
+        game = make_game()
+        map_name, tile_size, rows = decode_level(encode_level(game))
+
+        assert map_name == "test"
+        assert tile_size == 64
+        assert rows == list(game.map_data)
+
+
+class TestDeltas:
+    def test_client_mirrors_server(self, pygame_init):
+        server = make_game(map_name="level_1")
+        client = make_game(map_name="level_1")
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        player = server.roster["players"][0]
+        random.seed(4)
+
+        for tick in range(90):
+            if tick % 15 == 0:
+                server.player_shoot(player)
+            server.update(1 / 60)
+            assert decoder.apply(client, encoder.encode(server, tick)) == tick
+            assert visible_state(client) == visible_state(server)
+
+    def test_unchanged_tick_is_tiny(self, pygame_init):
+        game = make_game()
+        encoder = DeltaEncoder()
+        first = encoder.encode(game, 0)
+        second = encoder.encode(game, 1)
+
+        assert len(second) < 12
+        assert len(second) < len(first)
+
+    def test_membership_and_projectile_removal(self, pygame_init):
+        server = make_game()
+        client = make_game()
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+        projectile = Projectile(200, 200, 1, (255, 255, 0), "player")
+        server.projectiles.add(projectile)
+        decoder.apply(client, encoder.encode(server, 0))
+        assert len(client.projectiles) == 1
+
+        list(server.enemies)[0].kill()
+        projectile.kill()
+        decoder.apply(client, encoder.encode(server, 1))
+
+        assert len(client.projectiles) == 0
+        assert len(client.enemies) == len(server.enemies)
+
+    def test_measure_reports_sizes(self, pygame_init):
+        report = measure("test", ticks=30)
+
+        assert report["ticks"] == 30
+        assert report["delta_mean"] < report["snapshot_mean"]
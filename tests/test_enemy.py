@@ -589,6 +589,23 @@ class TestEnemy:
             can_see = enemy._raycast_to_player(player, platforms, obstacles)
             assert can_see is True
 
+    def test_update_returns_player_that_alerted_it(self, pygame_init):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 100)
+        enemy.on_ground = True
+        enemy.raycast_timer = enemy.raycast_interval
+
+        class MockPlayer:
+            alive = True
+            rect = pygame.Rect(300, 100, 30, 30)
+
+        player = MockPlayer()
+
+        assert enemy.update([], [], [player], 0, 0.02) is player
+        # Already alert: seeing the player again doesn't alert it anew
+        enemy.raycast_timer = enemy.raycast_interval
+        assert enemy.update([], [], [player], 0, 0.02) is None
+
     def test_enemy_raycast_blocked_by_platform(self, pygame_init):
         with patch('random.choice', return_value=ENEMY_SPEED):
             enemy = Enemy(100, 100)
@@ -916,3 +933,39 @@ class TestEnemy:
             # Projectile should go left
             projectile = list(projectiles)[0]
             assert projectile.direction == -1
+
+    # ========== Sleep Tests ==========
+
+    def test_idle_enemy_sleeps_after_landing(self, pygame_init):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 100)
+        platforms = [Platform(50, 200, 200, 20)]
+
+        for _ in range(100):
+            enemy.update(platforms, [], [], 0, 0.02)
+            if enemy.on_ground:
+                break
+
+        assert enemy.sleeping is True
+
+    def test_patrolling_enemy_does_not_sleep(self, pygame_init):
+        with patch('random.choice', return_value=ENEMY_SPEED):
+            enemy = Enemy(100, 100)
+        platforms = [Platform(0, 200, 1280, 20)]
+
+        for _ in range(100):
+            enemy.update(platforms, [], [], 0, 0.02)
+
+        assert enemy.sleeping is False
+
+    def test_sleeping_enemy_wakes_when_it_moves(self, pygame_init):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 100)
+        enemy.sleeping = True
+        enemy.on_ground = True
+        enemy.vel_x = ENEMY_SPEED
+
+        enemy.update([], [], [], 0, 0.02)
+
+        assert enemy.sleeping is False
+        assert enemy.vel_y > 0
@@ -0,0 +1,108 @@
+import pytest
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from events import EventBus, SHOT_FIRED, HIT, DEATH, ALERT, EXIT_REACHED
+
+
+@pytest.fixture
+def bus():
+    return EventBus()
+
+
+class TestEventBus:
+    def test_events_delivered_in_one_batch(self, bus):
+        received = []
+        bus.subscribe(SHOT_FIRED, "test", lambda events: received.append(list(events)))
+
+        bus.publish(SHOT_FIRED, "p1", 10, 20)
+        bus.publish(SHOT_FIRED, "p2", 30, 40)
+        bus.drain()
+
+        assert received == [[("p1", 10, 20), ("p2", 30, 40)]]
+
+    def test_queue_empty_after_drain(self, bus):
+        bus.subscribe(HIT, "test", lambda events: None)
+        bus.publish(HIT, "projectile", "enemy")
+        assert bus.pending(HIT) == 1
+
+        bus.drain()
+
+        assert bus.pending(HIT) == 0
+
+    def test_handler_not_called_without_events(self, bus):
+        calls = []
+        bus.subscribe(DEATH, "test", lambda events: calls.append(1))
+
+        bus.drain()
+
+        assert calls == []
+
+    def test_drain_of_some_types_leaves_the_rest_queued(self, bus):
+        shots = []
+        bus.subscribe(SHOT_FIRED, "test", lambda events: shots.extend(events))
+        bus.subscribe(HIT, "test", lambda events: None)
+        bus.publish(SHOT_FIRED, "p1", 0, 0)
+        bus.publish(HIT, "projectile", "enemy")
+
+        bus.drain((SHOT_FIRED,))
+
+        assert shots == [("p1", 0, 0)]
+        assert bus.pending(HIT) == 1
+
+    def test_events_without_subscribers_are_dropped(self, bus):
+        bus.publish(EXIT_REACHED, "player")
+        assert bus.pending(EXIT_REACHED) == 0
+
+    def test_disabled_consumer_not_called(self, bus):
+        calls = []
+        bus.subscribe(SHOT_FIRED, "hud", lambda events: calls.append(len(events)))
+        bus.set_enabled("hud", False)
+
+        bus.publish(SHOT_FIRED, "p1", 0, 0)
+        bus.drain()
+
+        assert calls == []
+        assert bus.is_enabled("hud") is False
+
+    def test_disabling_one_consumer_keeps_others(self, bus):
+        stats_calls = []
+        hud_calls = []
+        bus.subscribe(DEATH, "stats", lambda events: stats_calls.append(len(events)))
+        bus.subscribe(DEATH, "hud", lambda events: hud_calls.append(len(events)))
+        bus.set_enabled("hud", False)
+
+        bus.publish(DEATH, "enemy", "enemy", "shot")
+        bus.drain()
+
+        assert stats_calls == [1]
+        assert hud_calls == []
+
+    def test_reenabled_consumer_receives_events(self, bus):
+        calls = []
+        bus.subscribe(ALERT, "alerts", lambda events: calls.append(len(events)))
+        bus.set_enabled("alerts", False)
+        bus.set_enabled("alerts", True)
+
+        bus.publish(ALERT, "enemy", "player")
+        bus.drain()
+
+        assert calls == [1]
+
+    def test_follow_up_events_drained_same_tick(self, bus):
+        alerts = []
+
+        def on_shots(events):
+            for shooter, x, y in events:
+                bus.publish(ALERT, "enemy", shooter)
+
+        bus.subscribe(SHOT_FIRED, "alerts", on_shots)
+        bus.subscribe(ALERT, "stats", lambda events: alerts.extend(events))
+
+        bus.publish(SHOT_FIRED, "p1", 0, 0)
+        bus.drain()
+
+        assert alerts == [("enemy", "p1")]
@@ -233,6 +233,67 @@ class TestGame:
 
                 assert game.game_over is False
 
+    def test_restart_does_not_rebuild_display(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                game.game_over = True
+                pygame.event.post(pygame.event.Event(pygame.KEYDOWN, {'key': pygame.K_r}))
+
+                with patch('pygame.display.set_mode') as set_mode:
+                    game.handle_events()
+
+                assert set_mode.call_count == 0
+                assert game.game_over is False
+
+    def test_reset_restores_level_start(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                player = list(game.players)[0]
+                enemy = list(game.enemies)[0]
+                start_player = player.rect.copy()
+                start_enemy = (enemy.rect.copy(), enemy.x, enemy.vel_x, enemy.alert_state)
+                start_camera = game.camera_y
+                enemy_count = len(game.enemies)
+
+                player.rect.y -= 300
+                player.y -= 300
+                player.alive = False
+                enemy.rect.x += 50
+                enemy.x += 50
+                enemy.alert_state = "ALERT"
+                enemy.kill()
+                game.camera_y -= 200
+                game.stats.kills = 3
+                game.player_shoot(player)
+                game.game_over = True
+
+                game.reset()
+
+                assert player.rect == start_player
+                assert player.alive is True
+                assert len(game.enemies) == enemy_count
+                assert enemy in game.all_sprites
+                assert (enemy.rect, enemy.x, enemy.vel_x, enemy.alert_state) == start_enemy
+                assert game.camera_y == start_camera
+                assert len(game.projectiles) == 0
+                assert game.stats.kills == 0
+                assert game.game_over is False
+
+    def test_reset_can_be_repeated(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                enemy = list(game.enemies)[0]
+                start = enemy.rect.copy()
+
+                for _ in range(2):
+                    for _ in range(20):
+                        game.update(0.02)
+                    game.reset()
+                    assert enemy.rect == start
+
     def test_handle_events_quit_on_game_over(self, pygame_init):
         with patch('random.choice', return_value=100):
             with patch('random.randint', return_value=60):
@@ -480,8 +541,152 @@ class TestGame:
                 # Left enemy should face right (toward player)
                 assert enemy_left.facing_direction == 1
 
+    def test_shot_alerts_enemies_before_they_move(self, pygame_init):
+        from controls import NO_KEYS
+        from enemy import Enemy
+        from config import SCREEN_HEIGHT, ENEMY_SPEED
+
+        with patch('random.choice', return_value=ENEMY_SPEED):
+            game = Game(num_players=1)
+            player = game.roster["players"][0]
+            enemy = Enemy(player.rect.centerx + 300, int(game.camera_y + SCREEN_HEIGHT // 2))
+        game.enemies.add(enemy)
+        start_x = enemy.x
+
+        game.player_shoot(player)
+        game.update(0.02, [NO_KEYS])
+
+        # Alerted on the shot's tick, so it never took a patrol step
+        assert enemy.alert_state == "ALERT"
+        assert enemy.x == start_x
+
+    def test_spotting_alert_names_the_player(self, pygame_init):
+        from controls import NO_KEYS
+        from enemy import Enemy
+        from events import ALERT
+
+        with patch('random.choice', return_value=0):
+            game = Game(num_players=1)
+            player = game.roster["players"][0]
+            enemy = Enemy(player.rect.centerx + 100, player.rect.y)
+        enemy.rect.centery = player.rect.centery
+        enemy.on_ground = True
+        enemy.raycast_timer = enemy.raycast_interval
+        game.enemies.add(enemy)
+        alerts = []
+        game.events.subscribe(ALERT, "test", lambda events: alerts.extend(events))
+
+        game.update(0.02, [NO_KEYS])
+
+        assert (enemy, player) in alerts
+
     # ========== Machinegunner Tests ==========
 
+    def test_alert_faces_closest_of_two_players(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=2)
+
+                from enemy import Enemy
+                from config import SCREEN_HEIGHT
+
+                player1, player2 = list(game.players)
+                player1.rect.centerx = 200
+                player2.rect.centerx = 1000
+
+                screen_mid_y = int(game.camera_y + SCREEN_HEIGHT // 2)
+                enemy_near_p1 = Enemy(400, screen_mid_y)
+                enemy_near_p2 = Enemy(800, screen_mid_y)
+                game.enemies.add(enemy_near_p1, enemy_near_p2)
+
+                game._alert_enemies_to_shot(player1.rect.centerx, player1.rect.centery)
+
+                assert enemy_near_p1.last_seen_player_x == 200
+                assert enemy_near_p1.facing_direction == -1
+                assert enemy_near_p2.last_seen_player_x == 1000
+                assert enemy_near_p2.facing_direction == 1
+
+    def test_alert_index_refreshed_after_update(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                player = list(game.players)[0]
+
+                from enemy import Enemy
+                from config import SCREEN_HEIGHT
+
+                # Build the index while the enemy is far off screen
+                enemy = Enemy(200, int(game.camera_y - SCREEN_HEIGHT - 500))
+                game.enemies.add(enemy)
+                game._alert_enemies_to_shot(player.rect.centerx, player.rect.centery)
+                assert enemy.alert_state == "PATROL"
+
+                game.update(0.02)
+                assert game.enemy_index.stale is True
+
+                # Enemy moved on screen; the next shot sees it
+                enemy.rect.centery = int(game.camera_y + SCREEN_HEIGHT // 2)
+                game._alert_enemies_to_shot(player.rect.centerx, player.rect.centery)
+                assert enemy.alert_state == "ALERT"
+
+    def test_shot_alert_applied_when_events_drained(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                player = list(game.players)[0]
+
+                from enemy import Enemy
+                from config import SCREEN_HEIGHT
+
+                enemy = Enemy(200, int(game.camera_y + SCREEN_HEIGHT // 2))
+                game.enemies.add(enemy)
+
+                game.player_shoot(player)
+                # Alert propagation is deferred to the tick's drain
+                assert enemy.alert_state == "PATROL"
+
+                game.events.drain()
+                assert enemy.alert_state == "ALERT"
+                assert game.stats.shots_fired == 1
+                assert game.stats.alerts >= 1
+
+    def test_alerts_consumer_can_be_disabled(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1)
+                game.events.set_enabled("alerts", False)
+                player = list(game.players)[0]
+
+                from enemy import Enemy
+                from config import SCREEN_HEIGHT
+
+                enemy = Enemy(200, int(game.camera_y + SCREEN_HEIGHT // 2))
+                game.enemies.add(enemy)
+
+                game.player_shoot(player)
+                game.events.drain()
+
+                assert enemy.alert_state == "PATROL"
+                assert game.stats.shots_fired == 1
+
+    def test_stats_record_kill(self, pygame_init):
+        with patch('random.choice', return_value=0):
+            with patch('random.random', return_value=0.999):
+                game = Game(num_players=1)
+                game.obstacles.empty()
+                enemy = list(game.enemies)[0]
+
+                from projectile import Projectile
+                from config import YELLOW
+                game.projectiles.add(Projectile(enemy.rect.centerx, enemy.rect.centery,
+                                                1, YELLOW, 'player'))
+
+                game.update(0.02)
+
+                assert game.stats.kills == 1
+                assert game.stats.hits == 1
+                assert game.hud.counts_dirty is True
+
     def test_game_machinegunners_sprite_group_initialized(self, pygame_init):
         with patch('random.choice', return_value=100):
             with patch('random.randint', return_value=60):
@@ -538,6 +743,124 @@ class TestGame:
                 total_enemies = len(game.enemies) + len(game.machinegunners)
                 assert total_enemies > 0
 
+    # ========== Dirty Rect Rendering Tests ==========
+
+    def test_dirty_mode_first_frame_is_full_flip(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, render_mode="dirty")
+
+                with patch('pygame.display.flip') as flip, \
+                        patch('pygame.display.update') as update:
+                    game.draw()
+
+                assert flip.call_count == 1
+                assert update.call_count == 0
+
+    def test_dirty_mode_still_camera_updates_rects(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, render_mode="dirty")
+                game.draw()
+
+                with patch('pygame.display.flip') as flip, \
+                        patch('pygame.display.update') as update:
+                    game.draw()
+
+                assert flip.call_count == 0
+                assert update.call_count == 1
+                rects = update.call_args[0][0]
+                # Only actor-sized areas are pushed, never the whole screen
+                from config import SCREEN_WIDTH, SCREEN_HEIGHT
+                assert all(r.width * r.height < SCREEN_WIDTH * SCREEN_HEIGHT for r in rects)
+
+    def test_dirty_mode_camera_move_falls_back_to_flip(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, render_mode="dirty")
+                game.draw()
+                game.camera_y -= 10
+
+                with patch('pygame.display.flip') as flip, \
+                        patch('pygame.display.update') as update:
+                    game.draw()
+
+                assert flip.call_count == 1
+                assert update.call_count == 0
+
+    def test_dirty_mode_matches_full_render(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, render_mode="dirty")
+                game.draw()
+
+                # Move an actor without moving the camera
+                enemy = list(game.enemies)[0]
+                enemy.rect.x += 40
+                enemy.rect.y = int(game.camera_y + 300)
+                game.draw()
+                dirty_frame = pygame.image.tostring(game.screen, "RGB")
+
+                game.render_mode = "full"
+                game.screen = pygame.Surface(game.screen.get_size())
+                game.draw()
+                full_frame = pygame.image.tostring(game.screen, "RGB")
+
+                assert dirty_frame == full_frame
+
+    def test_static_layers_only_queue_visible_platforms(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, map_name='level_1')
+                game.draw()
+
+                from config import SCREEN_HEIGHT
+                visible = [
+                    p for p in game.platforms
+                    if -50 < p.rect.y - game.camera_y < SCREEN_HEIGHT + 50
+                ]
+                assert len(game._layers["platforms"]) == len(visible)
+                assert len(visible) < len(game.platforms)
+
+    def test_static_index_rebuilt_when_group_changes(self, pygame_init):
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, map_name='test')
+                game.draw()
+                assert len(game._static_index["obstacles"]) == len(game.obstacles)
+
+                game.obstacles.empty()
+                game.draw()
+
+                assert len(game._static_index["obstacles"]) == 0
+                assert len(game._layers["obstacles"]) == 0
+
+    def test_headless_game_opens_no_window(self, pygame_init):
+        pygame.display.quit()
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=1, headless=True)
+                for _ in range(5):
+                    game.update(0.02)
+                game.draw()
+
+        assert pygame.display.get_surface() is None
+
+    def test_headless_players_follow_inputs(self, pygame_init):
+        from controls import KeyState, NO_KEYS
+        with patch('random.choice', return_value=100):
+            with patch('random.randint', return_value=60):
+                game = Game(num_players=2, headless=True)
+                first, second = game.roster["players"]
+                start = (first.rect.x, second.rect.x)
+
+                right = KeyState([second.controls["right"]])
+                for _ in range(10):
+                    game.update(0.02, [NO_KEYS, right])
+
+                assert first.rect.x == start[0]
+                assert second.rect.x > start[1]
+
     # ========== Ladder Visibility Tests ==========
 
     def test_ladder_visibility_when_fully_on_screen(self, pygame_init):
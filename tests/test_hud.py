@@ -0,0 +1,54 @@
+import pytest
+import pygame
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from hud import Hud
+from events import EventBus, DEATH
+from config import WHITE, RED
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class TestHud:
+    def test_render_returns_surface(self, pygame_init):
+        hud = Hud()
+        surface = hud.render("height", "Height: 0", WHITE)
+        assert isinstance(surface, pygame.Surface)
+
+    def test_render_reuses_surface_for_same_text(self, pygame_init):
+        hud = Hud()
+        first = hud.render("height", "Height: 0", WHITE)
+        second = hud.render("height", "Height: 0", WHITE)
+        assert first is second
+
+    def test_render_updates_when_text_changes(self, pygame_init):
+        hud = Hud()
+        first = hud.render("height", "Height: 0", WHITE)
+        second = hud.render("height", "Height: 64", WHITE)
+        assert first is not second
+
+    def test_render_updates_when_color_changes(self, pygame_init):
+        hud = Hud()
+        first = hud.render("status", "GAME OVER!", WHITE)
+        second = hud.render("status", "GAME OVER!", RED)
+        assert first is not second
+
+    def test_death_events_mark_counts_dirty(self, pygame_init):
+        hud = Hud()
+        bus = EventBus()
+        hud.subscribe(bus)
+        hud.counts_dirty = False
+
+        bus.publish(DEATH, "enemy", "enemy", "shot")
+        bus.drain()
+
+        assert hud.counts_dirty is True
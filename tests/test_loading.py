@@ -0,0 +1,93 @@
+import pytest
+import pygame
+from unittest.mock import patch
+from config import SCREEN_WIDTH, SCREEN_HEIGHT
+from loading import LevelLoader, LoadingScreen, load_game, BAR_WIDTH
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class TestLevelLoader:
+    def test_loads_headless_game(self, pygame_init):
+        loader = LevelLoader(2, "level_1").start()
+        game = loader.result()
+
+        assert loader.done
+        assert loader.progress == (1.0, "ready")
+        assert game.headless
+        assert game.map_name == "level_1"
+        assert len(game.players) == 2
+
+    def test_not_done_before_start(self):
+        assert not LevelLoader().done
+
+    def test_error_raised_from_result(self, pygame_init):
+        with patch('game.Game.setup_level', side_effect=RuntimeError("bad map")):
+            loader = LevelLoader().start()
+            with pytest.raises(RuntimeError, match="bad map"):
+                loader.result()
+
+    def test_progress_phases_in_order(self, pygame_init):
+        phases = []
+        from game import Game
+        Game(headless=True, progress=lambda fraction, phase: phases.append(fraction))
+
+        assert phases == sorted(phases)
+        assert phases[0] == 0.0 and phases[-1] == 1.0
+
+    def test_progress_reported_while_level_builds(self, pygame_init):
+        phases = []
+        from game import Game
+        Game(headless=True, map_name="level_2",
+             progress=lambda fraction, phase: phases.append(phase))
+
+        assert "sprites" in phases
+        assert phases.index("platforms") < phases.index("ladders") < phases.index("players")
+
+    def test_map_without_sprites_loads(self, pygame_init, monkeypatch):
+        from maps import ALL_MAPS
+        monkeypatch.setitem(ALL_MAPS, "markers_only", ["X  ", "   ", " P "])
+        game = LevelLoader(1, "markers_only").start().result()
+
+        assert len(game.platforms) == 0
+        assert game.exit_sprite is not None
+
+
+class TestLoadGame:
+    def test_game_attached_to_display(self, pygame_init):
+        screen = pygame.display.set_mode((800, 600))
+        game = load_game(1, "test", screen)
+
+        assert not game.headless
+        assert game.screen is screen
+        game.draw()
+
+    def test_dirty_background_rendered_while_loading(self, pygame_init):
+        screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        game = load_game(1, "level_1", screen, render_mode="dirty")
+
+        with patch.object(game, "_draw_static_layers") as draw_static:
+            game.draw()
+
+        assert not draw_static.called
+        assert game._background.get_bitsize() == screen.get_bitsize()
+
+    def test_window_closed_while_loading(self, pygame_init):
+        screen = pygame.display.set_mode((800, 600))
+        pygame.event.post(pygame.event.Event(pygame.QUIT))
+        with patch('loading.LevelLoader.done', new_callable=lambda: property(lambda self: False)):
+            assert load_game(1, "test", screen) is None
+
+    def test_loading_screen_draws_progress(self, pygame_init):
+        screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        LoadingScreen(screen).draw(0.5, "level")
+        left = (SCREEN_WIDTH - BAR_WIDTH) // 2
+        middle = SCREEN_HEIGHT // 2
+
+        assert screen.get_at((left + BAR_WIDTH // 4, middle)) != (0, 0, 0, 255)
+        assert screen.get_at((left + BAR_WIDTH * 3 // 4, middle)) == (0, 0, 0, 255)
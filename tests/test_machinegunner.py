@@ -274,3 +274,44 @@ class TestMachinegunner:
             assert mg.facing_direction == 1
         else:
             assert mg.facing_direction == -1
+
+    def test_machinegunner_sleeps_after_landing(self, pygame_init):
+        mg = Machinegunner(100, 100)
+        platforms = [Platform(90, 200, 100, 20)]
+
+        for _ in range(100):
+            mg.update(platforms, [], [], 0, 0.02)
+            if mg.on_ground:
+                break
+
+        assert mg.sleeping is True
+
+    def test_sleeping_machinegunner_skips_physics(self, pygame_init):
+        mg = Machinegunner(100, 100)
+        platforms = [Platform(90, 200, 100, 20)]
+        for _ in range(100):
+            mg.update(platforms, [], [], 0, 0.02)
+            if mg.on_ground:
+                break
+        y = mg.y
+
+        # Platform removed, but a sleeper doesn't scan for it
+        mg.update([], [], [], 0, 0.02)
+        assert mg.y == y
+        assert mg.on_ground is True
+
+        mg.wake()
+        mg.update([], [], [], 0, 0.02)
+        assert mg.y > y
+
+    def test_sleeping_machinegunner_still_tracks_and_fires(self, pygame_init):
+        mg = Machinegunner(100, 100)
+        mg.sleeping = True
+        mg.on_ground = True
+
+        mg.update([], [], [MockPlayer(20, 100)], 0, 0.02)
+        assert mg.facing_direction == -1
+
+        projectiles = pygame.sprite.Group()
+        mg.try_shoot(projectiles, 0.3)
+        assert len(projectiles) == 1
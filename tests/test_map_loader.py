@@ -1,6 +1,8 @@
 import pytest
 import pygame
-from map_loader import MapLoader
+import map_loader as map_loader_module
+from map_loader import MapLoader, MAX_COMPILED_LEVELS, clear_compiled
+from maps import ALL_MAPS, load_map_file
 from platforms import Platform
 from enemy import Enemy
 from obstacles import Obstacle
@@ -175,6 +177,18 @@ class TestMapLoader:
 
         assert len(result['ladders']) == 2
 
+    def test_create_sprites_reports_progress(self, map_loader):
+        # Separate platforms, so each one is its own sprite
+        row = "- " * 20
+        map_objects = map_loader.load_map([row, row])
+        reports = []
+
+        map_loader.create_sprites(map_objects, progress=lambda done, total: reports.append((done, total)))
+
+        assert len(reports) > 1
+        assert reports[-1] == (40, 40)
+        assert [done for done, _ in reports] == sorted(done for done, _ in reports)
+
     def test_create_sprites(self, map_loader):
         simple_map = [
             "X   ",
@@ -221,3 +235,76 @@ class TestMapLoader:
 
         # With tile_size=20, two tiles should be 40px wide, height = tile_size // 2
         assert result['platforms'][0] == (0, 0, 40, 10)
+
+    def test_tile_grid_codes(self, map_loader):
+        from map_loader import (TILE_EMPTY, TILE_PLATFORM, TILE_OBSTACLE,
+                                TILE_LADDER, TILE_EXIT)
+        grid = map_loader.tile_grid([
+            "X E",
+            "-HO",
+            "P",
+        ])
+
+        assert grid.shape == (3, 3)
+        assert grid.tolist() == [
+            [TILE_EXIT, TILE_EMPTY, TILE_EMPTY],
+            [TILE_PLATFORM, TILE_LADDER, TILE_OBSTACLE],
+            [TILE_EMPTY, TILE_EMPTY, TILE_EMPTY],
+        ]
+
+
+class TestCompile:
+    def test_compile_cached(self):
+        loader = MapLoader(tile_size=64)
+        first = loader.compile(ALL_MAPS["test"])
+        second = MapLoader(tile_size=64).compile(ALL_MAPS["test"])
+
+        assert first is second
+        assert isinstance(first[0]["platforms"], tuple)
+        assert MapLoader(tile_size=32).compile(ALL_MAPS["test"]) is not first
+
+    def test_cache_bounded(self):
+        loader = MapLoader(tile_size=64)
+        kept = loader.compile(ALL_MAPS["test"])
+        for width in range(1, MAX_COMPILED_LEVELS):
+            loader.compile(["-" * width])
+        # Using a level keeps it cached; the oldest unused one goes
+        assert loader.compile(ALL_MAPS["test"]) is kept
+        loader.compile(["-" * MAX_COMPILED_LEVELS])
+
+        assert len(map_loader_module._compiled) == MAX_COMPILED_LEVELS
+        assert loader.compile(ALL_MAPS["test"]) is kept
+
+    def test_clear_compiled(self):
+        loader = MapLoader(tile_size=64)
+        first = loader.compile(ALL_MAPS["test"])
+        clear_compiled()
+
+        assert loader.compile(ALL_MAPS["test"]) is not first
+
+
+class TestLoadMapFile:
+    @pytest.fixture
+    def write_map(self, tmp_path):
+        def write(name, text):
+            path = tmp_path / f"{name}.txt"
+            path.write_text(text)
+            return str(path)
+
+        return write
+
+    def test_rows_named_after_file(self, write_map):
+        name, rows = load_map_file(write_map("small", "  X \n----\n P  \n----\n\n"))
+        assert name == "small"
+        assert rows == ["  X ", "----", " P  ", "----"]
+        assert "small" not in ALL_MAPS
+
+    def test_unknown_tiles_rejected(self, write_map):
+        with pytest.raises(ValueError, match="unknown map tiles"):
+            load_map_file(write_map("odd", "--?-\n"))
+
+    def test_built_in_map_name_allowed(self, write_map):
+        built_in = list(ALL_MAPS["test"])
+        name, rows = load_map_file(write_map("test", "P\n-\n"))
+        assert (name, rows) == ("test", ["P", "-"])
+        assert ALL_MAPS["test"] == built_in
@@ -0,0 +1,133 @@
+import random
+import pytest
+import pygame
+from controls import input_bits
+from matches import MatchScheduler, OVERRUN_LIMIT
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class TestMatchScheduler:
+    def test_steps_every_match(self, pygame_init):
+        scheduler = MatchScheduler()
+        first = scheduler.add_match("test", seed=1)
+        second = scheduler.add_match("level_1", seed=2)
+        for _ in range(5):
+            scheduler.step()
+
+        assert scheduler.ticks == 5
+        assert scheduler.matches[first].ticks == 5
+        assert scheduler.matches[second].ticks == 5
+
+    def test_matches_share_compiled_level(self, pygame_init):
+        scheduler = MatchScheduler()
+        games = [scheduler.matches[scheduler.add_match("level_1", seed=s)].game
+                 for s in range(2)]
+
+        assert games[0].tile_grid is games[1].tile_grid
+        assert not games[0].tile_grid.flags.writeable
+        assert games[0].platforms.sprites()[0] is not games[1].platforms.sprites()[0]
+
+    def test_input_moves_player(self, pygame_init):
+        scheduler = MatchScheduler()
+        match = scheduler.matches[scheduler.add_match()]
+        player = match.game.roster["players"][0]
+        start_x = player.rect.x
+        match.set_input(0, input_bits(["right"]))
+        for _ in range(10):
+            scheduler.step()
+
+        assert player.rect.x > start_x
+
+    def test_down_input_climbs_down_ladder(self, pygame_init):
+        scheduler = MatchScheduler()
+        match = scheduler.matches[scheduler.add_match()]
+        player = match.game.roster["players"][0]
+        ladder = max(match.game.ladders, key=lambda ladder: ladder.rect.height)
+        player.rect.center = ladder.rect.center
+        player.x, player.y = float(player.rect.x), float(player.rect.y)
+        player.climbing = True
+        start_y = player.rect.y
+        match.set_input(0, input_bits(["down"]))
+        for _ in range(5):
+            scheduler.step()
+
+        assert player.climbing
+        assert player.rect.y > start_y
+
+    def test_shot_fires_once(self, pygame_init):
+        scheduler = MatchScheduler()
+        match = scheduler.matches[scheduler.add_match()]
+        match.set_input(0, input_bits(shoot=True))
+        scheduler.step()
+        scheduler.step()
+
+        assert match.game.stats.shots_fired == 1
+
+    def test_before_tick_hook(self, pygame_init):
+        calls = []
+        scheduler = MatchScheduler(before_tick=calls.append)
+        scheduler.add_match()
+        scheduler.step()
+
+        assert calls == [scheduler]
+
+    def test_finished_match_retired(self, pygame_init):
+        scheduler = MatchScheduler()
+        match_id = scheduler.add_match()
+        game = scheduler.matches[match_id].game
+        for player in game.players:
+            player.alive = False
+            player.kill()
+        scheduler.step()
+
+        assert match_id not in scheduler.matches
+        assert scheduler.finished[match_id].outcome == "death"
+
+    def test_overruns_counted_against_budget(self, pygame_init):
+        scheduler = MatchScheduler(target_load=1e-9)
+        match_id = scheduler.add_match()
+        scheduler.step()
+
+        assert scheduler.matches[match_id].overruns == 1
+        assert scheduler.metrics()["match_overruns"] == 1
+
+    def test_repeatedly_overrunning_match_deferred(self, pygame_init):
+        # No time to spare, so every match overruns and a deferred one is skipped
+        scheduler = MatchScheduler(target_load=1e-9)
+        match = scheduler.matches[scheduler.add_match()]
+        for _ in range(2 * (OVERRUN_LIMIT + 1)):
+            scheduler.step()
+
+        assert match.skipped_ticks == 2
+        assert match.ticks == 2 * OVERRUN_LIMIT
+        assert scheduler.metrics()["skipped_match_ticks"] == 2
+
+    def test_deferred_match_runs_when_tick_has_time(self, pygame_init):
+        scheduler = MatchScheduler()
+        match = scheduler.matches[scheduler.add_match()]
+        match.overrun_streak = OVERRUN_LIMIT
+        scheduler.step()
+
+        assert match.ticks == 1
+        assert match.skipped_ticks == 0
+
+    def test_run_ticks_and_metrics(self, pygame_init):
+        scheduler = MatchScheduler(tick_rate=1000)
+        scheduler.add_match()
+        random.seed(5)
+        expected = random.random()
+        random.seed(5)
+        scheduler.run(ticks=3)
+        metrics = scheduler.metrics()
+
+        assert random.random() == expected
+        assert metrics["ticks"] == 3
+        assert metrics["capacity"] >= 0
+        assert 0 < metrics["load"]
+
@@ -0,0 +1,190 @@
+import asyncio
+import pytest
+import pygame
+from controls import INPUT_CONTROLS
+from maps import ALL_MAPS
+from net import (GameServer, GameClient, pack_message, read_message, input_bits,
+                 MSG_INPUT, MSG_HELLO, DELTA_VERSION, PROTOCOL_VERSION,
+                 _HELLO)
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+async def start_match(num_players=2, map_name="test", map_data=None):
+    server = GameServer(map_name, num_players, map_data=map_data)
+    await server.start()
+    clients = [GameClient(headless=True) for _ in range(num_players)]
+    for client in clients:
+        await client.connect(port=server.port)
+    await server.wait_for_players()
+    return server, clients
+
+
+class TestMessages:
+    def test_framing_round_trip(self):
+        async def round_trip():
+            reader = asyncio.StreamReader()
+            reader.feed_data(pack_message(MSG_INPUT, b"abc") + pack_message(7))
+            return await read_message(reader), await read_message(reader)
+
+        first, second = asyncio.run(round_trip())
+
+        assert first == (MSG_INPUT, b"abc")
+        assert second == (7, b"")
+
+    def test_input_bits(self):
+        bits = input_bits(("left", "jump"), shoot=True)
+
+        assert bits == 0b1101
+        assert input_bits() == 0
+        assert len(INPUT_CONTROLS) == 5
+        assert input_bits(("down",)) == 0b10000
+
+
+class TestServerAndClients:
+    def test_clients_get_slots(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match()
+            slots = [client.slot for client in clients]
+            await asyncio.gather(*(client.close() for client in clients))
+            await server.close()
+            return slots
+
+        assert asyncio.run(scenario()) == [0, 1]
+
+    def test_client_builds_map_it_does_not_have(self, pygame_init):
+        map_data = list(ALL_MAPS["level_1"])
+
+        async def scenario():
+            server, clients = await start_match(map_name="custom_tower", map_data=map_data)
+            await asyncio.gather(*(client.close() for client in clients))
+            await server.close()
+            return server, clients
+
+        server, clients = asyncio.run(scenario())
+
+        assert "custom_tower" not in ALL_MAPS
+        for client in clients:
+            assert client.game.map_name == "custom_tower"
+            assert (client.game.tile_grid == server.game.tile_grid).all()
+            assert len(client.game.roster["enemies"]) == len(server.game.roster["enemies"])
+
+    def test_clients_mirror_server_state(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match()
+            start_x = server.game.roster["players"][0].rect.x
+            clients[0].send_input(["right"])
+            await asyncio.sleep(0.01)
+            for _ in range(15):
+                server.step()
+            for client in clients:
+                while await client.receive_state() < server.tick:
+                    pass
+
+            server_rects = [p.rect.topleft for p in server.game.roster["players"]]
+            client_rects = [
+                [p.rect.topleft for p in client.game.roster["players"]]
+                for client in clients
+            ]
+            await asyncio.gather(*(client.close() for client in clients))
+            await server.close()
+            return start_x, server_rects, client_rects
+
+        start_x, server_rects, client_rects = asyncio.run(scenario())
+
+        assert server_rects[0][0] > start_x
+        assert client_rects == [server_rects, server_rects]
+
+    def test_shoot_fires_once_per_press(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match()
+            clients[1].send_input(shoot=True)
+            clients[1].send_input(shoot=True)
+            await asyncio.sleep(0.01)
+            server.step()
+            server.step()
+            await clients[1].receive_state()
+            shots = server.game.stats.shots_fired
+            # Alerted enemies may fire back in the same tick
+            mirrored = sum(
+                projectile.owner_type == "player"
+                for projectile in clients[1].game.projectiles
+            )
+            await asyncio.gather(*(client.close() for client in clients))
+            await server.close()
+            return shots, mirrored
+
+        shots, mirrored = asyncio.run(scenario())
+
+        assert shots == 1
+        assert mirrored == 1
+
+    def test_full_server_refuses_client(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match(num_players=1)
+            extra = GameClient(headless=True)
+            try:
+                with pytest.raises(ConnectionError):
+                    await extra.connect(port=server.port)
+                # Only the seated client's handler is tracked
+                assert len(server._handlers) == 1
+            finally:
+                await clients[0].close()
+                await server.close()
+
+        asyncio.run(scenario())
+
+    def test_malformed_input_drops_client(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match(num_players=1)
+            handler = next(iter(server._handlers))
+            clients[0]._writer.write(pack_message(MSG_INPUT, b"x"))
+            await asyncio.wait_for(handler, timeout=1)
+            seated = list(server._writers)
+            await clients[0].close()
+            await server.close()
+            return handler.exception(), seated
+
+        error, seated = asyncio.run(scenario())
+
+        assert error is None
+        assert seated == [None]
+
+    @pytest.mark.parametrize("versions, problem", [
+        ((PROTOCOL_VERSION - 1, DELTA_VERSION), "protocol"),
+        ((PROTOCOL_VERSION, DELTA_VERSION - 1), "delta version"),
+    ])
+    def test_client_refuses_other_versions(self, pygame_init, versions, problem):
+        async def scenario():
+            async def old_server(reader, writer):
+                writer.write(pack_message(MSG_HELLO, _HELLO.pack(0, 1, *versions)))
+                await writer.drain()
+                writer.close()
+
+            server = await asyncio.start_server(old_server, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            client = GameClient(headless=True)
+            try:
+                with pytest.raises(ConnectionError, match=problem):
+                    await client.connect(port=port)
+            finally:
+                server.close()
+                await server.wait_closed()
+
+        asyncio.run(scenario())
+
+    def test_run_ticks_on_fixed_clock(self, pygame_init):
+        async def scenario():
+            server, clients = await start_match(num_players=1)
+            await server.run(ticks=5)
+            tick = server.tick
+            await clients[0].close()
+            await server.close()
+            return tick
+
+        assert asyncio.run(scenario()) == 5
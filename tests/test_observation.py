@@ -0,0 +1,140 @@
+import numpy as np
+import pytest
+import pygame
+from game import Game
+from projectile import Projectile
+from components import KIND_ENEMY
+from map_loader import TILE_PLATFORM, TILE_EXIT
+from observation import (ObservationEncoder, TILE_OUTSIDE, ENEMY_FEATURES,
+                         PROJECTILE_FEATURES)
+from unittest.mock import patch
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_game(num_players=1):
+    with patch('random.choice', return_value=100):
+        with patch('random.randint', return_value=60):
+            return Game(num_players=num_players, headless=True)
+
+
+class TestObservationEncoder:
+    def test_layout_covers_buffer(self):
+        encoder = ObservationEncoder(np.zeros((4, 4), np.int8), 64, tile_radius=1,
+                                     max_enemies=2, max_projectiles=3)
+        layout = encoder.layout
+
+        assert layout["player"].start == 0
+        assert layout["tiles"].stop - layout["tiles"].start == 9
+        assert layout["enemies"].stop - layout["enemies"].start == 2 * ENEMY_FEATURES
+        assert layout["exit"].stop == encoder.size
+        assert encoder.new_buffer(2).shape == (2, encoder.size)
+
+    def test_tile_window_padded_outside_map(self):
+        grid = np.full((3, 3), TILE_PLATFORM, np.int8)
+        grid[0, 0] = TILE_EXIT
+        encoder = ObservationEncoder(grid, 64, tile_radius=1)
+
+        # A window at the top-left tile overhangs the map by one cell
+        window = encoder._padded[0:3, 0:3]
+        assert window[0].tolist() == [TILE_OUTSIDE] * 3
+        assert window[1, 1] == TILE_EXIT
+
+    def test_encode_writes_in_place(self, pygame_init):
+        game = make_game(num_players=2)
+        encoder = ObservationEncoder.for_game(game)
+        buffer = encoder.new_buffer(2)
+
+        result = encoder.encode(game, buffer)
+        views = encoder.views(buffer)
+
+        assert result is buffer
+        players = game.roster["players"]
+        assert views["player"][1, 0] == players[1].x
+        assert views["player"][0, 4] == 1  # alive
+        assert np.shares_memory(views["tiles"], buffer)
+
+    def test_nearest_enemies_sorted_and_padded(self, pygame_init):
+        game = make_game()
+        encoder = ObservationEncoder.for_game(game, max_enemies=8)
+        buffer = encoder.new_buffer(1)
+        player = game.roster["players"][0]
+
+        encoder.encode(game, buffer)
+        enemies = encoder.views(buffer)["enemies"][0]
+        count = len(game.enemies) + len(game.machinegunners)
+        used = enemies[enemies[:, 4] == 1]
+        distances = np.abs(used[:, 0]) + np.abs(used[:, 1])
+
+        assert len(used) == min(count, 8)
+        assert (np.diff(distances) >= 0).all()
+        assert (enemies[len(used):] == 0).all()
+
+        nearest = min(
+            [*game.enemies, *game.machinegunners],
+            key=lambda e: abs(e.rect.centerx - player.rect.centerx)
+            + abs(e.rect.centery - player.rect.centery),
+        )
+        assert used[0, 2] == nearest._store.kind[nearest.eid]
+
+    def test_alert_enemy_flagged(self, pygame_init):
+        game = make_game()
+        for machinegunner in list(game.machinegunners):
+            machinegunner.kill()
+        enemy = list(game.enemies)[0]
+        for other in list(game.enemies)[1:]:
+            other.kill()
+        enemy.alert_state = "ALERT"
+        encoder = ObservationEncoder.for_game(game)
+        buffer = encoder.new_buffer(1)
+
+        encoder.encode(game, buffer)
+        first = encoder.views(buffer)["enemies"][0, 0]
+
+        assert first[2] == KIND_ENEMY
+        assert first[3] == 1
+        assert first[4] == 1
+
+    def test_projectiles_relative_to_player(self, pygame_init):
+        game = make_game()
+        player = game.roster["players"][0]
+        projectile = Projectile(player.rect.centerx + 50, player.rect.centery,
+                                -1, (255, 0, 0), "enemy")
+        game.projectiles.add(projectile)
+        encoder = ObservationEncoder.for_game(game)
+        buffer = encoder.new_buffer(1)
+
+        encoder.encode(game, buffer)
+        shots = encoder.views(buffer)["projectiles"][0]
+
+        assert shots.shape[1] == PROJECTILE_FEATURES
+        assert shots[0, 0] == projectile.rect.centerx - player.rect.centerx
+        assert shots[0, 2] == -1
+        assert shots[0, 3] == 0
+        assert shots[1:, 4].sum() == 0
+
+    def test_scratch_reused_as_entity_counts_change(self, pygame_init):
+        game = make_game()
+        player = game.roster["players"][0]
+        shots = [
+            Projectile(player.rect.centerx + 10 * i, player.rect.centery, 1, (255, 0, 0), "player")
+            for i in range(1, 21)
+        ]
+        game.projectiles.add(*shots)
+        encoder = ObservationEncoder.for_game(game)
+        buffer = encoder.new_buffer(1)
+        encoder.encode(game, buffer)
+        scratch = dict(encoder._scratch)
+
+        game.projectiles.remove(*shots[:-1])
+        encoder.encode(game, buffer)
+        views = encoder.views(buffer)["projectiles"][0]
+
+        assert views[0, 0] == shots[-1].rect.centerx - player.rect.centerx
+        assert views[1:].sum() == 0
+        assert all(encoder._scratch[name] is array for name, array in scratch.items())
@@ -0,0 +1,108 @@
+import pytest
+import pygame
+import sys
+import os
+import importlib.util
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Load the local platforms module to avoid conflict with built-in platform module
+platforms_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'platforms.py'))
+spec = importlib.util.spec_from_file_location("platform_module", platforms_path)
+platform_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(platform_module)
+Platform = platform_module.Platform
+
+from perception import Perception
+from obstacles import Obstacle
+from enemy import Enemy
+from config import ENEMY_SPEED
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class MockPlayer:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 30, 30)
+        self.alive = True
+
+
+class TestPerception:
+    def test_clear_row_has_line_of_sight(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([], [])
+
+        assert perception.line_of_sight(100, 500, 115) is True
+
+    def test_platform_blocks_row(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([Platform(200, 100, 50, 30)], [])
+
+        assert perception.line_of_sight(100, 500, 115) is False
+        # Works in either direction
+        assert perception.line_of_sight(500, 100, 115) is False
+
+    def test_obstacle_blocks_row(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([], [Obstacle(200, 100, 50, 30)])
+
+        assert perception.line_of_sight(100, 500, 115) is False
+
+    def test_solid_outside_segment_does_not_block(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([Platform(600, 100, 50, 30)], [])
+
+        assert perception.line_of_sight(100, 500, 115) is True
+
+    def test_solid_on_other_row_does_not_block(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([Platform(200, 300, 50, 30)], [])
+
+        assert perception.line_of_sight(100, 500, 115) is True
+
+    def test_overlapping_solids_are_merged(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick(
+            [Platform(100, 100, 64, 32), Platform(164, 100, 64, 32)],
+            [Obstacle(150, 80, 64, 64)],
+        )
+
+        starts, ends = perception.blocked_intervals(110)
+        assert len(starts) == 1
+        assert starts[0] < 100 and ends[0] > 228
+
+    def test_rows_cached_until_next_tick(self, pygame_init):
+        platforms = [Platform(200, 100, 50, 30)]
+        perception = Perception()
+        perception.begin_tick(platforms, [])
+        assert perception.line_of_sight(100, 500, 115) is False
+
+        # Geometry changes are only picked up on the next pass
+        platforms.clear()
+        assert perception.line_of_sight(100, 500, 115) is False
+        perception.begin_tick(platforms, [])
+        assert perception.line_of_sight(100, 500, 115) is True
+
+    def test_tall_solid_spanning_bands_blocks(self, pygame_init):
+        perception = Perception()
+        perception.begin_tick([], [Obstacle(200, 0, 40, 400)])
+
+        assert perception.line_of_sight(100, 500, 300) is False
+
+    def test_enemy_raycast_uses_shared_perception(self, pygame_init):
+        with patch('random.choice', return_value=ENEMY_SPEED):
+            enemy = Enemy(100, 100)
+        player = MockPlayer(300, 100)
+
+        perception = Perception()
+        perception.begin_tick([Platform(150, 90, 50, 60)], [])
+
+        # Lists passed directly are ignored in favour of the shared pass
+        assert enemy._raycast_to_player(player, [], [], perception=perception) is False
@@ -0,0 +1,309 @@
+import pytest
+import pygame
+import sys
+import os
+import importlib.util
+import random
+from unittest.mock import patch
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Load the local platforms module to avoid conflict with built-in platform module
+platforms_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'platforms.py'))
+spec = importlib.util.spec_from_file_location("platform_module", platforms_path)
+platform_module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(platform_module)
+Platform = platform_module.Platform
+
+from physics import PhysicsSystem, SolidGroup, SolidTable
+from components import ComponentStore
+from enemy import Enemy
+from machinegunner import Machinegunner
+from obstacles import Obstacle
+from config import GRAVITY
+from maps import ALL_MAPS
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def store():
+    return ComponentStore()
+
+
+def settle(physics, actors, ticks=60):
+    for _ in range(ticks):
+        physics.step(actors, 0.02)
+
+
+class TestSolidTable:
+    def test_sorted_by_top(self, pygame_init):
+        table = SolidTable()
+        table.sync(SolidGroup(Platform(0, 300, 64, 32), Platform(0, 100, 64, 32)),
+                   SolidGroup(Obstacle(0, 200, 64, 64)))
+
+        assert list(table.top) == [100, 200, 300]
+        assert table.max_height == 64
+
+    def test_version_bumps_only_when_solids_change(self, pygame_init):
+        platforms = SolidGroup(Platform(0, 100, 64, 32))
+        obstacles = SolidGroup()
+        table = SolidTable()
+        table.sync(platforms, obstacles)
+        version = table.version
+
+        table.sync(platforms, obstacles)
+        assert table.version == version
+
+        platforms.add(Platform(0, 200, 64, 32))
+        table.sync(platforms, obstacles)
+        assert table.version == version + 1
+
+    def test_version_bumps_when_a_solid_moves(self, pygame_init):
+        platforms = SolidGroup(Platform(0, 100, 64, 32))
+        obstacles = SolidGroup()
+        table = SolidTable()
+        table.sync(platforms, obstacles)
+        version = table.version
+
+        platforms.sprites()[0].rect.y = 150
+        platforms.moved()
+        table.sync(platforms, obstacles)
+
+        assert table.version == version + 1
+        assert list(table.top) == [150]
+
+    def test_version_bumps_when_a_solid_is_swapped(self, pygame_init):
+        platforms = SolidGroup(Platform(0, 100, 64, 32))
+        obstacles = SolidGroup()
+        table = SolidTable()
+        table.sync(platforms, obstacles)
+        version = table.version
+
+        platforms.empty()
+        platforms.add(Platform(200, 100, 64, 32))
+        table.sync(platforms, obstacles)
+
+        assert table.version == version + 1
+        assert list(table.left) == [200]
+
+
+class TestPhysicsSystem:
+    def test_gravity_applied(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(), SolidGroup())
+
+        physics.step([mg], 0.1)
+
+        assert mg.vel_y == pytest.approx(GRAVITY * 0.1)
+        assert mg.y == pytest.approx(100 + GRAVITY * 0.1 * 0.1)
+        assert mg.rect.y == int(mg.y)
+        assert mg.on_ground is False
+
+    def test_actor_lands_on_platform(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [mg])
+
+        assert mg.rect.bottom == 200
+        assert mg.vel_y == 0
+        assert mg.on_ground is True
+
+    def test_actor_lands_on_obstacle(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(), SolidGroup(Obstacle(90, 250, 64, 64)))
+
+        settle(physics, [mg])
+
+        assert mg.rect.bottom == 250
+
+    def test_actor_misses_platform_to_the_side(self, pygame_init, store):
+        mg = Machinegunner(400, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [mg], ticks=20)
+
+        assert mg.rect.top > 200
+        assert mg.on_ground is False
+
+    def test_rising_actor_hits_ceiling(self, pygame_init, store):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 240, store)
+        enemy.vel_y = -1000
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        physics.step([enemy], 0.02)
+
+        assert enemy.rect.top == 232
+        assert enemy.vel_y == 0
+
+    def test_many_actors_land_on_their_own_platforms(self, pygame_init, store):
+        platforms = SolidGroup(Platform(0, 200, 300, 32), Platform(400, 500, 300, 32))
+        obstacles = SolidGroup()
+        upper = [Machinegunner(50 + 40 * i, 100, store) for i in range(5)]
+        lower = [Machinegunner(450 + 40 * i, 300, store) for i in range(5)]
+        physics = PhysicsSystem()
+        physics.sync_level(platforms, obstacles)
+
+        settle(physics, upper + lower)
+
+        assert all(mg.rect.bottom == 200 for mg in upper)
+        assert all(mg.rect.bottom == 500 for mg in lower)
+
+    def test_settled_machinegunner_skipped(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+        settle(physics, [mg])
+
+        physics.step([mg], 0.02)
+
+        # No gravity integrated while resting on unchanged geometry
+        assert mg.vel_y == 0
+        assert mg.on_ground is True
+        assert mg.rect.bottom == 200
+
+    def test_settled_machinegunner_rechecked_when_geometry_changes(self, pygame_init, store):
+        platforms = SolidGroup(Platform(50, 200, 200, 32))
+        obstacles = SolidGroup()
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(platforms, obstacles)
+        settle(physics, [mg])
+
+        platforms.empty()
+        physics.sync_level(platforms, obstacles)
+        physics.step([mg], 0.02)
+
+        assert mg.vel_y > 0
+        assert mg.on_ground is False
+        assert mg.sleeping is False
+
+    def test_sleeping_machinegunner_wakes_when_platform_moves(self, pygame_init, store):
+        platforms = SolidGroup(Platform(50, 200, 200, 32))
+        obstacles = SolidGroup()
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(platforms, obstacles)
+        settle(physics, [mg])
+        assert mg.sleeping is True
+
+        # Lower the platform: same number of solids, different geometry
+        platforms.sprites()[0].rect.y = 260
+        platforms.moved()
+        physics.sync_level(platforms, obstacles)
+        settle(physics, [mg])
+
+        assert mg.rect.bottom == 260
+        assert mg.on_ground is True
+
+    def test_landed_machinegunner_falls_asleep(self, pygame_init, store):
+        mg = Machinegunner(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [mg])
+
+        assert mg.sleeping is True
+
+    def test_idle_enemy_falls_asleep(self, pygame_init, store):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [enemy])
+
+        assert enemy.sleeping is True
+        assert enemy.on_ground is True
+
+    def test_moving_enemy_stays_awake(self, pygame_init, store):
+        with patch('random.choice', return_value=100):
+            enemy = Enemy(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [enemy])
+
+        assert enemy.sleeping is False
+
+    def test_woken_actor_integrates_again(self, pygame_init, store):
+        with patch('random.choice', return_value=0):
+            enemy = Enemy(100, 100, store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+        settle(physics, [enemy])
+        enemy.y = float(enemy.rect.y)
+
+        enemy.wake()
+        physics.step([enemy], 0.02)
+
+        assert enemy.vel_y == pytest.approx(GRAVITY * 0.02)
+
+    def test_actors_from_different_stores(self, pygame_init, store):
+        other_store = ComponentStore()
+        mg1 = Machinegunner(100, 100, store)
+        mg2 = Machinegunner(150, 100, other_store)
+        physics = PhysicsSystem()
+        physics.sync_level(SolidGroup(Platform(50, 200, 200, 32)), SolidGroup())
+
+        settle(physics, [mg1, mg2])
+
+        assert mg1.rect.bottom == 200
+        assert mg2.rect.bottom == 200
+
+    def test_matches_per_sprite_update(self, pygame_init, store):
+        platforms = SolidGroup(Platform(0, 300, 400, 32))
+        obstacles = SolidGroup()
+        batched = Machinegunner(100, 97, store)
+        scalar = Machinegunner(100, 97, ComponentStore())
+        physics = PhysicsSystem()
+        physics.sync_level(platforms, obstacles)
+
+        for _ in range(7):
+            physics.step([batched], 0.02)
+            scalar.update(platforms, [], [], 0, 0.02)
+            assert batched.rect.y == scalar.rect.y
+            assert batched.vel_y == scalar.vel_y
+
+
+def _per_sprite(update):
+    """An actor's update forced onto its own vertical step."""
+    def call(*args, **kwargs):
+        kwargs["integrate_vertical"] = True
+        return update(*args, **kwargs)
+    return call
+
+
+def _run_map(map_name, batched, ticks=301):
+    from game import Game
+
+    random.seed(1)
+    game = Game(1, map_name, headless=True)
+    if not batched:
+        for actor in [*game.enemies, *game.machinegunners]:
+            actor.update = _per_sprite(actor.update)
+        game.physics.step = lambda actors, delta_time: None
+    for _ in range(ticks):
+        game.update(0.02)
+    return sorted(
+        (tuple(actor.rect), bool(actor.on_ground))
+        for actor in [*game.enemies, *game.machinegunners]
+    )
+
+
+@pytest.mark.parametrize("map_name", sorted(ALL_MAPS))
+def test_batched_matches_per_sprite_on_map(pygame_init, map_name):
+    assert _run_map(map_name, batched=True) == _run_map(map_name, batched=False)
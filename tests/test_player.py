@@ -35,6 +35,7 @@ def player_controls():
         'left': pygame.K_a,
         'right': pygame.K_d,
         'jump': pygame.K_w,
+        'down': pygame.K_s,
         'shoot': pygame.K_SPACE
     }
 
@@ -54,9 +55,47 @@ class TestPlayer:
         assert player.on_ground is False
         assert player.facing_right is True
 
+    def test_player_climbs_down_on_own_down_key(self, pygame_init, player_controls):
+        from controls import KeyState
+        from ladder import Ladder
+        from config import PLAYER_CLIMB_SPEED
+        player = Player(100, 100, BLUE, player_controls)
+        player.climbing = True
+        ladders = pygame.sprite.Group(Ladder(player.rect.x, 0, 40, 400))
+
+        player.update([], [], ladders, 0.02, KeyState([player_controls['down']]))
+
+        assert player.vel_y == PLAYER_CLIMB_SPEED
+
+    def test_player_jumps_off_ladder_with_own_shoot_key(self, pygame_init, player_controls):
+        from controls import KeyState
+        from ladder import Ladder
+        player = Player(100, 100, BLUE, player_controls)
+        player.climbing = True
+        ladders = pygame.sprite.Group(Ladder(player.rect.x, 0, 40, 400))
+
+        player.update([], [], ladders, 0.02,
+                      KeyState([player_controls['right'], player_controls['shoot']]))
+
+        assert player.climbing is False
+        assert player.vel_y < 0
+
     def test_player_is_sprite(self, player):
         assert isinstance(player, pygame.sprite.Sprite)
 
+    def test_player_moves_on_given_keys(self, pygame_init, player_controls):
+        from controls import KeyState
+        player = Player(100, 100, BLUE, player_controls)
+        initial_x = player.rect.x
+
+        with patch('pygame.key.get_pressed') as keyboard:
+            player.update([], [], pygame.sprite.Group(), 0.02,
+                          KeyState([player_controls['right']]))
+
+        assert keyboard.call_count == 0
+        assert player.facing_right is True
+        assert abs(player.rect.x - (initial_x + PLAYER_SPEED * 0.02)) < 1
+
     @patch('pygame.key.get_pressed')
     def test_player_move_right(self, mock_keys, pygame_init, player_controls):
         player = Player(100, 100, BLUE, player_controls)
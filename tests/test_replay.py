@@ -0,0 +1,129 @@
+import random
+import pytest
+import pygame
+from game import Game
+from controls import KeyState
+from replay import ReplayRecorder, ReplayPlayer, ReplayError
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def visible_state(game):
+    return (
+        game.camera_y,
+        [(p.rect.topleft, p.facing_right, p.alive) for p in game.players],
+        [(e.rect.topleft, e.alert_state) for e in game.enemies],
+        [m.rect.topleft for m in game.machinegunners],
+        sorted((p.rect.topleft, p.direction) for p in game.projectiles),
+        game.stats.shots_fired,
+    )
+
+
+def record(path, ticks=120, keyframe_interval=30):
+    random.seed(2)
+    game = Game(1, "level_1", headless=True)
+    player = game.roster["players"][0]
+    right = KeyState([player.controls["right"]])
+    recorder = ReplayRecorder(game, path, keyframe_interval, flush_bytes=256)
+    states = [visible_state(game)]
+    for tick in range(ticks):
+        if tick % 20 == 5:
+            game.player_shoot(player)
+        game.update(1 / 60, [right])
+        states.append(visible_state(game))
+    recorder.close()
+    return game, states
+
+
+class TestReplay:
+    def test_playback_matches_recording(self, pygame_init, tmp_path):
+        path = tmp_path / "game.tcr"
+        _, states = record(path)
+        player = ReplayPlayer(path, headless=True)
+
+        assert player.length == len(states)
+        assert visible_state(player.game) == states[0]
+        for tick in range(1, len(states)):
+            player.step()
+            assert player.tick == tick
+            assert visible_state(player.game) == states[tick]
+        assert player.step() is None
+
+    def test_seek_uses_keyframes(self, pygame_init, tmp_path):
+        path = tmp_path / "game.tcr"
+        _, states = record(path)
+        player = ReplayPlayer(path, headless=True)
+
+        for tick in (100, 31, 0, 59, 500):
+            player.seek(tick)
+            shown = min(tick, len(states) - 1)
+            assert player.tick == shown
+            assert visible_state(player.game) == states[shown]
+        player.seek(40)
+        player.step()
+        assert visible_state(player.game) == states[41]
+
+    def test_events_recorded(self, pygame_init, tmp_path):
+        path = tmp_path / "game.tcr"
+        game, _ = record(path)
+        player = ReplayPlayer(path, headless=True)
+        events = []
+        while (tick_events := player.step()) is not None:
+            events.extend(tick_events)
+
+        shots = [e for e in events if e.type == "shot_fired"]
+        assert len(shots) == game.stats.shots_fired
+        assert shots[0].actor == 0
+        assert shots[0].tick == 6
+
+    def test_recording_stops_on_close(self, pygame_init, tmp_path):
+        path = tmp_path / "game.tcr"
+        game, _ = record(path, ticks=10)
+        size = path.stat().st_size
+        game.update(1 / 60)
+
+        assert game.recorder is None
+        assert path.stat().st_size == size
+
+    def test_write_error_raised_on_close(self, pygame_init, tmp_path):
+        game = Game(1, "test", headless=True)
+        recorder = ReplayRecorder(game, tmp_path / "missing" / "game.tcr")
+
+        with pytest.raises(FileNotFoundError):
+            recorder.close()
+
+    def test_write_error_raised_on_next_flush(self, pygame_init, tmp_path):
+        game = Game(1, "test", headless=True)
+        recorder = ReplayRecorder(game, tmp_path / "missing" / "game.tcr")
+        recorder._writer.join()
+        recorder.flush_bytes = 1
+
+        with pytest.raises(FileNotFoundError):
+            game.update(1 / 60)
+        # Recording stopped, so the game carries on without it
+        assert game.recorder is None
+        game.update(1 / 60)
+        recorder.close()
+
+    def test_truncated_recording_plays_complete_ticks(self, pygame_init, tmp_path):
+        path = tmp_path / "game.tcr"
+        record(path, ticks=60)
+        data = path.read_bytes()
+        path.write_bytes(data[:-3])
+        player = ReplayPlayer(path, headless=True)
+
+        assert 0 < player.length < 61
+        player.seek(player.length - 1)
+        player.game.draw()
+
+    def test_rejects_other_files(self, pygame_init, tmp_path):
+        path = tmp_path / "other.tcr"
+        path.write_bytes(b"not a replay at all")
+
+        with pytest.raises(ReplayError):
+            ReplayPlayer(path, headless=True)
@@ -0,0 +1,105 @@
+import random
+import pytest
+import pygame
+from game import Game
+from controls import input_bits
+from rollback import RollbackSession, benchmark
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_session(local_slot, seed=3, map_name="level_1", max_rollback=8):
+    random.seed(seed)
+    game = Game(2, map_name, headless=True)
+    return RollbackSession(game, local_slot, seed, max_rollback=max_rollback)
+
+
+def script(slot, tick):
+    """Changing inputs, so remote predictions are often wrong."""
+    if slot == 0:
+        held = ["right"] if (tick // 7) % 2 else ["left", "jump"]
+        return input_bits(held, shoot=tick % 11 == 0)
+    held = ["jump"] if (tick // 5) % 3 == 0 else ["right"]
+    return input_bits(held, shoot=tick % 13 == 0)
+
+
+def play(sessions, ticks, latency):
+    """Both peers run in lockstep; each input reaches the other peer latency ticks late."""
+    in_flight = []
+    for tick in range(ticks):
+        for slot, session in enumerate(sessions):
+            sent_tick = session.add_local_input(script(slot, tick))
+            in_flight.append((tick + latency, 1 - slot, slot, sent_tick, script(slot, tick)))
+        for arrival, receiver, slot, sent_tick, bits in list(in_flight):
+            if arrival <= tick:
+                sessions[receiver].add_remote_input(slot, sent_tick, bits)
+                in_flight.remove((arrival, receiver, slot, sent_tick, bits))
+        for session in sessions:
+            assert session.advance()
+    # Deliver the rest and catch up
+    for _, receiver, slot, sent_tick, bits in in_flight:
+        sessions[receiver].add_remote_input(slot, sent_tick, bits)
+    for session in sessions:
+        session.add_local_input(0)
+        session.add_remote_input(1 - session.local_slot, session.tick, 0)
+        session.advance()
+
+
+class TestRollbackSession:
+    def test_peers_converge_despite_latency(self, pygame_init):
+        sessions = [make_session(0), make_session(1)]
+        play(sessions, 90, latency=3)
+
+        assert sessions[0].rollbacks > 0
+        assert sessions[0].game.snapshot() == sessions[1].game.snapshot()
+
+    def test_matches_game_with_no_latency(self, pygame_init):
+        delayed = [make_session(0), make_session(1)]
+        instant = [make_session(0), make_session(1)]
+        play(delayed, 60, latency=4)
+        play(instant, 60, latency=0)
+
+        assert instant[0].rollbacks == 0
+        assert delayed[0].game.snapshot() == instant[0].game.snapshot()
+
+    def test_stalls_when_too_far_ahead(self, pygame_init):
+        session = make_session(0, max_rollback=2)
+        results = []
+        for _ in range(5):
+            session.add_local_input(0)
+            results.append(session.advance())
+
+        assert results == [True, True, False, False, False]
+        assert session.tick == 2
+
+    def test_rejects_input_outside_window(self, pygame_init):
+        session = make_session(0, max_rollback=2)
+        session.add_remote_input(1, 0, 0)
+        for _ in range(4):
+            session.add_local_input(0)
+            session.add_remote_input(1, session.tick, 0)
+            session.advance()
+
+        with pytest.raises(ValueError):
+            session.add_remote_input(1, 0, 1)
+
+    def test_global_random_untouched(self, pygame_init):
+        session = make_session(0)
+        random.seed(8)
+        expected = random.random()
+        random.seed(8)
+        session.add_local_input(0)
+        session.advance()
+
+        assert random.random() == expected
+
+    def test_benchmark_reports_rate(self, pygame_init):
+        report = benchmark("test", ticks=20, depth=4)
+
+        assert report["resimulated_ticks"] > 0
+        assert report["resimulated_per_second"] > 0
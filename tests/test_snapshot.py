@@ -0,0 +1,133 @@
+import struct
+import pytest
+import pygame
+from game import Game
+from snapshot import SnapshotError, SNAPSHOT_VERSION
+from unittest.mock import patch
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+def make_game(num_players=1, map_name="test"):
+    with patch('random.choice', return_value=100):
+        with patch('random.randint', return_value=60):
+            return Game(num_players=num_players, map_name=map_name)
+
+
+def actor_state(game):
+    return [
+        [(a.rect.topleft, a.x, a.y, a.vel_x, a.vel_y) for a in group]
+        for group in (game.players, game.enemies, game.machinegunners)
+    ]
+
+
+class TestSnapshot:
+    def test_round_trip_restores_actors(self, pygame_init):
+        game = make_game()
+        enemy = list(game.enemies)[0]
+        enemy.alert_state = "ALERT"
+        enemy.burst_shot_count = 2
+        enemy.last_seen_player_x = 321.0
+        before = actor_state(game)
+        data = game.snapshot()
+
+        for _ in range(30):
+            game.update(0.02)
+        enemy.alert_state = "PATROL"
+        enemy.burst_shot_count = 0
+        enemy.last_seen_player_x = None
+        game.restore(data)
+
+        assert actor_state(game) == before
+        assert enemy.alert_state == "ALERT"
+        assert enemy.burst_shot_count == 2
+        assert enemy.last_seen_player_x == 321.0
+
+    def test_round_trip_restores_membership_and_flags(self, pygame_init):
+        game = make_game()
+        enemy = list(game.enemies)[0]
+        enemy.kill()
+        game.camera_y = -1234
+        game.game_over = True
+        game.stats.kills = 4
+        data = game.snapshot()
+
+        game.reset()
+        assert enemy in game.enemies
+        game.restore(data)
+
+        assert enemy not in game.enemies
+        assert enemy not in game.all_sprites
+        assert game.camera_y == -1234
+        assert game.game_over is True
+        assert game.victory is False
+        assert game.stats.kills == 4
+
+    def test_round_trip_restores_projectiles(self, pygame_init):
+        game = make_game()
+        player = list(game.players)[0]
+        game.player_shoot(player)
+        projectile = list(game.projectiles)[0]
+        projectile.x += 17.5
+        expected = (projectile.x, projectile.rect.topleft, projectile.direction,
+                    projectile.owner_type, projectile.color)
+        data = game.snapshot()
+
+        game.projectiles.empty()
+        game.restore(data)
+
+        restored = list(game.projectiles)
+        assert len(restored) == 1
+        restored = restored[0]
+        assert (restored.x, restored.rect.topleft, restored.direction,
+                restored.owner_type, restored.color) == expected
+
+    def test_restore_into_another_game_of_same_level(self, pygame_init):
+        game = make_game(num_players=2)
+        for _ in range(20):
+            game.update(0.02)
+        list(game.machinegunners)[0].kill()
+
+        fork = make_game(num_players=2)
+        fork.restore(game.snapshot())
+
+        assert actor_state(fork) == actor_state(game)
+
+    def test_snapshot_is_compact(self, pygame_init):
+        game = make_game()
+        assert len(game.snapshot()) < 4096
+
+    def test_rejects_other_data(self, pygame_init):
+        game = make_game()
+        with pytest.raises(SnapshotError):
+            game.restore(b"not a snapshot at all")
+
+    def test_rejects_other_version(self, pygame_init):
+        game = make_game()
+        data = bytearray(game.snapshot())
+        struct.pack_into("<H", data, 4, SNAPSHOT_VERSION + 1)
+        with pytest.raises(SnapshotError):
+            game.restore(bytes(data))
+
+    def test_rejects_other_level(self, pygame_init):
+        data = make_game(map_name="test").snapshot()
+        other = make_game(map_name="level_1")
+        with pytest.raises(SnapshotError):
+            other.restore(data)
+
+    def test_truncated_snapshot_leaves_game_unchanged(self, pygame_init):
+        game = make_game()
+        data = game.snapshot()
+        enemy = list(game.enemies)[0]
+        enemy.x += 100
+        before = actor_state(game)
+
+        with pytest.raises(SnapshotError):
+            game.restore(data[:-5])
+
+        assert actor_state(game) == before
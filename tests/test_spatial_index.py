@@ -0,0 +1,91 @@
+import pytest
+import pygame
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from spatial_index import VerticalBandIndex, SortedYIndex
+
+
+class MockSprite:
+    def __init__(self, x, y):
+        self.rect = pygame.Rect(x, y, 30, 30)
+
+
+class TestVerticalBandIndex:
+    def test_index_starts_stale(self):
+        index = VerticalBandIndex()
+        assert index.stale is True
+
+    def test_rebuild_clears_stale(self):
+        index = VerticalBandIndex()
+        index.rebuild([])
+        assert index.stale is False
+
+    def test_invalidate_marks_stale(self):
+        index = VerticalBandIndex()
+        index.rebuild([])
+        index.invalidate()
+        assert index.stale is True
+
+    def test_query_returns_sprites_in_window(self):
+        inside = MockSprite(100, 200)
+        above = MockSprite(100, -500)
+        below = MockSprite(100, 2000)
+        index = VerticalBandIndex(band_height=64)
+        index.rebuild([inside, above, below])
+
+        assert list(index.query(0, 720)) == [inside]
+
+    def test_query_window_edges_are_inclusive(self):
+        sprite = MockSprite(0, 85)  # centery = 100
+        index = VerticalBandIndex(band_height=64)
+        index.rebuild([sprite])
+
+        assert list(index.query(100, 200)) == [sprite]
+        assert list(index.query(0, 100)) == [sprite]
+        assert list(index.query(101, 200)) == []
+
+    def test_query_negative_coordinates(self):
+        sprite = MockSprite(0, -300)
+        index = VerticalBandIndex(band_height=64)
+        index.rebuild([sprite])
+
+        assert list(index.query(-400, -200)) == [sprite]
+
+    def test_query_uses_snapshot_until_rebuilt(self):
+        sprite = MockSprite(100, 200)
+        index = VerticalBandIndex()
+        index.rebuild([sprite])
+
+        sprite.rect.y = 5000
+        assert list(index.query(0, 720)) == []
+        index.rebuild([sprite])
+        assert list(index.query(4000, 6000)) == [sprite]
+
+
+class TestSortedYIndex:
+    def test_sprites_sorted_by_top(self):
+        low = MockSprite(0, 500)
+        high = MockSprite(0, -100)
+        middle = MockSprite(0, 200)
+        index = SortedYIndex([low, high, middle])
+
+        assert index.sprites == [high, middle, low]
+        assert len(index) == 3
+
+    def test_window_is_exclusive(self):
+        sprites = [MockSprite(0, y) for y in (0, 100, 200, 300)]
+        index = SortedYIndex(sprites)
+
+        assert index.window(0, 300) == sprites[1:3]
+
+    def test_max_height_tracks_tallest_sprite(self):
+        tall = MockSprite(0, 0)
+        tall.rect.height = 400
+        index = SortedYIndex([MockSprite(0, 0), tall])
+
+        assert index.max_height == 400
+        assert SortedYIndex().max_height == 0
@@ -0,0 +1,97 @@
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import pytest
+import pygame
+from config import FPS
+from maps import ALL_MAPS
+from start import StartupTimer, parse_args, main
+
+
+class TestStartupTimer:
+    def test_phases_recorded_in_order(self):
+        timer = StartupTimer()
+        timer.mark("first")
+        timer.mark("second")
+        assert [name for name, _, _ in timer.phases] == ["first", "second"]
+
+    def test_uncounted_phases_left_out_of_total(self):
+        timer = StartupTimer(start=0.0)
+        timer.phases = [("a", 0.5, True), ("menu", 10.0, False), ("b", 0.25, True)]
+        assert timer.total == 0.75
+
+    def test_report_lists_every_phase(self):
+        timer = StartupTimer()
+        timer.mark("imports")
+        timer.mark("menu", counted=False)
+        report = timer.report()
+        assert "imports" in report
+        assert "menu" in report and "not counted" in report
+        assert "total" in report
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+@pytest.fixture
+def map_file(tmp_path):
+    path = tmp_path / "tiny_tower.txt"
+    path.write_text("  X  \n ----\n P   \n-----\n")
+    return path
+
+
+class TestParseArgs:
+    def test_defaults_leave_choices_open(self):
+        args = parse_args([])
+        assert args.players is None and args.map is None and args.map_file is None
+        assert args.fps == FPS and args.renderer == "full"
+        assert not args.headless and not args.profile
+
+    def test_unknown_map_rejected(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--map", "no_such_map"])
+
+    def test_map_and_map_file_exclusive(self):
+        with pytest.raises(SystemExit):
+            parse_args(["--map", "test", "--map-file", "tower.txt"])
+
+
+class TestMain:
+    def test_headless_benchmark_written(self, pygame_init, tmp_path):
+        out = tmp_path / "bench.json"
+        main(["--headless", "--map", "level_1", "--seed", "1", "--ticks", "20",
+              "--renderer", "dirty", "--benchmark", str(out)])
+        result = json.loads(out.read_text())
+        assert result["map"] == "level_1"
+        assert result["ticks"] == 20
+        assert result["renderer"] == "dirty"
+        assert result["ticks_per_second"] > 0
+
+    def test_map_file_played(self, pygame_init, map_file, tmp_path):
+        out = tmp_path / "bench.json"
+        main(["--headless", "--map-file", str(map_file), "--ticks", "5",
+              "--benchmark", str(out)])
+        assert json.loads(out.read_text())["map"] == "tiny_tower"
+        assert "tiny_tower" not in ALL_MAPS
+
+    def test_map_file_named_like_built_in_map(self, pygame_init, tmp_path):
+        path = tmp_path / "test.txt"
+        path.write_text("  X  \n ----\n P   \n-----\n")
+        out = tmp_path / "bench.json"
+        main(["--headless", "--map-file", str(path), "--ticks", "5",
+              "--benchmark", str(out)])
+        assert json.loads(out.read_text())["map"] == "test"
+
+    def test_bad_map_file_exits(self, tmp_path):
+        path = tmp_path / "broken.txt"
+        path.write_text("-Z-\n")
+        with pytest.raises(SystemExit):
+            main(["--headless", "--map-file", str(path)])
@@ -0,0 +1,64 @@
+import pytest
+import pygame
+import sys
+import os
+
+# Add parent directory to path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import surfaces
+from config import RED, BLUE
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    surfaces.clear()
+    yield
+    surfaces.clear()
+    pygame.quit()
+
+
+class TestSurfaces:
+    def test_solid_surface_has_size_and_colour(self, pygame_init):
+        surface = surfaces.solid((30, 20), RED)
+        assert surface.get_size() == (30, 20)
+        assert surface.get_at((0, 0))[:3] == RED
+
+    def test_identical_solids_are_shared(self, pygame_init):
+        first = surfaces.solid((30, 30), RED)
+        second = surfaces.solid([30, 30], RED)
+        assert first is second
+        assert surfaces.unique_count() == 1
+
+    def test_different_solids_are_separate(self, pygame_init):
+        surfaces.solid((30, 30), RED)
+        surfaces.solid((30, 30), BLUE)
+        surfaces.solid((8, 8), RED)
+        assert surfaces.unique_count() == 3
+
+    def test_cached_builds_once(self, pygame_init):
+        calls = []
+
+        def build():
+            calls.append(1)
+            return pygame.Surface((4, 4))
+
+        assert surfaces.cached("thing", build) is surfaces.cached("thing", build)
+        assert len(calls) == 1
+
+    def test_convert_without_display_returns_surface(self, pygame_init):
+        surface = pygame.Surface((4, 4))
+        assert surfaces.convert(surface) is surface
+
+    def test_solids_use_display_format(self, pygame_init, pygame_display):
+        display = pygame.display.get_surface()
+        surface = surfaces.solid((10, 10), RED)
+        assert surface.get_bitsize() == display.get_bitsize()
+        assert surface.get_masks() == display.get_masks()
+
+    def test_sprites_share_surfaces(self, pygame_init):
+        from enemy import Enemy
+        first = Enemy(0, 0)
+        second = Enemy(100, 0)
+        assert first.image is second.image
@@ -0,0 +1,119 @@
+import random
+import numpy as np
+import pytest
+import pygame
+from vector_env import VectorEnv, ACTIONS, DEATH, RUNNING
+from observation import PLAYER_FEATURES, PROJECTILE_FEATURES
+from map_loader import TILE_PLATFORM
+
+
+@pytest.fixture
+def pygame_init():
+    pygame.init()
+    yield
+    pygame.quit()
+
+
+class TestVectorEnv:
+    def test_observation_shapes(self, pygame_init):
+        env = VectorEnv(3, num_players=2, tile_radius=2, max_projectiles=4)
+        obs = env.reset()
+
+        assert obs["player"].shape == (3, 2, PLAYER_FEATURES)
+        assert obs["tiles"].shape == (3, 2, 5, 5)
+        assert obs["projectiles"].shape == (3, 2, 4, PROJECTILE_FEATURES)
+        assert obs["flat"].shape == (3, 2, env.encoder.size)
+
+    def test_named_observations_share_the_flat_buffer(self, pygame_init):
+        env = VectorEnv(1)
+        obs = env.reset()
+
+        assert np.shares_memory(obs["player"], obs["flat"])
+        assert np.shares_memory(obs["tiles"], obs["flat"])
+
+    def test_buffers_reused_between_steps(self, pygame_init):
+        env = VectorEnv(2)
+        obs = env.reset()
+        players = obs["player"]
+
+        obs, rewards, dones = env.step(np.zeros((2, 1), dtype=int))
+        obs2, rewards2, dones2 = env.step(np.zeros((2, 1), dtype=int))
+
+        assert obs["player"] is players
+        assert obs2["player"] is players
+        assert rewards is rewards2 and dones is dones2
+
+    def test_player_stands_on_platform_tiles(self, pygame_init):
+        env = VectorEnv(1, tile_radius=3)
+        obs = env.reset()
+        for _ in range(20):
+            obs, _, _ = env.step([[0]])
+
+        # The player's own tile is the centre of the window; the tiles
+        # below it include the floor they spawned on
+        below = obs["tiles"][0, 0, 4:, :]
+        assert (below == TILE_PLATFORM).any()
+
+    def test_walk_action_moves_player(self, pygame_init):
+        env = VectorEnv(1)
+        obs = env.reset()
+        start_x = obs["player"][0, 0, 0]
+        right = ACTIONS.index((("right",), False))
+        for _ in range(10):
+            obs, _, _ = env.step([[right]])
+
+        assert obs["player"][0, 0, 0] > start_x
+
+    def test_shoot_action_creates_projectile(self, pygame_init):
+        env = VectorEnv(1)
+        env.reset()
+        shoot = ACTIONS.index(((), True))
+        obs, _, _ = env.step([[shoot]])
+
+        assert obs["projectiles"][0, 0, :, 4].sum() >= 1
+
+    def test_envs_are_independent(self, pygame_init):
+        actions = np.random.default_rng(0).integers(0, len(ACTIONS), (40, 2, 1))
+
+        def run(seeds):
+            env = VectorEnv(2, map_name="level_1")
+            env.reset(seeds)
+            for step_actions in actions:
+                obs, _, _ = env.step(step_actions)
+            return obs["player"][0].copy()
+
+        assert np.array_equal(run([5, 6]), run([5, 99]))
+
+    def test_global_random_untouched(self, pygame_init):
+        env = VectorEnv(2)
+        random.seed(11)
+        expected = random.random()
+        random.seed(11)
+        env.reset()
+        env.step(np.zeros((2, 1), dtype=int))
+        assert random.random() == expected
+
+    def test_finished_env_resets(self, pygame_init):
+        env = VectorEnv(1)
+        env.reset([3])
+        first_game = env.games[0]
+        for player in first_game.players:
+            player.alive = False
+            player.kill()
+
+        _, rewards, dones = env.step([[0]])
+
+        assert dones[0]
+        assert env.outcomes[0] == DEATH
+        assert rewards[0] < 0
+        assert env.games[0] is not first_game
+        assert env.ticks[0] == 0
+
+        _, _, dones = env.step([[0]])
+        assert not dones[0]
+        assert env.outcomes[0] == RUNNING
+
+    def test_reset_needs_one_seed_per_env(self, pygame_init):
+        env = VectorEnv(2)
+        with pytest.raises(ValueError):
+            env.reset([1])
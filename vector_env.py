@@ -0,0 +1,192 @@
+"""
+Step many headless games in lockstep, for agent training.
+
+VectorEnv runs N independent games of one map in this process. reset() and
+step() return observations (see observation.py) as NumPy arrays that are
+allocated once and overwritten in place every step, so copy anything you
+want to keep.
+
+Each game keeps its own random state: the global generator is swapped in
+around every game's update, so an environment's episode depends only on its
+seed and its actions, not on the other environments.
+"""
+import random
+import numpy as np
+from config import FPS
+from controls import KeyState
+from observation import ObservationEncoder
+
+# Discrete actions: (controls held, shoot)
+ACTIONS = (
+    ((), False),  # 0: nothing
+    (("left",), False),  # 1: walk left
+    (("right",), False),  # 2: walk right
+    (("jump",), False),  # 3: jump / climb
+    (("left", "jump"), False),  # 4: jump left
+    (("right", "jump"), False),  # 5: jump right
+    ((), True),  # 6: shoot
+    (("left",), True),  # 7: walk left and shoot
+    (("right",), True),  # 8: walk right and shoot
+)
+
+# Episode outcome codes in VectorEnv.outcomes
+RUNNING = 0
+VICTORY = 1
+DEATH = 2
+TIMEOUT = 3
+
+# Rewards: height gained is measured in tiles
+VICTORY_REWARD = 10.0
+DEATH_PENALTY = -10.0
+
+# Five simulated minutes at the game's frame rate
+DEFAULT_MAX_TICKS = 300 * FPS
+
+
+class VectorEnv:
+    """N headless games of one map, reset and stepped together."""
+
+    def __init__(
+        self,
+        num_envs,
+        map_name="test",
+        num_players=1,
+        tile_radius=3,
+        max_enemies=4,
+        max_projectiles=4,
+        max_ticks=DEFAULT_MAX_TICKS,
+        delta_time=1.0 / FPS,
+    ):
+        self.num_envs = num_envs
+        self.map_name = map_name
+        self.num_players = num_players
+        self.max_ticks = max_ticks
+        self.delta_time = delta_time
+        self._encoder_options = dict(
+            tile_radius=tile_radius,
+            max_enemies=max_enemies,
+            max_projectiles=max_projectiles,
+        )
+        self.encoder = None
+
+        # Built by the first reset(), once the map's size is known: a flat
+        # (num_envs, num_players, encoder.size) array and named views of it
+        self.observations = None
+        self.rewards = np.zeros(num_envs, np.float32)
+        self.dones = np.zeros(num_envs, bool)
+        self.outcomes = np.zeros(num_envs, np.int8)
+        self.ticks = np.zeros(num_envs, np.int64)
+
+        self.games = [None] * num_envs
+        self._rng_states = [None] * num_envs
+        self._heights = [0] * num_envs
+        self._keys = [None] * num_envs
+        self._next_seed = 0
+
+    def reset(self, seeds=None):
+        """Start a new episode in every environment; returns the observations."""
+        if seeds is None:
+            seeds = range(self.num_envs)
+        seeds = list(seeds)
+        if len(seeds) != self.num_envs:
+            raise ValueError(f"expected {self.num_envs} seeds, got {len(seeds)}")
+
+        outer_state = random.getstate()
+        try:
+            for index, seed in enumerate(seeds):
+                self._reset_env(index, seed)
+        finally:
+            random.setstate(outer_state)
+        self._next_seed = max(seeds) + 1
+        self.rewards[:] = 0
+        self.dones[:] = False
+        self.outcomes[:] = RUNNING
+        return self.observations
+
+    def step(self, actions):
+        """
+        Apply one action index (see ACTIONS) per player per environment and
+        advance every game one tick.
+
+        actions has shape (num_envs, num_players). Returns (observations,
+        rewards, dones). Finished environments are reset straight away with
+        a fresh seed; their outcome is left in outcomes for this step.
+        """
+        actions = np.asarray(actions).reshape(self.num_envs, self.num_players)
+        outer_state = random.getstate()
+        try:
+            for index in range(self.num_envs):
+                self._step_env(index, actions[index])
+        finally:
+            random.setstate(outer_state)
+        return self.observations, self.rewards, self.dones
+
+    def _reset_env(self, index, seed):
+        # Imported here so the module can be loaded without pygame initialised
+        from game import Game
+
+        random.seed(seed)
+        game = Game(self.num_players, self.map_name, headless=True)
+        self._rng_states[index] = random.getstate()
+        self.games[index] = game
+        self._heights[index] = game.height_climbed()
+        self.ticks[index] = 0
+
+        # Key states for each action, per player
+        self._keys[index] = [
+            [
+                KeyState(player.controls[name] for name in held)
+                for held, _ in ACTIONS
+            ]
+            for player in game.roster["players"]
+        ]
+        if self.encoder is None:
+            self.encoder = ObservationEncoder.for_game(game, **self._encoder_options)
+            buffer = np.zeros(
+                (self.num_envs, self.num_players, self.encoder.size), np.float32
+            )
+            self.observations = dict(self.encoder.views(buffer), flat=buffer)
+        self._observe(index)
+
+    def _step_env(self, index, actions):
+        game = self.games[index]
+        players = game.roster["players"]
+        keys = self._keys[index]
+
+        random.setstate(self._rng_states[index])
+        inputs = []
+        for slot, (player, action) in enumerate(zip(players, actions)):
+            inputs.append(keys[slot][action])
+            if ACTIONS[action][1]:
+                game.player_shoot(player)
+        game.update(self.delta_time, inputs)
+        self._rng_states[index] = random.getstate()
+        self.ticks[index] += 1
+
+        height = game.height_climbed()
+        reward = (height - self._heights[index]) / game.map_loader.tile_size
+        self._heights[index] = height
+
+        if game.victory:
+            outcome = VICTORY
+            reward += VICTORY_REWARD
+        elif game.game_over:
+            outcome = DEATH
+            reward += DEATH_PENALTY
+        elif self.ticks[index] >= self.max_ticks:
+            outcome = TIMEOUT
+        else:
+            outcome = RUNNING
+
+        self.rewards[index] = reward
+        self.outcomes[index] = outcome
+        self.dones[index] = outcome != RUNNING
+        if outcome != RUNNING:
+            self._reset_env(index, self._next_seed)
+            self._next_seed += 1
+        else:
+            self._observe(index)
+
+    def _observe(self, index):
+        """Write one environment's observations into the shared buffer."""
+        self.encoder.encode(self.games[index], self.observations["flat"][index])